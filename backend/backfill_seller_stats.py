@@ -0,0 +1,19 @@
+from backend.database import SessionLocal
+from backend.init_db import init_database
+from backend.utils.seller_stats import backfill_seller_stats
+
+def backfill():
+    """Isi ulang seller_daily_stats dari data order yang sudah ada"""
+    init_database()
+    
+    print("🔨 Backfill seller_daily_stats...")
+    db = SessionLocal()
+    try:
+        rows = backfill_seller_stats(db)
+    finally:
+        db.close()
+    
+    print(f"✅ {rows} rows rollup dibuat")
+
+if __name__ == "__main__":
+    backfill()
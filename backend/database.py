@@ -1,18 +1,132 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.config import settings
 
-# SQLite database file
-SQLALCHEMY_DATABASE_URL = "sqlite:///./shopee_mvp.db"
+def normalize_database_url(url: str) -> str:
+    """postgres:// dan postgresql:// tanpa driver dipetakan ke psycopg (v3)"""
+    for prefix in ("postgres://", "postgresql://"):
+        if url.startswith(prefix):
+            return "postgresql+psycopg://" + url[len(prefix):]
+    return url
+
+def to_async_url(url: str) -> str:
+    """Ganti driver di URL dengan driver asyncio (aiosqlite / asyncpg)"""
+    url = normalize_database_url(url)
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    if url.startswith("postgresql+psycopg://"):
+        return "postgresql+asyncpg://" + url[len("postgresql+psycopg://"):]
+    return url
+
+def is_sqlite_memory(url: str) -> bool:
+    return url in ("sqlite://", "sqlite:///:memory:")
+
+def _apply_sqlite_production_pragmas(engine, read_only: bool = False):
+    """Set pragma production di setiap koneksi baru dari engine ini"""
+    
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        # WAL: reader tidak diblok oleh writer (dan sebaliknya)
+        cursor.execute("PRAGMA journal_mode=WAL")
+        # Aman di WAL; fsync hanya saat checkpoint
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}")
+        cursor.execute(f"PRAGMA mmap_size={settings.sqlite_mmap_size}")
+        # Nilai negatif = ukuran dalam KiB, bukan jumlah page
+        cursor.execute(f"PRAGMA cache_size=-{settings.sqlite_cache_size_kib}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+def _engine_kwargs(url: str) -> dict:
+    """Argumen create_engine (pool dsb) yang sama untuk engine sync dan async"""
+    if url.startswith("sqlite"):
+        kwargs = {"connect_args": {"check_same_thread": False}}  # Needed for SQLite
+        if is_sqlite_memory(url):
+            # In-memory database hilang jika koneksinya ditutup
+            kwargs["poolclass"] = StaticPool
+        else:
+            kwargs["pool_size"] = settings.db_pool_size
+            kwargs["max_overflow"] = settings.db_max_overflow
+            kwargs["pool_timeout"] = settings.db_pool_timeout
+    else:
+        kwargs = {
+            "pool_size": settings.db_pool_size,
+            "max_overflow": settings.db_max_overflow,
+            "pool_timeout": settings.db_pool_timeout,
+            "pool_recycle": settings.db_pool_recycle,
+            "pool_pre_ping": settings.db_pool_pre_ping,
+        }
+    return kwargs
+
+def create_db_engine(url: str, read_only: bool = False):
+    """
+    Buat engine sesuai backend database di URL.
+    `read_only` hanya berpengaruh untuk SQLite dengan profil production.
+    """
+    url = normalize_database_url(url)
+    engine = create_engine(url, echo=settings.db_echo, **_engine_kwargs(url))
+    
+    if url.startswith("sqlite") and settings.sqlite_production and not is_sqlite_memory(url):
+        _apply_sqlite_production_pragmas(engine, read_only=read_only)
+    
+    return engine
+
+def create_async_db_engine(url: str):
+    """Versi asyncio dari create_db_engine (butuh aiosqlite / asyncpg)"""
+    from sqlalchemy.ext.asyncio import create_async_engine
+    
+    url = normalize_database_url(url)
+    async_engine = create_async_engine(to_async_url(url), echo=settings.db_echo, **_engine_kwargs(url))
+    
+    if url.startswith("sqlite") and settings.sqlite_production and not is_sqlite_memory(url):
+        _apply_sqlite_production_pragmas(async_engine.sync_engine)
+    
+    return async_engine
+
+# Database URL dari config (default: SQLite file lokal)
+SQLALCHEMY_DATABASE_URL = normalize_database_url(settings.database_url)
 
 # Create engine
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, 
-    connect_args={"check_same_thread": False}  # Needed for SQLite
-)
+engine = create_db_engine(SQLALCHEMY_DATABASE_URL)
+
+# Engine read-only terpisah hanya untuk profil SQLite production;
+# selain itu route GET memakai engine yang sama
+if (
+    SQLALCHEMY_DATABASE_URL.startswith("sqlite")
+    and settings.sqlite_production
+    and not is_sqlite_memory(SQLALCHEMY_DATABASE_URL)
+):
+    read_engine = create_db_engine(SQLALCHEMY_DATABASE_URL, read_only=True)
+else:
+    read_engine = engine
 
 # Session
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# Engine dan session async, hanya dibuat jika DB_ASYNC=true
+if settings.db_async:
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+    
+    async_engine = create_async_db_engine(SQLALCHEMY_DATABASE_URL)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False)
+else:
+    async_engine = None
+    AsyncSessionLocal = None
+
+# Statistik query per request (lihat utils/query_stats.py)
+if settings.query_stats:
+    from backend.utils.query_stats import instrument_engine
+    
+    for instrumented in {engine, read_engine}:
+        instrument_engine(instrumented)
+    if async_engine is not None:
+        instrument_engine(async_engine.sync_engine)
 
 # Base class untuk models
 Base = declarative_base()
@@ -23,4 +137,23 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Dependency untuk route yang hanya membaca (GET)
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+# Tanpa engine read terpisah, get_read_db adalah get_db: FastAPI meng-cache
+# dependency per fungsi, jadi route dan get_current_user memakai satu
+# session (satu koneksi pool) per request
+if read_engine is engine:
+    get_read_db = get_db
+
+# Dependency untuk route async (lihat routes/async_routes.py)
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,15 +1,33 @@
-from backend.database import engine, Base
+from backend.database import engine, Base, SessionLocal
 from backend.models.user import User
 from backend.models.product import Product
 from backend.models.order import Order, OrderItem
 from backend.models.cart import CartItem
+from backend.models.category import ProductCategory
+from backend.models.seller_stats import SellerDailyStat
+from backend.models.idempotency import IdempotencyKey
+from backend.utils.search import ensure_search_index
+from backend.utils.categories import rebuild_categories
 
 def init_database():
     """Create all tables in database"""
     print("🔨 Creating database tables...")
     Base.metadata.create_all(bind=engine)
+    
+    # create_all tidak menambah index baru ke tabel yang sudah ada
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+    
+    db = SessionLocal()
+    try:
+        ensure_search_index(db)
+        rebuild_categories(db)
+    finally:
+        db.close()
+    
     print("✅ Database tables created successfully!")
-    print("📁 Database file: shopee_mvp.db")
+    print(f"📁 Database: {engine.url.render_as_string(hide_password=True)}")
 
 if __name__ == "__main__":
     init_database()
\ No newline at end of file
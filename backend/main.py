@@ -1,15 +1,25 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+import asyncio
 import os
+from sqlalchemy import text
+from backend.config import settings
 
 # IMPORT SEMUA MODELS (penting untuk relationships)
 from backend.models.user import User
 from backend.models.product import Product
 from backend.models.order import Order, OrderItem
 from backend.models.cart import CartItem
-from backend.routes import auth, products, cart, orders
+from backend.models.category import ProductCategory
+from backend.models.seller_stats import SellerDailyStat
+from backend.models.idempotency import IdempotencyKey
+from backend.database import engine
+from backend.routes import auth, products, cart, orders, seller
+from backend.utils.compression import JSONCompressionMiddleware
+from backend.utils.etag import ETagHeaderMiddleware
+from backend.utils.static import PrecompressedStaticFiles, SERVE_DIR, html_page
 
 # Import routes
 from backend.routes import auth, cart, products
@@ -29,60 +39,101 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Mount static files
-app.mount("/static", StaticFiles(directory="frontend/static"), name="static")
-
-# Include routers
-app.include_router(auth.router)
-app.include_router(products.router)
-app.include_router(cart.router)
-app.include_router(orders.router)
+# Kompres response JSON besar (gzip / brotli)
+app.add_middleware(JSONCompressionMiddleware, minimum_size=settings.compress_min_size)
+app.add_middleware(ETagHeaderMiddleware)
+
+# Metrics Prometheus per route (lihat utils/metrics.py)
+if settings.metrics:
+    from backend.utils.metrics import MetricsMiddleware, render_metrics
+    
+    app.add_middleware(MetricsMiddleware)
+    
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        body, content_type = render_metrics()
+        return Response(body, media_type=content_type)
+
+# Server-Timing + log request lambat (QUERY_STATS=true); didaftarkan
+# terakhir = paling luar, supaya waktu app ikut menghitung middleware lain
+# (metrics, ETag, kompresi, CORS)
+if settings.query_stats:
+    from backend.utils.query_stats import QueryStatsMiddleware
+    
+    app.add_middleware(QueryStatsMiddleware)
+
+# Mount static files (frontend/dist jika sudah di-build, lihat scripts/build_static.py)
+app.mount("/static", PrecompressedStaticFiles(directory=os.path.join(SERVE_DIR, "static")), name="static")
+
+# Include routers (versi async jika DB_ASYNC=true)
+if settings.db_async:
+    from backend.routes.async_routes import make_async_router
+    
+    for module in (auth, products, cart, orders, seller):
+        app.include_router(make_async_router(module.router))
+else:
+    app.include_router(auth.router)
+    app.include_router(products.router)
+    app.include_router(cart.router)
+    app.include_router(orders.router)
+    app.include_router(seller.router)
 
 @app.get("/")
-def root():
+def root(request: Request):
     """Serve homepage"""
-    return FileResponse("frontend/index.html")
+    return html_page(request, "index.html")
 
 @app.get("/index.html")
-def index_page():
+def index_page(request: Request):
     """Serve index page"""
-    return FileResponse("frontend/index.html")
+    return html_page(request, "index.html")
 
 @app.get("/login.html")
-def login_page():
+def login_page(request: Request):
     """Serve login page"""
-    return FileResponse("frontend/login.html")
+    return html_page(request, "login.html")
 
 @app.get("/register.html")
-def register_page():
+def register_page(request: Request):
     """Serve register page"""
-    return FileResponse("frontend/register.html")
+    return html_page(request, "register.html")
 
 @app.get("/seller.html")
-def seller_page():
+def seller_page(request: Request):
     """Serve seller dashboard page"""
-    return FileResponse("frontend/seller.html")
+    return html_page(request, "seller.html")
 
 @app.get("/product-detail.html")
-def product_detail_page():
+def product_detail_page(request: Request):
     """Serve product detail page"""
-    return FileResponse("frontend/product-detail.html")
+    return html_page(request, "product-detail.html")
 
 @app.get("/cart.html")
-def cart_page():
+def cart_page(request: Request):
     """Serve cart page"""
-    return FileResponse("frontend/cart.html")
+    return html_page(request, "cart.html")
 
 @app.get("/orders.html")
-def orders_page():
+def orders_page(request: Request):
     """Serve orders page"""
-    return FileResponse("frontend/orders.html")
+    return html_page(request, "orders.html")
 
 @app.get("/payment.html")
-def payment_page():
+def payment_page(request: Request):
     """Serve payment page"""
-    return FileResponse("frontend/payment.html")
+    return html_page(request, "payment.html")
+
+def _ping_database():
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
 
 @app.get("/health")
-def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+async def health_check():
+    """Readiness: 503 jika database tidak menjawab dalam HEALTH_DB_TIMEOUT detik"""
+    try:
+        await asyncio.wait_for(run_in_threadpool(_ping_database), timeout=settings.health_db_timeout)
+    except asyncio.TimeoutError:
+        return JSONResponse({"status": "unhealthy", "database": "timeout"}, status_code=503)
+    except Exception as exc:
+        return JSONResponse({"status": "unhealthy", "database": type(exc).__name__}, status_code=503)
+    return {"status": "healthy", "database": "ok"}
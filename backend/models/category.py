@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String
+from backend.database import Base
+
+class ProductCategory(Base):
+    """
+    Jumlah product per kategori untuk GET /products/categories.
+    Di-update incremental oleh write product dan checkout (utils/categories.py)
+    """
+    __tablename__ = "product_categories"
+    
+    category = Column(String, primary_key=True)
+    product_count = Column(Integer, nullable=False, default=0)
+    in_stock_count = Column(Integer, nullable=False, default=0)
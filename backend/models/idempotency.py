@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from backend.database import Base
+
+class IdempotencyKey(Base):
+    """
+    Response POST /orders/ per (user, Idempotency-Key), lihat utils/idempotency.py.
+    Primary key sekaligus index lookup retry; expires_at untuk purge.
+    """
+    __tablename__ = "idempotency_keys"
+    
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    key = Column(String(255), primary_key=True)
+    request_hash = Column(String(64), nullable=False)  # sha256 body request
+    status_code = Column(Integer, nullable=False)
+    response_body = Column(Text)
+    expires_at = Column(DateTime, nullable=False, index=True)
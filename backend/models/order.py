@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from backend.database import Base
@@ -22,8 +22,13 @@ class Order(Base):
     shipping_address = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
     
-    # Relationships
-    items = relationship("OrderItem", back_populates="order", lazy="joined")
+    # Riwayat order per buyer, terbaru dulu (keyset pagination)
+    __table_args__ = (
+        Index("ix_orders_buyer_created_at_id", buyer_id, created_at.desc(), id.desc()),
+    )
+    
+    # Relationships (loader dipilih per endpoint, lihat routes/orders.py)
+    items = relationship("OrderItem", back_populates="order")
 
 class OrderItem(Base):
     __tablename__ = "order_items"
@@ -34,6 +39,11 @@ class OrderItem(Base):
     quantity = Column(Integer, nullable=False)
     price = Column(Float, nullable=False)
     
+    # Penjualan per product (export seller, lihat routes/seller.py)
+    __table_args__ = (
+        Index("ix_order_items_product_id_order_id", product_id, order_id),
+    )
+    
     # Relationships
     order = relationship("Order", back_populates="items")
-    product = relationship("Product", lazy="joined")
\ No newline at end of file
+    product = relationship("Product")
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Text, DateTime, ForeignKey, Index, DDL, event
 from datetime import datetime
 from backend.database import Base
 
@@ -13,4 +13,52 @@ class Product(Base):
     image_url = Column(String)
     category = Column(String)
     seller_id = Column(Integer, ForeignKey("users.id"))
-    created_at = Column(DateTime, default=datetime.utcnow)
\ No newline at end of file
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Composite index untuk filter + sort listing (lihat routes/products.py).
+    # Filter equality (category / seller) di depan, lalu kolom sort, supaya
+    # range harga dan urutan bisa diambil langsung dari index
+    __table_args__ = (
+        Index("ix_products_created_at_id", "created_at", "id"),
+        Index("ix_products_price_id", "price", "id"),
+        Index("ix_products_category_created_at_id", "category", "created_at", "id"),
+        Index("ix_products_category_price_id", "category", "price", "id"),
+        Index("ix_products_seller_created_at_id", "seller_id", "created_at", "id"),
+        Index("ix_products_seller_price_id", "seller_id", "price", "id"),
+    )
+
+
+# Full-text index (SQLite FTS5) untuk GET /products/search.
+# rowid = products.id, isinya di-sync oleh backend/utils/search.py
+PRODUCTS_FTS_SQL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS products_fts "
+    "USING fts5(name, description, category, "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3 4')"
+)
+
+event.listen(
+    Product.__table__,
+    "after_create",
+    DDL(PRODUCTS_FTS_SQL).execute_if(dialect="sqlite")
+)
+# Di PostgreSQL cukup GIN index atas tsvector, di-maintain otomatis oleh database
+PRODUCTS_TSVECTOR_SQL = (
+    "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(category, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'D')"
+)
+PRODUCTS_SEARCH_INDEX_PG_SQL = (
+    "CREATE INDEX IF NOT EXISTS ix_products_search "
+    f"ON products USING GIN (({PRODUCTS_TSVECTOR_SQL}))"
+)
+
+event.listen(
+    Product.__table__,
+    "after_create",
+    DDL(PRODUCTS_SEARCH_INDEX_PG_SQL).execute_if(dialect="postgresql")
+)
+event.listen(
+    Product.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS products_fts").execute_if(dialect="sqlite")
+)
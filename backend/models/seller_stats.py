@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, Float, Date, ForeignKey
+from backend.database import Base
+
+class SellerDailyStat(Base):
+    """
+    Rollup penjualan per seller, product dan hari (tanggal order dibuat, UTC).
+    Di-update oleh create_order / pay_order, backfill lewat
+    backend/backfill_seller_stats.py. Primary key (seller_id, day, ...)
+    sekaligus index untuk query range tanggal per seller.
+    """
+    __tablename__ = "seller_daily_stats"
+    
+    seller_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
+    order_count = Column(Integer, nullable=False, default=0)
+    units_ordered = Column(Integer, nullable=False, default=0)
+    revenue_ordered = Column(Float, nullable=False, default=0)
+    units_paid = Column(Integer, nullable=False, default=0)
+    revenue_paid = Column(Float, nullable=False, default=0)
\ No newline at end of file
@@ -0,0 +1,102 @@
+"""
+Versi async dari router sync (dipakai jika DB_ASYNC=true, lihat main.py)
+
+Setiap route di-mirror menjadi `async def` yang memakai AsyncSession.
+Logic route tetap satu sumber (fungsi sync di routes/*.py) dan dijalankan
+lewat AsyncSession.run_sync: semua I/O database di-await lewat driver
+async (aiosqlite / asyncpg) sehingga request tidak memakan thread dari
+threadpool. Serialisasi response juga dilakukan di dalam run_sync karena
+lazy load relationship tidak boleh terjadi di luar greenlet SQLAlchemy.
+"""
+import inspect
+from fastapi import APIRouter, Depends
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.responses import Response
+from backend.database import get_db, get_read_db, get_async_db
+from backend.utils.dependencies import (
+    get_current_user, get_current_seller, get_current_user_async, get_current_seller_async
+)
+
+# Dependency sync -> pengganti async-nya
+ASYNC_DEPENDENCIES = {
+    get_current_user: get_current_user_async,
+    get_current_seller: get_current_seller_async,
+}
+
+def _make_async_endpoint(route: APIRoute):
+    """
+    Return async endpoint untuk route, atau None jika tidak memakai database
+    atau sudah async (register / login: query sync di threadpool, bcrypt di
+    password pool, lihat routes/auth.py)
+    """
+    if inspect.iscoroutinefunction(route.endpoint):
+        return None
+    
+    signature = inspect.signature(route.endpoint)
+    params = []
+    db_param = None
+    
+    for param in signature.parameters.values():
+        dependency = getattr(param.default, "dependency", None)
+        if dependency in (get_db, get_read_db):
+            db_param = param.name
+            param = param.replace(annotation=AsyncSession, default=Depends(get_async_db))
+        elif dependency in ASYNC_DEPENDENCIES:
+            param = param.replace(default=Depends(ASYNC_DEPENDENCIES[dependency]))
+        params.append(param)
+    
+    if db_param is None:
+        return None
+    
+    sync_endpoint = route.endpoint
+    adapter = TypeAdapter(route.response_model) if route.response_model else None
+    
+    def call(session, kwargs):
+        result = sync_endpoint(**{**kwargs, db_param: session})
+        if adapter is not None and not isinstance(result, Response):
+            result = adapter.validate_python(result, from_attributes=True)
+        return result
+    
+    async def endpoint(**kwargs):
+        db = kwargs[db_param]
+        return await db.run_sync(call, kwargs)
+    
+    endpoint.__name__ = sync_endpoint.__name__
+    endpoint.__doc__ = sync_endpoint.__doc__
+    endpoint.__signature__ = signature.replace(parameters=params)
+    return endpoint
+
+def make_async_router(router: APIRouter) -> APIRouter:
+    """Buat APIRouter baru berisi versi async dari semua route di `router`"""
+    async_router = APIRouter()
+    
+    for route in router.routes:
+        endpoint = None
+        if isinstance(route, APIRoute):
+            endpoint = _make_async_endpoint(route)
+    
+        if endpoint is None:
+            async_router.routes.append(route)
+            continue
+    
+        async_router.add_api_route(
+            route.path,
+            endpoint,
+            methods=list(route.methods),
+            name=route.name,
+            response_model=route.response_model,
+            status_code=route.status_code,
+            tags=route.tags,
+            summary=route.summary,
+            description=route.description,
+            response_description=route.response_description,
+            responses=route.responses,
+            response_class=route.response_class,
+            dependencies=route.dependencies,
+            include_in_schema=route.include_in_schema,
+            deprecated=route.deprecated,
+        )
+    
+    return async_router
@@ -1,16 +1,24 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from backend.database import get_db
+from backend.database import get_db, get_read_db
 from backend.models.user import User
 from backend.schemas.user import UserRegister, UserLogin, Token, UserResponse
-from backend.utils.security import verify_password, get_password_hash, create_access_token
+from backend.config import settings
+from backend.utils.security import verify_password_async, get_password_hash_async, create_access_token
+from backend.utils.password_pool import PasswordPoolBusy
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
-@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(user_data: UserRegister, db: Session = Depends(get_db)):
-    """Register user baru"""
-    
+def server_busy() -> HTTPException:
+    """503 saat antrian hashing password penuh"""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server sedang sibuk, silakan coba lagi",
+        headers={"Retry-After": str(settings.password_hash_retry_after)}
+    )
+
+def _check_new_user(db: Session, user_data: UserRegister):
     # Cek email sudah ada
     existing_email = db.query(User).filter(User.email == user_data.email).first()
     if existing_email:
@@ -26,12 +34,12 @@ def register(user_data: UserRegister, db: Session = Depends(get_db)):
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username sudah digunakan"
         )
-    
-    # Buat user baru
+
+def _create_user(db: Session, user_data: UserRegister, hashed_password: str) -> User:
     new_user = User(
         email=user_data.email,
         username=user_data.username,
-        hashed_password=get_password_hash(user_data.password),
+        hashed_password=hashed_password,
         full_name=user_data.full_name,
         phone=user_data.phone,
         is_seller=user_data.is_seller
@@ -40,15 +48,35 @@ def register(user_data: UserRegister, db: Session = Depends(get_db)):
     db.add(new_user)
     db.commit()
     db.refresh(new_user)
-    
     return new_user
 
+def _find_user(db: Session, username: str):
+    return db.query(User).filter(User.username == username).first()
+
+# register / login adalah route async: query DB dijalankan di threadpool,
+# tapi selama bcrypt berjalan di password pool request hanya menunggu di
+# event loop, jadi lonjakan login tidak menghabiskan thread untuk endpoint lain
+
+@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+async def register(user_data: UserRegister, db: Session = Depends(get_db)):
+    """Register user baru"""
+    
+    await run_in_threadpool(_check_new_user, db, user_data)
+    
+    try:
+        hashed_password = await get_password_hash_async(user_data.password)
+    except PasswordPoolBusy:
+        raise server_busy()
+    
+    # Buat user baru
+    return await run_in_threadpool(_create_user, db, user_data, hashed_password)
+
 @router.post("/login", response_model=Token)
-def login(user_data: UserLogin, db: Session = Depends(get_db)):
+async def login(user_data: UserLogin, db: Session = Depends(get_db)):
     """Login dan dapat token"""
     
     # Cari user berdasarkan username
-    user = db.query(User).filter(User.username == user_data.username).first()
+    user = await run_in_threadpool(_find_user, db, user_data.username)
     
     if not user:
         raise HTTPException(
@@ -57,7 +85,12 @@ def login(user_data: UserLogin, db: Session = Depends(get_db)):
         )
     
     # Verifikasi password
-    if not verify_password(user_data.password, user.hashed_password):
+    try:
+        password_ok = await verify_password_async(user_data.password, user.hashed_password)
+    except PasswordPoolBusy:
+        raise server_busy()
+    
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Username atau password salah"
@@ -70,8 +103,13 @@ def login(user_data: UserLogin, db: Session = Depends(get_db)):
             detail="Akun tidak aktif"
         )
     
-    # Buat token
-    access_token = create_access_token(data={"sub": user.username, "user_id": user.id})
+    # Buat token (is_seller / is_active ikut di claims untuk client)
+    access_token = create_access_token(data={
+        "sub": user.username,
+        "user_id": user.id,
+        "is_seller": user.is_seller,
+        "is_active": user.is_active,
+    })
     
     return {
         "access_token": access_token,
@@ -80,7 +118,7 @@ def login(user_data: UserLogin, db: Session = Depends(get_db)):
     }
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user(token: str, db: Session = Depends(get_db)):
+def get_current_user(token: str, db: Session = Depends(get_read_db)):
     """Get user yang sedang login"""
     from backend.utils.security import decode_access_token
     
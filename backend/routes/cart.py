@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload
 from typing import List
-from backend.database import get_db
+from backend.database import get_db, get_read_db
 from backend.models.cart import CartItem
 from backend.models.product import Product
 from backend.models.user import User
-from backend.schemas.cart import CartItemCreate, CartItemUpdate, CartItemResponse, CartSummary
+from backend.schemas.cart import CartBulkCreate, CartItemCreate, CartItemUpdate, CartItemResponse, CartSummary, CartTotals
 from backend.utils.dependencies import get_current_user
 
 router = APIRouter(prefix="/cart", tags=["Shopping Cart"])
@@ -58,26 +59,114 @@ def add_to_cart(
     
     return new_item
 
-@router.get("/", response_model=CartSummary)
-def get_cart(
+@router.post("/bulk", response_model=List[CartItemResponse], status_code=status.HTTP_201_CREATED)
+def add_many_to_cart(
+    cart_data: CartBulkCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get user's cart"""
+    """Add many items to cart in one request (maksimal 100 item)"""
     
-    cart_items = db.query(CartItem).filter(CartItem.user_id == current_user.id).all()
+    # Gabungkan quantity per product
+    quantities = {}
+    for item in cart_data.items:
+        quantities[item.product_id] = quantities.get(item.product_id, 0) + item.quantity
     
-    total_items = len(cart_items)
-    total_quantity = sum(item.quantity for item in cart_items)
-    total_price = sum(item.product.price * item.quantity for item in cart_items)
+    product_ids = list(quantities)
+    stocks = dict(
+        db.query(Product.id, Product.stock).filter(Product.id.in_(product_ids)).all()
+    )
+    
+    for product_id, quantity in quantities.items():
+        if product_id not in stocks:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Produk ID {product_id} tidak ditemukan"
+            )
+        
+        if stocks[product_id] < quantity:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Stok produk ID {product_id} tidak cukup. Stok tersedia: {stocks[product_id]}"
+            )
+    
+    # Item yang sudah ada di cart cukup ditambah quantity-nya
+    existing = {
+        item.product_id: item
+        for item in db.query(CartItem).filter(
+            CartItem.user_id == current_user.id,
+            CartItem.product_id.in_(product_ids)
+        )
+    }
+    
+    for product_id, quantity in quantities.items():
+        if product_id in existing:
+            existing[product_id].quantity += quantity
+        else:
+            existing[product_id] = CartItem(
+                user_id=current_user.id,
+                product_id=product_id,
+                quantity=quantity
+            )
+            db.add(existing[product_id])
+    
+    db.flush()
+    item_ids = [item.id for item in existing.values()]
+    db.commit()
+    
+    # Load ulang sekaligus dengan product-nya untuk response
+    return db.query(CartItem).options(
+        joinedload(CartItem.product)
+    ).filter(
+        CartItem.id.in_(item_ids)
+    ).order_by(CartItem.id).all()
+
+def cart_totals(db: Session, user_id: int) -> dict:
+    """Hitung total cart dengan satu query aggregate"""
+    total_items, total_quantity, total_price = db.query(
+        func.count(CartItem.id),
+        func.coalesce(func.sum(CartItem.quantity), 0),
+        func.coalesce(func.sum(CartItem.quantity * Product.price), 0)
+    ).join(
+        Product, Product.id == CartItem.product_id
+    ).filter(
+        CartItem.user_id == user_id
+    ).one()
     
     return {
         "total_items": total_items,
         "total_quantity": total_quantity,
-        "total_price": total_price,
+        "total_price": total_price
+    }
+
+@router.get("/", response_model=CartSummary)
+def get_cart(
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get user's cart"""
+    
+    # Items beserta product-nya dalam satu query
+    cart_items = db.query(CartItem).options(
+        joinedload(CartItem.product, innerjoin=True)
+    ).filter(
+        CartItem.user_id == current_user.id
+    ).order_by(CartItem.id).all()
+    
+    return {
+        **cart_totals(db, current_user.id),
         "items": cart_items
     }
 
+@router.get("/summary", response_model=CartTotals)
+def get_cart_summary(
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get cart counts and totals only (navbar badge)"""
+    
+    return cart_totals(db, current_user.id)
+
 @router.put("/{item_id}", response_model=CartItemResponse)
 def update_cart_item(
     item_id: int,
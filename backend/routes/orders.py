@@ -1,13 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
-from typing import List
-from backend.database import get_db
-from backend.models.order import Order, OrderItem
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import Response
+from sqlalchemy import bindparam, insert, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, raiseload, selectinload
+from datetime import datetime
+from typing import List, Optional, Union
+from backend.database import get_db, get_read_db
+from backend.models.order import Order, OrderItem, OrderStatus
 from backend.models.product import Product
 from backend.models.user import User
-from backend.schemas.order import OrderCreate, OrderResponse
+from backend.schemas.order import OrderCreate, OrderResponse, OrderPage
 from backend.utils.dependencies import get_current_user
-from backend.schemas.order_extended import OrderExtended
+from backend.schemas.order_extended import OrderExtended, OrderExtendedPage
+from backend.utils.cache import invalidate_product
+from backend.utils.pagination import encode_cursor, decode_cursor
+from backend.utils.seller_stats import record_sales
+from backend.utils.categories import adjust_categories
+from backend.utils.fast_json import dumps, plain_list, respond
+from backend.utils.idempotency import find_key, purge_expired, replay_response, request_fingerprint, reserve_key
+from backend.config import settings
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/orders", tags=["Orders"])
@@ -15,6 +26,79 @@ router = APIRouter(prefix="/orders", tags=["Orders"])
 class PaymentRequest(BaseModel):
     payment_method: str
 
+def reserve_stock(db: Session, quantities: dict) -> bool:
+    """
+    Kurangi stock untuk {product_id: quantity} dengan UPDATE bersyarat
+    (stock >= quantity). Return False jika ada product yang tidak cukup;
+    caller wajib rollback.
+    """
+    products = Product.__table__
+    stmt = update(products).where(
+        products.c.id == bindparam("pid"),
+        products.c.stock >= bindparam("qty")
+    ).values(stock=products.c.stock - bindparam("qty"))
+    
+    # Urut id supaya dua order dengan product yang sama tidak saling deadlock
+    params = [{"pid": pid, "qty": quantities[pid]} for pid in sorted(quantities)]
+    
+    if db.get_bind().dialect.supports_sane_multi_rowcount:
+        return db.execute(stmt, params).rowcount == len(params)
+    
+    # Driver yang rowcount executemany-nya tidak akurat (asyncpg)
+    return all(db.execute(stmt, p).rowcount == 1 for p in params)
+
+def order_history(query, model, buyer_id: int, status_filter: Optional[str], cursor: Optional[str], limit: int):
+    """
+    Riwayat order buyer, terbaru dulu (index ix_orders_buyer_created_at_id).
+    
+    Tanpa `cursor` hasilnya list `limit` order terbaru (format lama, tetap
+    dibatasi). Dengan `cursor` (kosong untuk halaman pertama) hasilnya
+    {items, next_cursor} dengan keyset pagination pada (created_at, id).
+    Dengan FAST_JSON hasilnya langsung di-serialize sesuai schema `model`.
+    """
+    if status_filter is not None and status_filter not in {s.value for s in OrderStatus}:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Status tidak dikenal. Pilihan: {', '.join(s.value for s in OrderStatus)}"
+        )
+    
+    query = query.filter(Order.buyer_id == buyer_id)
+    if status_filter:
+        query = query.filter(Order.status == status_filter)
+    query = query.order_by(Order.created_at.desc(), Order.id.desc())
+    
+    limit = max(1, min(limit, 100))
+    if cursor is None:
+        orders = query.limit(limit).all()
+        return respond(dumps(plain_list(model, orders))) if settings.fast_json else orders
+    
+    if cursor:
+        try:
+            last_values = decode_cursor(cursor, "orders", (datetime, int))
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        query = query.filter(tuple_(Order.created_at, Order.id) < tuple_(*last_values))
+    
+    # Ambil 1 row ekstra untuk tahu apakah masih ada halaman berikutnya
+    orders = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(orders) > limit:
+        orders = orders[:limit]
+        next_cursor = encode_cursor("orders", (orders[-1].created_at, orders[-1].id))
+    
+    if settings.fast_json:
+        return respond(dumps({"items": plain_list(model, orders), "next_cursor": next_cursor}))
+    return {"items": orders, "next_cursor": next_cursor}
+
+def raise_out_of_stock(product):
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Stok {product.name} tidak cukup. Tersedia: {product.stock}"
+    )
+
 @router.post("/{order_id}/pay", status_code=status.HTTP_200_OK)
 def pay_order(
     order_id: int,
@@ -24,7 +108,8 @@ def pay_order(
 ):
     """Mark order as paid"""
     
-    order = db.query(Order).filter(
+    # Hanya butuh status, jangan load items / product
+    order = db.query(Order).options(raiseload("*")).filter(
         Order.id == order_id,
         Order.buyer_id == current_user.id
     ).first()
@@ -41,25 +126,63 @@ def pay_order(
             detail=f"Order tidak bisa dibayar. Status saat ini: {order.status}"
         )
     
-    # Update order status
-    order.status = "paid"
+    # Update order status dan rollup seller (satu transaksi). Status dicek
+    # ulang di UPDATE supaya dua request bayar paralel tidak dihitung dua kali
+    paid = db.query(Order).filter(
+        Order.id == order.id,
+        Order.status == "pending"
+    ).update({"status": "paid"}, synchronize_session=False)
+    
+    if not paid:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Order sudah dibayar atau dibatalkan"
+        )
+    
+    items = db.query(
+        Product.seller_id, OrderItem.product_id, OrderItem.quantity, OrderItem.price
+    ).join(
+        Product, Product.id == OrderItem.product_id
+    ).filter(
+        OrderItem.order_id == order.id
+    ).all()
+    day = order.created_at.date()
+    record_sales(db, [(i.seller_id, i.product_id, day, i.quantity, i.price) for i in items], paid=True)
     db.commit()
-    db.refresh(order)
     
     return {
         "message": "Pembayaran berhasil!",
         "order_id": order_id,
-        "status": order.status,
+        "status": "paid",
         "payment_method": payment_data.payment_method
     }
 
 @router.post("/", response_model=OrderResponse, status_code=status.HTTP_201_CREATED)
 def create_order(
     order_data: OrderCreate,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Create order from cart items"""
+    """Create order from cart items (retry aman dengan header Idempotency-Key)"""
+    
+    # Retry dengan key yang sama: kirim ulang response order pertama
+    # (lihat utils/idempotency.py)
+    idempotency = None
+    if idempotency_key is not None:
+        fingerprint = request_fingerprint(order_data)
+        existing = find_key(db, current_user.id, idempotency_key)
+        if existing is not None:
+            return replay_response(existing, fingerprint)
+        try:
+            idempotency = reserve_key(
+                db, current_user.id, idempotency_key, fingerprint, status.HTTP_201_CREATED
+            )
+        except IntegrityError:
+            # Request lain dengan key yang sama commit lebih dulu
+            db.rollback()
+            return replay_response(find_key(db, current_user.id, idempotency_key), fingerprint)
     
     if not order_data.items:
         raise HTTPException(
@@ -67,31 +190,60 @@ def create_order(
             detail="Order harus memiliki minimal 1 item"
         )
     
-    # Calculate total and validate stock
-    total_amount = 0
-    order_items = []
-    
+    # Gabungkan quantity per product (item yang sama bisa muncul dua kali)
+    quantities = {}
     for item in order_data.items:
-        product = db.query(Product).filter(Product.id == item.product_id).first()
-        
-        if not product:
+        if item.quantity <= 0:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Quantity harus lebih dari 0"
+            )
+        quantities[item.product_id] = quantities.get(item.product_id, 0) + item.quantity
+    
+    # Satu query untuk semua product di order
+    products = {
+        p.id: p for p in db.query(
+            Product.id, Product.name, Product.stock, Product.category, Product.seller_id
+        ).filter(
+            Product.id.in_(list(quantities))
+        )
+    }
+    
+    for product_id, quantity in quantities.items():
+        if product_id not in products:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Produk ID {item.product_id} tidak ditemukan"
+                detail=f"Produk ID {product_id} tidak ditemukan"
             )
         
-        if product.stock < item.quantity:
+        if products[product_id].stock < quantity:
+            raise_out_of_stock(products[product_id])
+    
+    # Stock bisa berubah sejak dibaca di atas, jadi yang menentukan adalah
+    # UPDATE bersyarat. Kalau satu saja gagal, seluruh order di-rollback.
+    if not reserve_stock(db, quantities):
+        db.rollback()
+        current = db.query(Product.id, Product.name, Product.stock).filter(
+            Product.id.in_(list(quantities))
+        ).order_by(Product.id).all()
+        found = {p.id for p in current}
+        missing = [product_id for product_id in sorted(quantities) if product_id not in found]
+        if missing:
+            # Product dihapus di antara validasi dan reservasi
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Stok {product.name} tidak cukup. Tersedia: {product.stock}"
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Produk ID {missing[0]} tidak ditemukan"
             )
-        
-        total_amount += item.price * item.quantity
-        order_items.append({
-            'product': product,
-            'quantity': item.quantity,
-            'price': item.price
-        })
+        short = [p for p in current if p.stock < quantities[p.id]]
+        if short:
+            raise_out_of_stock(short[0])
+        # Stock sudah kembali cukup setelah reservasi gagal
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Stok berubah saat checkout, silakan coba lagi"
+        )
+    
+    total_amount = sum(item.price * item.quantity for item in order_data.items)
     
     # Create order
     new_order = Order(
@@ -104,52 +256,78 @@ def create_order(
     db.add(new_order)
     db.flush()
     
-    # Create order items and update stock
-    for item_data in order_items:
-        order_item = OrderItem(
-            order_id=new_order.id,
-            product_id=item_data['product'].id,
-            quantity=item_data['quantity'],
-            price=item_data['price']
-        )
-        db.add(order_item)
-        
-        # Update product stock
-        item_data['product'].stock -= item_data['quantity']
+    # Create order items (satu INSERT multi-row)
+    db.execute(insert(OrderItem), [
+        {
+            "order_id": new_order.id,
+            "product_id": item.product_id,
+            "quantity": item.quantity,
+            "price": item.price,
+        }
+        for item in order_data.items
+    ])
+    
+    day = new_order.created_at.date()
+    record_sales(db, [
+        (products[item.product_id].seller_id, item.product_id, day, item.quantity, item.price)
+        for item in order_data.items
+    ])
+    
+    # Product yang stock-nya habis karena order ini keluar dari hitungan in-stock
+    sold_out = db.query(Product.category).filter(
+        Product.id.in_(list(quantities)),
+        Product.stock == 0
+    ).all()
+    adjust_categories(db, [(category, 0, -1) for (category,) in sold_out])
+    
+    touched = [(p.id, p.category) for p in products.values()]
+    
+    # Response disimpan bersama key di transaksi yang sama dengan order
+    if idempotency is not None:
+        body = OrderResponse.model_validate(new_order).model_dump_json()
+        idempotency.response_body = body
     
     db.commit()
+    
+    # Stock berubah, buang cache product yang dibeli
+    for product_id, category in touched:
+        invalidate_product(product_id, category)
+    
+    if idempotency is not None:
+        purge_expired(db)
+        return Response(body, status_code=status.HTTP_201_CREATED, media_type="application/json")
+    
     db.refresh(new_order)
     
     return new_order
 
-@router.get("/", response_model=List[OrderResponse])
+@router.get("/", response_model=Union[List[OrderResponse], OrderPage])
 def get_my_orders(
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    limit: int = 20,
+    status_filter: Optional[str] = Query(None, alias="status"),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get user's orders"""
+    """Get user's orders (filter ?status=, paginate with ?cursor=)"""
     
-    # Use joinedload to include items in one query
-    orders = db.query(Order).options(
-        joinedload(Order.items)
-    ).filter(
-        Order.buyer_id == current_user.id
-    ).order_by(
-        Order.created_at.desc()
-    ).all()
+    # Items di-load dengan satu query IN terpisah (tanpa product)
+    query = db.query(Order).options(
+        selectinload(Order.items)
+    )
     
-    return orders
+    return order_history(query, OrderResponse, current_user.id, status_filter, cursor, limit)
 
 @router.get("/{order_id}", response_model=OrderResponse)
 def get_order_detail(
     order_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get order detail"""
     
     order = db.query(Order).options(
-        joinedload(Order.items)
+        selectinload(Order.items)
     ).filter(
         Order.id == order_id,
         Order.buyer_id == current_user.id
@@ -163,20 +341,24 @@ def get_order_detail(
     
     return order
 
-@router.get("/extended/all", response_model=List[OrderExtended])
+@router.get("/extended/all", response_model=Union[List[OrderExtended], OrderExtendedPage])
 def get_orders_with_products(
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    limit: int = 20,
+    status_filter: Optional[str] = Query(None, alias="status"),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get orders with full product information"""
+    """Get orders with full product information (filter ?status=, paginate with ?cursor=)"""
     
-    orders = db.query(Order).filter(
-        Order.buyer_id == current_user.id
-    ).order_by(
-        Order.created_at.desc()
-    ).all()
+    # Product hanya kolom yang dipakai ProductInOrder (tanpa description)
+    query = db.query(Order).options(
+        selectinload(Order.items).selectinload(OrderItem.product).load_only(
+            Product.id, Product.name, Product.price, Product.image_url
+        )
+    )
     
-    return orders
+    return order_history(query, OrderExtended, current_user.id, status_filter, cursor, limit)
 
 @router.post("/{order_id}/pay", status_code=status.HTTP_200_OK)
 def pay_order(
@@ -187,7 +369,8 @@ def pay_order(
 ):
     """Mark order as paid"""
     
-    order = db.query(Order).filter(
+    # Hanya butuh status, jangan load items / product
+    order = db.query(Order).options(raiseload("*")).filter(
         Order.id == order_id,
         Order.buyer_id == current_user.id
     ).first()
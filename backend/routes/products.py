@@ -1,14 +1,72 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import csv
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from sqlalchemy import tuple_, update
 from sqlalchemy.orm import Session
-from typing import List
-from backend.database import get_db
+from datetime import datetime
+from typing import List, Optional, Union
+from backend.database import get_db, get_read_db
 from backend.models.product import Product
+from backend.models.category import ProductCategory
 from backend.models.user import User
-from backend.schemas.product import ProductCreate, ProductUpdate, ProductResponse
+from backend.schemas.product import ProductCreate, ProductUpdate, ProductResponse, ProductPage, CategoryCount, ProductImportResult
 from backend.utils.dependencies import get_current_seller, get_current_user
+from backend.utils.pagination import encode_cursor, decode_cursor, filter_scope
+from backend.utils.search import index_product, unindex_product, search_product_ids
+from backend.utils.cache import product_detail_cache, product_list_cache, category_cache, search_cache, invalidate_product, invalidate_listings
+from backend.utils.categories import product_added, product_changed, product_removed
+from backend.utils.etag import bucket_ttl, etag_for
+from backend.utils.fast_json import dumps, plain_list, respond
+from backend.utils.product_import import detect_format, iter_rows, import_products
+from backend.config import settings
 
 router = APIRouter(prefix="/products", tags=["Products"])
 
+# Offset pagination lebih dalam dari ini tidak di-cache (jarang diulang,
+# dan setiap skip berbeda adalah key baru)
+MAX_CACHED_SKIP = 1000
+
+# Sort yang didukung cursor mode: (kolom keyset, tipe nilai, descending)
+# Setiap kombinasi punya composite index di models/product.py
+PRODUCT_SORTS = {
+    "newest": ((Product.created_at, Product.id), (datetime, int), True),
+    "price_asc": ((Product.price, Product.id), (float, int), False),
+    "price_desc": ((Product.price, Product.id), (float, int), True),
+}
+
+def product_listing(
+    query,
+    sort: str = "newest",
+    category: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    in_stock_only: bool = False,
+    seller_id: Optional[int] = None
+):
+    """
+    Terapkan filter dan urutan listing product ke `query`.
+    Category / seller + sort harga atau newest berjalan sebagai index range
+    scan (tests/test_product_listing_plan.py)
+    """
+    if sort not in PRODUCT_SORTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Sort tidak dikenal. Pilihan: {', '.join(PRODUCT_SORTS)}"
+        )
+    
+    if category:
+        query = query.filter(Product.category == category)
+    if seller_id is not None:
+        query = query.filter(Product.seller_id == seller_id)
+    if min_price is not None:
+        query = query.filter(Product.price >= min_price)
+    if max_price is not None:
+        query = query.filter(Product.price <= max_price)
+    if in_stock_only:
+        query = query.filter(Product.stock > 0)
+    
+    columns, types, descending = PRODUCT_SORTS[sort]
+    return query.order_by(*[c.desc() if descending else c.asc() for c in columns])
+
 @router.post("/", response_model=ProductResponse, status_code=status.HTTP_201_CREATED)
 def create_product(
     product_data: ProductCreate,
@@ -29,38 +87,242 @@ def create_product(
     )
     
     db.add(new_product)
+    db.flush()
+    index_product(db, new_product)
+    product_added(db, new_product.category, new_product.stock)
     db.commit()
     db.refresh(new_product)
+    invalidate_product(new_product.id, new_product.category)
     
     return new_product
 
-@router.get("/", response_model=List[ProductResponse])
+@router.post("/bulk", response_model=ProductImportResult)
+def bulk_import_products(
+    file: UploadFile = File(...),
+    file_format: Optional[str] = Query(None, alias="format"),
+    batch_size: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_seller)
+):
+    """
+    Import banyak product sekaligus dari file CSV atau JSONL (hanya seller)
+    
+    Kolom / key sama dengan POST /products/. Format diambil dari ?format=
+    (csv / jsonl), atau dari ekstensi file. File dibaca baris per baris dan
+    di-insert per batch (default BULK_IMPORT_BATCH_SIZE row per transaksi).
+    Row yang tidak valid dilewati dan dilaporkan di `errors`.
+    """
+    file_format = file_format or detect_format(file.filename, file.content_type)
+    if file_format not in ("csv", "jsonl"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Format file tidak dikenal. Pilihan: csv, jsonl"
+        )
+    
+    batch_size = max(1, min(batch_size or settings.bulk_import_batch_size, 10000))
+    
+    try:
+        result = import_products(
+            db,
+            iter_rows(file.file, file_format),
+            seller_id=current_user.id,
+            batch_size=batch_size,
+            max_errors=settings.bulk_import_max_errors
+        )
+    except (UnicodeDecodeError, csv.Error) as e:
+        # Batch sebelumnya sudah ter-commit, kategorinya tidak diketahui di sini
+        db.rollback()
+        product_list_cache.clear()
+        category_cache.clear()
+        search_cache.clear()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File tidak bisa dibaca: {e}"
+        )
+    
+    invalidate_listings(*result.pop("categories"))
+    return result
+
+@router.get("/", response_model=Union[List[ProductResponse], ProductPage], dependencies=[Depends(etag_for("products"))])
 def get_all_products(
     skip: int = 0,
     limit: int = 20,
     category: str = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    sort: str = "newest",
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    in_stock_only: bool = False,
+    seller_id: Optional[int] = None,
+    db: Session = Depends(get_read_db)
 ):
     """
     Get semua products (public, tidak perlu login)
+    
+    Filter: category, seller_id, min_price / max_price, in_stock_only.
+    Sort: newest (default), price_asc, price_desc.
+    
+    Tanpa `cursor` response berupa list (offset pagination). `limit`
+    maksimal 100 di kedua mode.
+    Dengan `cursor` (kosong untuk halaman pertama) response berupa
+    {items, next_cursor} dan halaman berikutnya diambil dengan keyset
+    pagination, jadi biayanya tetap sama di halaman berapapun.
     """
-    query = db.query(Product)
+    # Di-clamp sebelum jadi cache key supaya client tidak bisa mengisi
+    # cache dengan key sembarang (limit=1..N) dan mengusir entry yang berguna
+    limit = max(1, min(limit, 100))
+    skip = max(0, skip)
+    cache_key = (category or None, skip, limit, cursor, sort, min_price, max_price, in_stock_only, seller_id)
+    cacheable = skip <= MAX_CACHED_SKIP
+    cached = product_list_cache.get(cache_key) if cacheable else None
+    if cached is not None:
+        return respond(cached)
+    # Ambil sebelum query: jika ada invalidasi selama query, hasilnya tidak di-cache
+    generation = product_list_cache.generation
     
-    # Filter by category jika ada
-    if category:
-        query = query.filter(Product.category == category)
+    query = product_listing(
+        db.query(Product), sort,
+        category=category,
+        min_price=min_price,
+        max_price=max_price,
+        in_stock_only=in_stock_only,
+        seller_id=seller_id
+    )
+    
+    if cursor is None:
+        products = query.offset(skip).limit(limit).all()
+        if settings.fast_json:
+            result = dumps(plain_list(ProductResponse, products))
+        else:
+            result = [ProductResponse.model_validate(p).model_dump() for p in products]
+        if cacheable:
+            product_list_cache.set(cache_key, result, ttl=bucket_ttl(product_list_cache.ttl), generation=generation)
+        return respond(result)
+    
+    columns, types, descending = PRODUCT_SORTS[sort]
+    # Cursor hanya berlaku untuk filter yang sama dengan halaman asalnya
+    scope = filter_scope(category or None, min_price, max_price, in_stock_only, seller_id)
+    
+    if cursor:
+        try:
+            last_values = decode_cursor(cursor, sort, types, scope)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+    
+        if descending:
+            query = query.filter(tuple_(*columns) < tuple_(*last_values))
+        else:
+            query = query.filter(tuple_(*columns) > tuple_(*last_values))
+    
+    # Ambil 1 row ekstra untuk tahu apakah masih ada halaman berikutnya
+    products = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(products) > limit:
+        products = products[:limit]
+        last = products[-1]
+        next_cursor = encode_cursor(sort, tuple(getattr(last, c.key) for c in columns), scope)
+    
+    if settings.fast_json:
+        result = dumps({"items": plain_list(ProductResponse, products), "next_cursor": next_cursor})
+    else:
+        result = {
+            "items": [ProductResponse.model_validate(p).model_dump() for p in products],
+            "next_cursor": next_cursor
+        }
+    product_list_cache.set(cache_key, result, ttl=bucket_ttl(product_list_cache.ttl), generation=generation)
+    return respond(result)
+
+@router.get("/search", response_model=ProductPage, dependencies=[Depends(etag_for("products"))])
+def search_products(
+    q: str,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Full-text search di name, description dan category (public)
+    
+    Product yang semua katanya ada di name tampil lebih dulu, diurutkan
+    berdasarkan relevansi (BM25); setelah itu match di description /
+    category, terbaru dulu. Maksimal 500 hasil per query (lihat
+    SEARCH_CANDIDATE_LIMIT). Maksimal 5 kata; kata terakhir (minimal
+    2 huruf) dicocokkan sebagai prefix, jadi bisa dipakai untuk
+    search-as-you-type.
+    """
+    limit = max(1, min(limit, 100))
+    cache_key = (q, cursor, limit)
+    cached = search_cache.get(cache_key)
+    if cached is not None:
+        return respond(cached)
+    generation = search_cache.generation
+    
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor, "relevance", (int, float, int))
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+    
+    hits = search_product_ids(db, q, limit + 1, after)
+    next_cursor = None
+    if len(hits) > limit:
+        hits = hits[:limit]
+        next_cursor = encode_cursor("relevance", (hits[-1].tier, hits[-1].score, hits[-1].id))
     
-    products = query.offset(skip).limit(limit).all()
-    return products
+    ids = [hit.id for hit in hits]
+    products = db.query(Product).filter(Product.id.in_(ids)).all() if ids else []
+    by_id = {p.id: p for p in products}
+    items = [by_id[i] for i in ids if i in by_id]
+    
+    if settings.fast_json:
+        result = dumps({"items": plain_list(ProductResponse, items), "next_cursor": next_cursor})
+    else:
+        result = {
+            "items": [ProductResponse.model_validate(p).model_dump() for p in items],
+            "next_cursor": next_cursor
+        }
+    search_cache.set(cache_key, result, ttl=bucket_ttl(search_cache.ttl), generation=generation)
+    return respond(result)
+
+@router.get("/categories", response_model=List[CategoryCount], dependencies=[Depends(etag_for("product_categories"))])
+def get_categories(db: Session = Depends(get_read_db)):
+    """
+    Daftar kategori dengan jumlah product dan yang masih ada stock (public)
+    """
+    cached = category_cache.get("all")
+    if cached is not None:
+        return cached
+    generation = category_cache.generation
+    
+    categories = db.query(ProductCategory).filter(
+        ProductCategory.product_count > 0
+    ).order_by(
+        ProductCategory.product_count.desc(), ProductCategory.category
+    ).all()
+    
+    result = [CategoryCount.model_validate(c).model_dump() for c in categories]
+    category_cache.set("all", result, ttl=bucket_ttl(category_cache.ttl), generation=generation)
+    return result
 
-@router.get("/{product_id}", response_model=ProductResponse)
+@router.get("/{product_id}", response_model=ProductResponse, dependencies=[Depends(etag_for("products"))])
 def get_product_detail(
     product_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get detail 1 product (public)
     """
+    cached = product_detail_cache.get(product_id)
+    if cached is not None:
+        return cached
+    generation = product_detail_cache.generation
+    
     product = db.query(Product).filter(Product.id == product_id).first()
     
     if not product:
@@ -69,7 +331,21 @@ def get_product_detail(
             detail="Product tidak ditemukan"
         )
     
-    return product
+    result = ProductResponse.model_validate(product).model_dump()
+    product_detail_cache.set(product_id, result, ttl=bucket_ttl(product_detail_cache.ttl), generation=generation)
+    return result
+
+def _product_for_update(db: Session, product_id: int):
+    """
+    Load product dengan row-nya dikunci sampai commit, supaya category /
+    stock lama yang dipakai product_changed / product_removed tidak basi
+    karena checkout yang belum commit (reserve_stock mengunci row yang sama)
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        # SQLite tidak punya FOR UPDATE: write no-op mengambil write lock lebih dulu
+        products = Product.__table__
+        db.execute(update(products).where(products.c.id == product_id).values(id=products.c.id))
+    return db.query(Product).filter(Product.id == product_id).with_for_update().first()
 
 @router.put("/{product_id}", response_model=ProductResponse)
 def update_product(
@@ -81,7 +357,7 @@ def update_product(
     """
     Update product (hanya seller pemilik product)
     """
-    product = db.query(Product).filter(Product.id == product_id).first()
+    product = _product_for_update(db, product_id)
     
     if not product:
         raise HTTPException(
@@ -96,13 +372,18 @@ def update_product(
             detail="Anda tidak bisa edit product orang lain"
         )
     
+    old_category, old_stock = product.category, product.stock
+    
     # Update fields yang diisi
     update_data = product_data.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(product, field, value)
     
+    index_product(db, product)
+    product_changed(db, old_category, old_stock, product.category, product.stock)
     db.commit()
     db.refresh(product)
+    invalidate_product(product.id, old_category, product.category)
     
     return product
 
@@ -115,7 +396,7 @@ def delete_product(
     """
     Delete product (hanya seller pemilik product)
     """
-    product = db.query(Product).filter(Product.id == product_id).first()
+    product = _product_for_update(db, product_id)
     
     if not product:
         raise HTTPException(
@@ -130,18 +411,24 @@ def delete_product(
             detail="Anda tidak bisa hapus product orang lain"
         )
     
+    category = product.category
+    unindex_product(db, product.id)
+    product_removed(db, category, product.stock)
     db.delete(product)
     db.commit()
+    invalidate_product(product_id, category)
     
     return {"message": "Product berhasil dihapus", "product_id": product_id}
 
 @router.get("/my/products", response_model=List[ProductResponse])
 def get_my_products(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_seller)
 ):
     """
     Get semua products milik seller yang login
     """
     products = db.query(Product).filter(Product.seller_id == current_user.id).all()
+    if settings.fast_json:
+        return respond(dumps(plain_list(ProductResponse, products)))
     return products
\ No newline at end of file
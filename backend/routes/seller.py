@@ -0,0 +1,188 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from datetime import date, datetime, timedelta
+from typing import Optional
+from backend.database import get_read_db
+from backend.models.order import Order, OrderItem, OrderStatus
+from backend.models.product import Product
+from backend.models.seller_stats import SellerDailyStat
+from backend.models.user import User
+from backend.schemas.seller import SellerStats
+from backend.utils.dependencies import get_current_seller
+from backend.utils.export import EXPORT_MEDIA_TYPES, export_response
+
+router = APIRouter(prefix="/seller", tags=["Seller"])
+
+SALES_COLUMNS = ("units_ordered", "revenue_ordered", "units_paid", "revenue_paid")
+
+@router.get("/stats", response_model=SellerStats)
+def get_seller_stats(
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    top: int = 5,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_seller)
+):
+    """
+    Revenue, units sold dan top products seller (default 30 hari terakhir)
+    
+    Dibaca dari rollup seller_daily_stats, jadi biayanya sebanding dengan
+    jumlah hari x product yang terjual, bukan jumlah order.
+    """
+    date_to = date_to or datetime.utcnow().date()
+    date_from = date_from or date_to - timedelta(days=29)
+    
+    if date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Parameter from harus sebelum to"
+        )
+    
+    sums = [func.sum(getattr(SellerDailyStat, name)).label(name) for name in SALES_COLUMNS]
+    in_range = (
+        SellerDailyStat.seller_id == current_user.id,
+        SellerDailyStat.day >= date_from,
+        SellerDailyStat.day <= date_to,
+    )
+    
+    daily = db.query(SellerDailyStat.day, *sums).filter(*in_range).group_by(
+        SellerDailyStat.day
+    ).order_by(SellerDailyStat.day).all()
+    
+    top_products = db.query(
+        SellerDailyStat.product_id,
+        Product.name,
+        func.sum(SellerDailyStat.order_count).label("order_count"),
+        *sums
+    ).join(
+        Product, Product.id == SellerDailyStat.product_id
+    ).filter(*in_range).group_by(
+        SellerDailyStat.product_id, Product.name
+    ).order_by(
+        func.sum(SellerDailyStat.revenue_paid).desc(),
+        func.sum(SellerDailyStat.revenue_ordered).desc()
+    ).limit(max(1, min(top, 50))).all()
+    
+    return {
+        "date_from": date_from,
+        "date_to": date_to,
+        "totals": {name: sum(getattr(row, name) for row in daily) for name in SALES_COLUMNS},
+        "daily": [row._asdict() for row in daily],
+        "top_products": [row._asdict() for row in top_products]
+    }
+
+def check_export_params(file_format: str, date_from: Optional[date], date_to: Optional[date]):
+    if file_format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Format tidak dikenal. Pilihan: {', '.join(EXPORT_MEDIA_TYPES)}"
+        )
+    
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Parameter from harus sebelum to"
+        )
+
+def created_between(column, date_from: Optional[date], date_to: Optional[date]) -> list:
+    """Filter created_at untuk rentang tanggal inklusif [from, to]"""
+    conditions = []
+    if date_from:
+        conditions.append(column >= datetime.combine(date_from, datetime.min.time()))
+    if date_to:
+        conditions.append(column < datetime.combine(date_to + timedelta(days=1), datetime.min.time()))
+    return conditions
+
+def orders_export_statement(
+    seller_id: int,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    status_filter: Optional[str] = None
+):
+    """Query export order seller, dipisah supaya query plan-nya bisa di-test"""
+    statement = select(
+        Order.id.label("order_id"),
+        Order.created_at,
+        Order.status,
+        OrderItem.product_id,
+        Product.name.label("product_name"),
+        OrderItem.quantity,
+        OrderItem.price,
+        (OrderItem.quantity * OrderItem.price).label("subtotal"),
+        Order.shipping_address,
+    ).join(
+        OrderItem, OrderItem.order_id == Order.id
+    ).join(
+        Product, Product.id == OrderItem.product_id
+    ).where(
+        Product.seller_id == seller_id,
+        *created_between(Order.created_at, date_from, date_to)
+    ).order_by(
+        # Ikut jalur index (ix_products_seller_created_at_id ->
+        # ix_order_items_product_id_order_id) supaya tidak ada sort penuh
+        # sebelum baris pertama di-stream. orders tidak punya index per seller.
+        Product.created_at, Product.id, OrderItem.order_id, OrderItem.id
+    )
+    
+    if status_filter:
+        statement = statement.where(Order.status == status_filter)
+    return statement
+
+@router.get("/export/orders")
+def export_orders(
+    file_format: str = Query("csv", alias="format"),
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    current_user: User = Depends(get_current_seller)
+):
+    """
+    Export item order yang berisi product seller (CSV / JSONL, di-stream)
+    
+    Satu baris per order item, urut per product lalu order id. Filter:
+    ?from= / ?to= (tanggal order) dan ?status=.
+    """
+    check_export_params(file_format, date_from, date_to)
+    if status_filter is not None and status_filter not in {s.value for s in OrderStatus}:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Status tidak dikenal. Pilihan: {', '.join(s.value for s in OrderStatus)}"
+        )
+    
+    statement = orders_export_statement(current_user.id, date_from, date_to, status_filter)
+    return export_response(statement, file_format, "orders")
+
+@router.get("/export/products")
+def export_products(
+    file_format: str = Query("csv", alias="format"),
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    in_stock_only: bool = False,
+    current_user: User = Depends(get_current_seller)
+):
+    """
+    Export katalog seller (CSV / JSONL, di-stream)
+    
+    Filter: ?from= / ?to= (tanggal product dibuat) dan ?in_stock_only=.
+    """
+    check_export_params(file_format, date_from, date_to)
+    
+    statement = select(
+        Product.id,
+        Product.name,
+        Product.description,
+        Product.price,
+        Product.stock,
+        Product.category,
+        Product.image_url,
+        Product.created_at,
+    ).where(
+        Product.seller_id == current_user.id,
+        *created_between(Product.created_at, date_from, date_to)
+    ).order_by(Product.created_at, Product.id)
+    
+    if in_stock_only:
+        statement = statement.where(Product.stock > 0)
+    
+    return export_response(statement, file_format, "products")
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, validator
-from typing import Optional
+from pydantic import BaseModel, Field, validator
+from typing import List, Optional
 from datetime import datetime
 from backend.schemas.product import ProductResponse
 
@@ -13,6 +13,18 @@ class CartItemCreate(BaseModel):
             raise ValueError('Quantity harus lebih dari 0')
         return v
 
+# Batas item per POST /cart/bulk, sama dengan limit maksimal endpoint list
+MAX_BULK_ITEMS = 100
+
+class CartBulkCreate(BaseModel):
+    items: List[CartItemCreate] = Field(max_length=MAX_BULK_ITEMS)
+    
+    @validator('items')
+    def items_not_empty(cls, v):
+        if not v:
+            raise ValueError('Minimal 1 item')
+        return v
+
 class CartItemUpdate(BaseModel):
     quantity: int
     
@@ -33,8 +45,10 @@ class CartItemResponse(BaseModel):
     class Config:
         from_attributes = True
 
-class CartSummary(BaseModel):
+class CartTotals(BaseModel):
     total_items: int
     total_quantity: int
     total_price: float
+
+class CartSummary(CartTotals):
     items: list[CartItemResponse]
\ No newline at end of file
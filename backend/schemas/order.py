@@ -36,4 +36,8 @@ class OrderResponse(BaseModel):
     items: List[OrderItemResponse]
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class OrderPage(BaseModel):
+    items: List[OrderResponse]
+    next_cursor: Optional[str] = None
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 
 class ProductInOrder(BaseModel):
@@ -31,4 +31,8 @@ class OrderExtended(BaseModel):
     items: List[OrderItemExtended]
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class OrderExtendedPage(BaseModel):
+    items: List[OrderExtended]
+    next_cursor: Optional[str] = None
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, validator
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class ProductCreate(BaseModel):
@@ -42,4 +42,26 @@ class ProductResponse(BaseModel):
     created_at: datetime
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class ProductPage(BaseModel):
+    items: List[ProductResponse]
+    next_cursor: Optional[str] = None
+
+class CategoryCount(BaseModel):
+    category: str
+    product_count: int
+    in_stock_count: int
+    
+    class Config:
+        from_attributes = True
+
+class ImportRowError(BaseModel):
+    row: int
+    error: str
+
+class ProductImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: List[ImportRowError]
+    errors_truncated: bool = False
\ No newline at end of file
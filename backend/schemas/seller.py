@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+from typing import List
+from datetime import date
+
+class SalesTotals(BaseModel):
+    units_ordered: int = 0
+    revenue_ordered: float = 0
+    units_paid: int = 0
+    revenue_paid: float = 0
+
+class DailySales(SalesTotals):
+    day: date
+
+class TopProduct(SalesTotals):
+    product_id: int
+    name: str
+    order_count: int
+
+class SellerStats(BaseModel):
+    date_from: date
+    date_to: date
+    totals: SalesTotals
+    daily: List[DailySales]
+    top_products: List[TopProduct]
@@ -0,0 +1,110 @@
+import threading
+import time
+from collections import OrderedDict
+
+class TTLCache:
+    """
+    Cache in-memory dengan LRU eviction dan TTL per key.
+    Thread-safe (route sync dijalankan di threadpool).
+    
+    Cache ini per proses: dengan beberapa worker uvicorn, invalidasi hanya
+    berlaku di worker yang melakukan write, worker lain mengandalkan TTL.
+    
+    `generation` naik setiap ada invalidasi (delete / delete_where / clear).
+    Ambil nilainya sebelum query lalu kirim ke set(): hasil yang dihitung
+    sebelum invalidasi yang terjadi bersamaan tidak akan di-cache.
+    """
+    
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """Return value atau None jika tidak ada / sudah expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+    
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+    
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def set(self, key, value, ttl: float = None, generation: int = None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def delete(self, key):
+        with self._lock:
+            self.generation += 1
+            self._data.pop(key, None)
+    
+    def delete_where(self, predicate):
+        """Hapus semua key yang memenuhi predicate(key)"""
+        with self._lock:
+            self.generation += 1
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+    
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._data.clear()
+    
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else 0.0,
+            }
+
+# Cache untuk endpoint product public (lihat routes/products.py).
+# Key detail: product_id. Key listing: (category, ...) dimana category
+# None berarti listing semua kategori. Route memotong TTL di akhir bucket
+# ETag (etag.bucket_ttl), jadi umur entry maksimal ETAG_TTL.
+product_detail_cache = TTLCache(maxsize=4096, ttl=300)
+product_list_cache = TTLCache(maxsize=1024, ttl=60)
+# Key search: (q, cursor, limit), dibuang bersama listing
+search_cache = TTLCache(maxsize=1024, ttl=60)
+category_cache = TTLCache(maxsize=1, ttl=60)
+
+def invalidate_product(product_id: int, *categories):
+    """
+    Buang cache yang bisa berisi product ini: detail-nya sendiri dan
+    listing untuk kategorinya (lama dan baru) plus listing semua kategori,
+    dan daftar kategori.
+    """
+    product_detail_cache.delete(product_id)
+    invalidate_listings(*categories)
+
+def invalidate_listings(*categories):
+    """
+    Buang listing untuk kategori ini plus listing semua kategori, daftar
+    kategori, dan semua hasil search
+    """
+    category_cache.clear()
+    search_cache.clear()
+    affected = set(categories) | {None}
+    product_list_cache.delete_where(lambda key: key[0] in affected)
@@ -0,0 +1,55 @@
+from sqlalchemy import case, delete, func, insert, select
+from sqlalchemy.orm import Session
+from backend.models.category import ProductCategory
+from backend.models.product import Product
+from backend.utils.rollup import upsert_increment
+
+def adjust_categories(db: Session, changes):
+    """
+    Terapkan perubahan (category, d_products, d_in_stock) ke product_categories.
+    Dijalankan di transaksi yang sama dengan write product-nya.
+    """
+    totals = {}
+    for category, products, in_stock in changes:
+        if category is None:
+            continue
+        current = totals.get(category, (0, 0))
+        totals[category] = (current[0] + products, current[1] + in_stock)
+    
+    upsert_increment(db, ProductCategory.__table__, ("category",), [
+        {"category": category, "product_count": products, "in_stock_count": in_stock}
+        for category, (products, in_stock) in totals.items()
+        if products or in_stock
+    ])
+
+def _in_stock(stock) -> int:
+    return int((stock or 0) > 0)
+
+def product_added(db: Session, category, stock):
+    adjust_categories(db, [(category, 1, _in_stock(stock))])
+
+def product_removed(db: Session, category, stock):
+    adjust_categories(db, [(category, -1, -_in_stock(stock))])
+
+def product_changed(db: Session, old_category, old_stock, category, stock):
+    if old_category != category or _in_stock(old_stock) != _in_stock(stock):
+        adjust_categories(db, [
+            (old_category, -1, -_in_stock(old_stock)),
+            (category, 1, _in_stock(stock)),
+        ])
+
+def rebuild_categories(db: Session) -> int:
+    """Hitung ulang product_categories dari tabel products. Return jumlah kategori"""
+    table = ProductCategory.__table__
+    counts = select(
+        Product.category,
+        func.count(),
+        func.sum(case((Product.stock > 0, 1), else_=0)),
+    ).where(
+        Product.category.isnot(None)
+    ).group_by(Product.category)
+    
+    db.execute(delete(table))
+    db.execute(insert(table).from_select(["category", "product_count", "in_stock_count"], counts))
+    db.commit()
+    return db.query(func.count()).select_from(table).scalar()
@@ -0,0 +1,83 @@
+import gzip
+from starlette.datastructures import Headers, MutableHeaders
+from backend.utils.static import accepted_encodings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5  # cukup cepat untuk kompresi per request
+
+class JSONCompressionMiddleware:
+    """
+    Kompres response JSON (gzip atau brotli sesuai Accept-Encoding) yang
+    ukurannya >= minimum_size. Response streaming dan yang sudah punya
+    Content-Encoding diteruskan apa adanya.
+    """
+    
+    def __init__(self, app, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.minimum_size:
+            await self.app(scope, receive, send)
+            return
+        
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        if brotli is not None and "br" in accepted:
+            encoding = "br"
+        elif "gzip" in accepted:
+            encoding = "gzip"
+        else:
+            await self.app(scope, receive, send)
+            return
+        
+        start = None
+        passthrough = False
+        
+        async def send_compressed(message):
+            nonlocal start, passthrough
+            
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if (
+                    not headers.get("content-type", "").startswith("application/json")
+                    or "content-encoding" in headers
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message  # tunda sampai body diketahui ukurannya
+                return
+            
+            if passthrough or start is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+            
+            body = message.get("body", b"")
+            if message.get("more_body", False) or len(body) < self.minimum_size:
+                # Streaming atau terlalu kecil: kirim tanpa kompresi
+                await send(start)
+                start = None
+                passthrough = True
+                await send(message)
+                return
+            
+            if encoding == "br":
+                body = brotli.compress(body, quality=BROTLI_QUALITY)
+            else:
+                body = gzip.compress(body, compresslevel=GZIP_LEVEL)
+            
+            headers = MutableHeaders(raw=start["headers"])
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            start["headers"] = headers.raw
+            await send(start)
+            start = None
+            await send({"type": "http.response.body", "body": body})
+        
+        await self.app(scope, receive, send_compressed)
@@ -1,16 +1,38 @@
 from fastapi import Depends, HTTPException, status, Header
+from sqlalchemy import event, inspect
 from sqlalchemy.orm import Session
-from backend.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.config import settings
+from backend.database import get_read_db, get_async_db
 from backend.models.user import User
+from backend.utils.cache import TTLCache
 from backend.utils.security import decode_access_token
 
+# username -> (id, is_active, is_seller) yang sudah dicek ke database.
+# Per proses; perubahan dari worker lain terlihat setelah TTL habis.
+principal_cache = TTLCache(maxsize=10000, ttl=settings.auth_principal_ttl)
+
+def invalidate_principal(username: str):
+    """Paksa request berikutnya dari user ini membaca ulang dari database"""
+    principal_cache.delete(username)
+
+@event.listens_for(User.is_active, "set")
+@event.listens_for(User.is_seller, "set")
+def _user_flags_changed(target, value, oldvalue, initiator):
+    # Hanya untuk user yang ada di database (bukan principal transient di bawah)
+    if inspect(target).persistent and value != oldvalue:
+        invalidate_principal(target.username)
+
 def get_current_user(
     authorization: str = Header(None),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ) -> User:
     """
     Dependency untuk mendapatkan user yang sedang login
     Token harus dikirim di header: Authorization: Bearer <token>
+    
+    get_read_db sama dengan get_db kecuali profil SQLite production aktif,
+    jadi session-nya dipakai bersama route (lihat database.py)
     """
     if not authorization:
         raise HTTPException(
@@ -40,15 +62,29 @@ def get_current_user(
             detail="Token tidak valid atau expired"
         )
     
-    # Get user dari database
+    # Get user dari cache, atau dari database jika belum ada / expired
     username = payload.get("sub")
-    user = db.query(User).filter(User.username == username).first()
+    principal = principal_cache.get(username) if settings.auth_principal_ttl else None
     
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User tidak ditemukan"
-        )
+    if principal is None:
+        row = db.query(User.id, User.is_active, User.is_seller).filter(
+            User.username == username
+        ).first()
+    
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User tidak ditemukan"
+            )
+    
+        principal = (row.id, row.is_active, row.is_seller)
+        if settings.auth_principal_ttl:
+            principal_cache.set(username, principal)
+    
+    # User transient (tidak terikat session) yang hanya berisi field
+    # yang dibutuhkan route: id, username, is_active, is_seller
+    user_id, is_active, is_seller = principal
+    user = User(id=user_id, username=username, is_active=is_active, is_seller=is_seller)
     
     if not user.is_active:
         raise HTTPException(
@@ -69,4 +105,18 @@ def get_current_seller(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Hanya seller yang bisa akses endpoint ini"
         )
-    return current_user
\ No newline at end of file
+    return current_user
+
+# Versi async untuk routes/async_routes.py. Logic-nya sama persis, hanya
+# dijalankan lewat AsyncSession.run_sync di koneksi async request ini.
+
+async def get_current_user_async(
+    authorization: str = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    return await db.run_sync(lambda session: get_current_user(authorization, session))
+
+async def get_current_seller_async(
+    current_user: User = Depends(get_current_user_async)
+) -> User:
+    return get_current_seller(current_user)
@@ -0,0 +1,107 @@
+import os
+import threading
+import time
+from fastapi import HTTPException, Request
+from starlette.datastructures import MutableHeaders
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from backend.config import settings
+from backend.utils.static import etag_matches
+
+# Versi per tabel, naik setiap ada commit yang menulis ke tabel itu.
+# Per proses (seperti cache di utils/cache.py): nonce membedakan proses /
+# restart, dan bucket waktu etag_ttl membatasi umur ETag di worker lain
+_versions = {}
+_lock = threading.Lock()
+_nonce = os.urandom(4).hex()
+
+def table_version(table: str) -> int:
+    return _versions.get(table, 0)
+
+def bump_tables(*tables: str):
+    with _lock:
+        for table in tables:
+            _versions[table] = _versions.get(table, 0) + 1
+
+def _touched(session) -> set:
+    return session.info.setdefault("touched_tables", set())
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session, flush_context):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        if table:
+            _touched(session).add(table)
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_execute(state):
+    # UPDATE / INSERT / DELETE lewat session.execute atau query.update()
+    if state.is_update or state.is_delete or state.is_insert:
+        table = getattr(state.statement, "table", None)
+        if table is not None:
+            _touched(state.session).add(table.name)
+
+@event.listens_for(Session, "after_commit")
+def _bump_on_commit(session):
+    # Setelah commit, supaya GET paralel tidak memberi ETag baru ke data lama
+    tables = session.info.pop("touched_tables", None)
+    if tables:
+        bump_tables(*tables)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop("touched_tables", None)
+
+def bucket_ttl(ttl: float) -> float:
+    """
+    TTL untuk cache in-memory yang dijawab dengan ETag dari etag_for():
+    entry tidak boleh hidup melewati bucket etag_ttl saat ini. Kalau lewat,
+    worker yang tidak melihat write-nya menyajikan payload lama dengan ETag
+    bucket baru dan client tidak bisa membedakannya.
+    """
+    if not settings.etag_ttl:
+        return ttl
+    return min(ttl, settings.etag_ttl - time.time() % settings.etag_ttl)
+
+def etag_for(*tables: str):
+    """
+    Dependency untuk GET yang bisa di-cache: set weak ETag dari versi tabel
+    dan jawab If-None-Match yang cocok dengan 304 sebelum query dijalankan.
+    Header dipasang oleh ETagHeaderMiddleware, supaya juga berlaku untuk
+    endpoint yang me-return Response langsung (utils/fast_json.py).
+    """
+    def check_etag(request: Request):
+        versions = "-".join(str(table_version(t)) for t in tables)
+        bucket = int(time.time() // settings.etag_ttl) if settings.etag_ttl else 0
+        etag = f'W/"{_nonce}-{versions}-{bucket}"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        
+        if etag_matches(request.headers.get("if-none-match", ""), etag):
+            raise HTTPException(status_code=304, headers=headers)
+        
+        request.state.etag_headers = headers
+    
+    return check_etag
+
+class ETagHeaderMiddleware:
+    """Pasang header dari etag_for ke response 2xx"""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        async def send_with_etag(message):
+            if message["type"] == "http.response.start" and 200 <= message["status"] < 300:
+                headers = scope.get("state", {}).get("etag_headers")
+                if headers:
+                    response_headers = MutableHeaders(raw=message["headers"])
+                    for name, value in headers.items():
+                        response_headers[name] = value
+                    message["headers"] = response_headers.raw
+            await send(message)
+        
+        await self.app(scope, receive, send_with_etag)
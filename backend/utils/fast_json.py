@@ -0,0 +1,75 @@
+"""
+Jalur serialisasi cepat untuk response list besar (opt-in, FAST_JSON=true)
+
+Row dari database sudah sesuai tipe kolomnya, jadi validasi ulang lewat
+response_model hanya memakan CPU. Di jalur ini object ORM / row diubah
+langsung menjadi dict sesuai field schema (tanpa validasi), lalu di-encode
+ke bytes dengan orjson (atau pydantic_core jika orjson tidak terinstall).
+Endpoint yang me-return FastJSONResponse dilewati oleh validasi FastAPI.
+"""
+import typing
+from fastapi.responses import Response
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def dumps(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return to_json(content)
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+    
+    def render(self, content) -> bytes:
+        return content if isinstance(content, bytes) else dumps(content)
+
+def respond(result):
+    """Bungkus hasil yang sudah di-encode (bytes, mis. dari cache) jadi response"""
+    return FastJSONResponse(result) if isinstance(result, bytes) else result
+
+_plans = {}
+
+def _nested_model(annotation):
+    """Return (model, is_list) jika field berisi schema lain, selain itu (None, False)"""
+    origin = typing.get_origin(annotation)
+    if origin in (list, typing.List):
+        model, _ = _nested_model(typing.get_args(annotation)[0])
+        return model, model is not None
+    if origin is not None:
+        # Optional[X] / X | None
+        for arg in typing.get_args(annotation):
+            model, is_list = _nested_model(arg)
+            if model is not None:
+                return model, is_list
+        return None, False
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    return None, False
+
+def _plan(model):
+    plan = _plans.get(model)
+    if plan is None:
+        plan = [(name, *_nested_model(field.annotation)) for name, field in model.model_fields.items()]
+        _plans[model] = plan
+    return plan
+
+def plain(model, obj) -> dict:
+    """Ambil field `model` dari object / row tanpa validasi"""
+    # Object ORM: baca langsung dari __dict__ (lebih cepat dari descriptor),
+    # attribute yang belum di-load tetap lewat getattr
+    loaded = getattr(obj, "__dict__", {})
+    result = {}
+    for name, nested, is_list in _plan(model):
+        value = loaded[name] if name in loaded else getattr(obj, name)
+        if nested is not None and value is not None:
+            value = [plain(nested, v) for v in value] if is_list else plain(nested, value)
+        result[name] = value
+    return result
+
+def plain_list(model, rows) -> list:
+    return [plain(model, row) for row in rows]
@@ -0,0 +1,98 @@
+"""
+Idempotency-Key untuk POST /orders/
+
+Response sukses disimpan per (user, key) di tabel idempotency_keys dalam
+transaksi yang sama dengan order-nya, jadi order dan key-nya selalu
+commit (atau rollback) bersama. Retry dengan key yang sama dijawab dari
+tabel lewat satu lookup primary key, tanpa menjalankan checkout lagi.
+
+Row key di-insert di awal transaksi: retry yang datang saat request
+pertama masih berjalan tertahan di INSERT (unique) sampai request pertama
+selesai, lalu mendapat response yang tersimpan. Request yang gagal (stok
+habis dsb) tidak menyimpan apa-apa, jadi boleh diulang dengan key yang
+sama. Key kadaluarsa setelah IDEMPOTENCY_KEY_TTL detik.
+"""
+import hashlib
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+from fastapi import HTTPException, status
+from fastapi.responses import Response
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+from backend.config import settings
+from backend.models.idempotency import IdempotencyKey
+
+MAX_KEY_LENGTH = 255
+PURGE_INTERVAL = 300  # detik, per proses
+
+_next_purge = 0.0
+
+def request_fingerprint(payload: BaseModel) -> str:
+    return hashlib.sha256(payload.model_dump_json().encode()).hexdigest()
+
+def find_key(db: Session, user_id: int, key: str) -> Optional[IdempotencyKey]:
+    """Row key yang masih berlaku. Row kadaluarsa dihapus (ikut transaksi ini)"""
+    if not key or len(key) > MAX_KEY_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Idempotency-Key harus 1-{MAX_KEY_LENGTH} karakter"
+        )
+    
+    record = db.get(IdempotencyKey, (user_id, key))
+    if record is not None and record.expires_at <= datetime.utcnow():
+        db.delete(record)
+        db.flush()
+        return None
+    return record
+
+def replay_response(record: Optional[IdempotencyKey], fingerprint: str) -> Response:
+    if record is None:
+        # Request pertama gagal dan di-rollback setelah retry ini menunggu
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Request dengan Idempotency-Key ini gagal diproses, silakan coba lagi"
+        )
+    
+    if record.request_hash != fingerprint:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key sudah dipakai untuk request dengan isi berbeda"
+        )
+    
+    return Response(
+        record.response_body,
+        status_code=record.status_code,
+        media_type="application/json",
+        headers={"Idempotent-Replayed": "true"}
+    )
+
+def reserve_key(db: Session, user_id: int, key: str, fingerprint: str, status_code: int) -> IdempotencyKey:
+    """
+    Insert row key (response diisi sebelum commit). IntegrityError berarti
+    request lain dengan key yang sama sudah commit; caller rollback lalu replay
+    """
+    record = IdempotencyKey(
+        user_id=user_id,
+        key=key,
+        request_hash=fingerprint,
+        status_code=status_code,
+        expires_at=datetime.utcnow() + timedelta(seconds=settings.idempotency_key_ttl),
+    )
+    db.add(record)
+    db.flush()
+    return record
+
+def purge_expired(db: Session):
+    """Hapus key kadaluarsa (index expires_at), paling sering sekali per PURGE_INTERVAL"""
+    global _next_purge
+    
+    now = time.monotonic()
+    if now < _next_purge:
+        return
+    _next_purge = now + PURGE_INTERVAL
+    
+    db.query(IdempotencyKey).filter(
+        IdempotencyKey.expires_at <= datetime.utcnow()
+    ).delete(synchronize_session=False)
+    db.commit()
@@ -0,0 +1,201 @@
+"""
+Metrics Prometheus untuk GET /metrics (METRICS=true, default)
+
+- http_requests_total / http_request_duration_seconds per method + route
+  template (`/products/{product_id}`, bukan path asli, supaya jumlah label
+  tetap kecil) dan status
+- http_requests_in_flight
+- db_pool_checked_out / db_pool_overflow per engine
+- cache_hits / cache_misses / cache_hit_ratio per TTLCache
+- password_hash_queue_depth / _in_flight / _rejected (pool bcrypt), plus
+  histogram password_hash_wait_seconds (antri sebelum worker mulai) dan
+  password_hash_duration_seconds (bcrypt-nya sendiri)
+
+Dengan beberapa worker uvicorn, set PROMETHEUS_MULTIPROC_DIR ke direktori
+kosong yang bisa ditulis semua worker (dikosongkan setiap deploy): tiap
+worker menulis nilainya ke file mmap sendiri dan /metrics menjumlahkan
+semuanya, jadi worker mana pun yang menjawab scrape hasilnya sama.
+Tanpa variabel itu metrics hanya milik proses yang menjawab.
+
+Gauge state (pool, cache, bcrypt) dibaca ulang saat scrape dan paling
+sering sekali per METRICS_REFRESH_INTERVAL detik di tiap worker.
+"""
+import os
+import time
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+)
+from prometheus_client import multiprocess
+from backend.config import settings
+
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REQUESTS = Counter(
+    "http_requests_total", "HTTP requests", ["method", "route", "status"]
+)
+LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["method", "route"],
+    buckets=LATENCY_BUCKETS
+)
+IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests being handled", multiprocess_mode="livesum"
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Connections checked out of the pool", ["pool"], multiprocess_mode="livesum"
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow", "Overflow connections open beyond pool_size", ["pool"], multiprocess_mode="livesum"
+)
+CACHE_HITS = Gauge(
+    "cache_hits", "Cache hits since process start", ["cache"], multiprocess_mode="livesum"
+)
+CACHE_MISSES = Gauge(
+    "cache_misses", "Cache misses since process start", ["cache"], multiprocess_mode="livesum"
+)
+CACHE_HIT_RATIO = Gauge(
+    "cache_hit_ratio", "Cache hit ratio since process start", ["cache"], multiprocess_mode="liveall"
+)
+PASSWORD_QUEUE_DEPTH = Gauge(
+    "password_hash_queue_depth", "Password hashes waiting for a worker", multiprocess_mode="livesum"
+)
+PASSWORD_IN_FLIGHT = Gauge(
+    "password_hash_in_flight", "Password hashes running or queued", multiprocess_mode="livesum"
+)
+PASSWORD_HASH_WAIT = Histogram(
+    "password_hash_wait_seconds", "Time a password hash waited for a pool worker",
+    buckets=LATENCY_BUCKETS
+)
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds", "Time spent hashing / verifying a password",
+    buckets=LATENCY_BUCKETS
+)
+PASSWORD_REJECTED = Gauge(
+    "password_hash_rejected", "Password hashes rejected with 503 since process start",
+    multiprocess_mode="livesum"
+)
+
+def _pools() -> dict:
+    from backend.database import async_engine, engine, read_engine
+    
+    pools = {"write": engine.pool}
+    if read_engine is not engine:
+        pools["read"] = read_engine.pool
+    if async_engine is not None:
+        pools["async"] = async_engine.sync_engine.pool
+    return pools
+
+def _caches() -> dict:
+    from backend.utils.cache import category_cache, product_detail_cache, product_list_cache, search_cache
+    from backend.utils.dependencies import principal_cache
+    
+    return {
+        "product_detail": product_detail_cache,
+        "product_list": product_list_cache,
+        "category": category_cache,
+        "search": search_cache,
+        "principal": principal_cache,
+    }
+
+def refresh_gauges():
+    """Baca ulang state pool DB, cache dan pool bcrypt ke gauge"""
+    from backend.utils.password_pool import password_pool
+    
+    for name, pool in _pools().items():
+        # StaticPool (SQLite in-memory) tidak punya statistik
+        if hasattr(pool, "checkedout"):
+            DB_POOL_CHECKED_OUT.labels(name).set(pool.checkedout())
+            # overflow() negatif selama koneksi yang terbuka < pool_size
+            DB_POOL_OVERFLOW.labels(name).set(max(0, pool.overflow()))
+    
+    for name, cache in _caches().items():
+        stats = cache.stats()
+        CACHE_HITS.labels(name).set(stats["hits"])
+        CACHE_MISSES.labels(name).set(stats["misses"])
+        CACHE_HIT_RATIO.labels(name).set(stats["hit_ratio"])
+    
+    stats = password_pool.stats()
+    PASSWORD_QUEUE_DEPTH.set(stats["queue_depth"])
+    PASSWORD_IN_FLIGHT.set(stats["in_flight"])
+    PASSWORD_REJECTED.set(stats["rejected"])
+
+def render_metrics() -> tuple:
+    """Return (body, content type) untuk GET /metrics"""
+    refresh_gauges()
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+def _route_label(scope) -> str:
+    route = scope.get("route")
+    # Path yang tidak cocok dengan route mana pun (404) dijadikan satu label
+    return getattr(route, "path", None) or "unmatched"
+
+class MetricsMiddleware:
+    """Jumlah, latency dan in-flight request per route"""
+    
+    def __init__(self, app):
+        self.app = app
+        # Child metric per kombinasi label, supaya .labels() tidak dipanggil per request
+        self._requests = {}
+        self._latency = {}
+        self._next_refresh = 0.0
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan" and MULTIPROCESS:
+            await self.app(scope, receive, self._mark_dead_on_shutdown(send))
+            return
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+    
+        status_code = 500
+        started = time.perf_counter()
+        IN_FLIGHT.inc()
+    
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+    
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            IN_FLIGHT.dec()
+            self._observe(scope["method"], _route_label(scope), status_code, elapsed)
+    
+    @staticmethod
+    def _mark_dead_on_shutdown(send):
+        """
+        File gauge "live" milik worker yang berhenti dihapus supaya tidak ikut
+        dijumlahkan (worker uvicorn keluar lewat os._exit, atexit tidak jalan)
+        """
+        async def send_lifespan(message):
+            if message["type"] == "lifespan.shutdown.complete":
+                multiprocess.mark_process_dead(os.getpid())
+            await send(message)
+        return send_lifespan
+    
+    def _observe(self, method: str, route: str, status_code: int, elapsed: float):
+        key = (method, route)
+        latency = self._latency.get(key)
+        if latency is None:
+            latency = self._latency[key] = LATENCY.labels(method, route)
+        latency.observe(elapsed)
+    
+        key = (method, route, status_code)
+        requests = self._requests.get(key)
+        if requests is None:
+            requests = self._requests[key] = REQUESTS.labels(method, route, str(status_code))
+        requests.inc()
+    
+        # Gauge state worker ini ikut diperbarui untuk scrape yang dijawab worker lain
+        if MULTIPROCESS and time.monotonic() >= self._next_refresh:
+            self._next_refresh = time.monotonic() + settings.metrics_refresh_interval
+            refresh_gauges()
@@ -0,0 +1,49 @@
+import base64
+import hashlib
+import json
+from datetime import datetime
+
+def filter_scope(*filters) -> str:
+    """Sidik jari pendek dari filter sebuah listing, untuk encode / decode_cursor"""
+    raw = json.dumps(filters, default=str, separators=(",", ":")).encode()
+    return hashlib.blake2b(raw, digest_size=6).hexdigest()
+
+def encode_cursor(sort: str, values: tuple, scope: str = None) -> str:
+    """
+    Encode posisi terakhir sebuah halaman menjadi cursor opaque.
+    `scope` (lihat filter_scope) mengikat cursor ke filter halaman itu.
+    """
+    payload = {
+        "s": sort,
+        "v": [v.isoformat() if isinstance(v, datetime) else v for v in values],
+    }
+    if scope is not None:
+        payload["f"] = scope
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str, sort: str, types: tuple, scope: str = None) -> tuple:
+    """
+    Decode cursor dari encode_cursor.
+    Raise ValueError jika cursor rusak atau dibuat untuk sort / filter
+    yang berbeda.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        values = payload["v"]
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Cursor tidak valid")
+    
+    if payload.get("s") != sort or len(values) != len(types):
+        raise ValueError("Cursor tidak cocok dengan sort")
+    if payload.get("f") != scope:
+        raise ValueError("Cursor tidak cocok dengan filter")
+    
+    try:
+        return tuple(
+            datetime.fromisoformat(v) if t is datetime else t(v)
+            for v, t in zip(values, types)
+        )
+    except (ValueError, TypeError):
+        raise ValueError("Cursor tidak valid")
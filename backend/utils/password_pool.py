@@ -0,0 +1,142 @@
+"""
+Pool terbatas untuk pekerjaan CPU-bound (bcrypt) di luar threadpool request.
+
+Jumlah pekerjaan yang boleh antri dibatasi; jika penuh, submit() langsung
+raise PasswordPoolBusy supaya route bisa membalas 503 + Retry-After
+daripada membiarkan request menumpuk.
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from starlette.concurrency import run_in_threadpool
+from backend.config import settings
+
+class PasswordPoolBusy(Exception):
+    """Antrian hashing penuh"""
+
+def _timed_call(fn, *args):
+    """Dijalankan di worker: return (hasil, waktu mulai, durasi)"""
+    started_at = time.time()
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, started_at, time.perf_counter() - t0
+
+class PasswordPool:
+    def __init__(self, executor: str, workers: int, max_queue: int):
+        self.executor_type = executor
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.workers + max_queue)
+        self._stats_lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.total_hash = 0.0
+    
+    def _get_executor(self):
+        with self._executor_lock:
+            if self._executor is None:
+                if self.executor_type == "process":
+                    # spawn: aman dipakai dari proses yang sudah punya thread
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn")
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers,
+                        thread_name_prefix="password-hash"
+                    )
+            return self._executor
+    
+    def _record(self, wait: float, duration: float):
+        # Import di sini: worker "process" meng-import module ini untuk
+        # _timed_call dan tidak perlu ikut membuat metrics
+        from backend.utils.metrics import PASSWORD_HASH_DURATION, PASSWORD_HASH_WAIT
+    
+        PASSWORD_HASH_WAIT.observe(wait)
+        PASSWORD_HASH_DURATION.observe(duration)
+        with self._stats_lock:
+            self.completed += 1
+            self.total_wait += wait
+            self.total_hash += duration
+            self.max_wait = max(self.max_wait, wait)
+    
+    def _admit(self):
+        if not self._slots.acquire(blocking=False):
+            with self._stats_lock:
+                self.rejected += 1
+            raise PasswordPoolBusy()
+        with self._stats_lock:
+            self.in_flight += 1
+    
+    def _release(self):
+        with self._stats_lock:
+            self.in_flight -= 1
+        self._slots.release()
+    
+    def run(self, fn, *args):
+        """Jalankan fn(*args) di pool dan tunggu hasilnya (blocking, untuk script)"""
+        if self.executor_type == "inline":
+            result, _, duration = _timed_call(fn, *args)
+            self._record(0.0, duration)
+            return result
+    
+        self._admit()
+        try:
+            submitted_at = time.time()
+            future = self._get_executor().submit(_timed_call, fn, *args)
+            result, started_at, duration = future.result()
+            self._record(max(0.0, started_at - submitted_at), duration)
+            return result
+        finally:
+            self._release()
+    
+    async def run_async(self, fn, *args):
+        """
+        Versi async dari run() untuk route: request menunggu di event loop,
+        tidak memegang thread dari threadpool AnyIO selama hashing
+        """
+        if self.executor_type == "inline":
+            result, _, duration = await run_in_threadpool(_timed_call, fn, *args)
+            self._record(0.0, duration)
+            return result
+    
+        self._admit()
+        try:
+            submitted_at = time.time()
+            future = self._get_executor().submit(_timed_call, fn, *args)
+            result, started_at, duration = await asyncio.wrap_future(future)
+            self._record(max(0.0, started_at - submitted_at), duration)
+            return result
+        finally:
+            self._release()
+    
+    def stats(self) -> dict:
+        with self._stats_lock:
+            completed = self.completed or 1
+            return {
+                "executor": self.executor_type,
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "in_flight": self.in_flight,
+                "queue_depth": max(0, self.in_flight - self.workers),
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_wait_ms": self.total_wait / completed * 1000,
+                "max_wait_ms": self.max_wait * 1000,
+                "avg_hash_ms": self.total_hash / completed * 1000,
+            }
+
+password_pool = PasswordPool(
+    executor=settings.password_hash_executor,
+    workers=settings.password_hash_workers,
+    max_queue=settings.password_hash_max_queue,
+)
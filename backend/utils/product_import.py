@@ -0,0 +1,137 @@
+import csv
+import io
+import json
+from datetime import datetime
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from backend.models.product import Product
+from backend.schemas.product import ProductCreate
+from backend.utils.categories import adjust_categories
+from backend.utils.search import index_new_products
+
+IMPORT_FORMATS = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+}
+
+def detect_format(filename: str, content_type: str):
+    """Format upload dari ekstensi file atau content type. Return None jika tidak dikenal"""
+    for extension, file_format in IMPORT_FORMATS.items():
+        if (filename or "").lower().endswith(extension):
+            return file_format
+    if content_type in ("text/csv", "application/csv"):
+        return "csv"
+    if content_type in ("application/x-ndjson", "application/jsonl", "application/x-jsonlines"):
+        return "jsonl"
+    return None
+
+def iter_rows(file, file_format: str):
+    """
+    Baca upload baris per baris, tanpa memuat seluruh file.
+    Yield (nomor baris, dict atau None, pesan error atau None)
+    """
+    text_file = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        if file_format == "csv":
+            reader = csv.DictReader(text_file)
+            for row in reader:
+                # Kolom kosong = pakai default ProductCreate
+                yield reader.line_num, {
+                    key: value for key, value in row.items()
+                    if key and value not in ("", None)
+                }, None
+            return
+    
+        for number, line in enumerate(text_file, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                yield number, None, "JSON tidak valid"
+                continue
+            if not isinstance(row, dict):
+                yield number, None, "Baris harus berupa object JSON"
+                continue
+            yield number, row, None
+    finally:
+        # Jangan ikut menutup file upload
+        text_file.detach()
+
+def validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc']) or 'row'}: {e['msg']}"
+        for e in error.errors()
+    )
+
+def insert_batch(db: Session, seller_id: int, batch: list):
+    """
+    INSERT satu batch ProductCreate beserta index search dan hitungan
+    kategorinya, lalu commit
+    """
+    created_at = datetime.utcnow()
+    values = [
+        {**product.model_dump(), "seller_id": seller_id, "created_at": created_at}
+        for product in batch
+    ]
+    # Core insert (tanpa ORM bulk) dengan multi-row VALUES
+    products = Product.__table__
+    if db.get_bind().dialect.name == "sqlite":
+        # products_fts butuh id baru; kolom search ikut di-RETURNING supaya
+        # tidak perlu mencocokkan urutan id dengan urutan row
+        inserted = db.execute(
+            insert(products).returning(
+                products.c.id, products.c.name, products.c.description, products.c.category
+            ),
+            values
+        ).mappings().all()
+        index_new_products(db, [dict(row) for row in inserted])
+    else:
+        db.execute(insert(products), values)
+    adjust_categories(db, [(v["category"], 1, int(v["stock"] > 0)) for v in values])
+    db.commit()
+
+def import_products(db: Session, rows, seller_id: int, batch_size: int, max_errors: int) -> dict:
+    """
+    Validasi row satu per satu dengan ProductCreate dan insert yang valid
+    per `batch_size` row (satu transaksi per batch). Row yang gagal validasi
+    dilewati dan dicatat di report.
+    """
+    imported = failed = 0
+    errors = []
+    categories = set()
+    batch = []
+    
+    for number, row, error in rows:
+        if error is None:
+            try:
+                batch.append(ProductCreate.model_validate(row))
+            except ValidationError as e:
+                error = validation_message(e)
+    
+        if error is not None:
+            failed += 1
+            if len(errors) < max_errors:
+                errors.append({"row": number, "error": error})
+            continue
+    
+        if len(batch) >= batch_size:
+            insert_batch(db, seller_id, batch)
+            imported += len(batch)
+            categories.update(product.category for product in batch)
+            batch = []
+    
+    if batch:
+        insert_batch(db, seller_id, batch)
+        imported += len(batch)
+        categories.update(product.category for product in batch)
+    
+    return {
+        "imported": imported,
+        "failed": failed,
+        "errors": errors,
+        "errors_truncated": failed > len(errors),
+        "categories": categories,
+    }
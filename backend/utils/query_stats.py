@@ -0,0 +1,97 @@
+"""
+Statistik query SQL per request (opt-in, QUERY_STATS=true)
+
+Event engine (dipasang di database.py) mencatat jumlah query, total waktu
+DB dan statement paling lambat ke object QueryStats milik request yang
+sedang berjalan (contextvar, ikut terbawa ke threadpool dan run_sync).
+QueryStatsMiddleware mengirimnya sebagai header Server-Timing dan menulis
+log jika request melewati SLOW_REQUEST_MS / SLOW_REQUEST_QUERIES.
+
+Jika QUERY_STATS mati, listener dan middleware tidak dipasang sama sekali.
+"""
+import logging
+import time
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+class QueryStats:
+    __slots__ = ("count", "total", "slowest", "slowest_statement")
+    
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0  # detik
+        self.slowest = 0.0
+        self.slowest_statement = None
+    
+    def server_timing(self, elapsed: float) -> str:
+        return (
+            f'db;dur={self.total * 1000:.2f};desc="{self.count} queries", '
+            f"db-slowest;dur={self.slowest * 1000:.2f}, "
+            f"app;dur={elapsed * 1000:.2f}"
+        )
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+# Waktu mulai disimpan di execution context statement itu sendiri (bukan
+# stack per koneksi): statement yang gagal tidak memanggil after_cursor_execute,
+# dan context-nya ikut dibuang tanpa menggeser pasangan waktu statement lain
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_stats_start = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_stats_start", None)
+    stats = _current.get()
+    if started is None or stats is None:
+        return
+    elapsed = time.perf_counter() - started
+    stats.count += 1
+    stats.total += elapsed
+    if elapsed > stats.slowest:
+        stats.slowest = elapsed
+        stats.slowest_statement = statement
+
+def instrument_engine(engine):
+    """Pasang event pencatat query ke engine (sync, atau .sync_engine untuk async)"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+class QueryStatsMiddleware:
+    """Header Server-Timing (db, db-slowest, app) dan log request lambat"""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+    
+        stats = QueryStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+    
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                headers.append("Server-Timing", stats.server_timing(time.perf_counter() - started))
+                message["headers"] = headers.raw
+            await send(message)
+    
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            elapsed = time.perf_counter() - started
+            if elapsed * 1000 >= settings.slow_request_ms or stats.count >= settings.slow_request_queries:
+                logger.warning(
+                    "Slow request %s %s: %.1f ms, %d queries (%.1f ms DB), slowest %.1f ms: %s",
+                    scope["method"], scope["path"], elapsed * 1000, stats.count, stats.total * 1000,
+                    stats.slowest * 1000, (stats.slowest_statement or "-")[:500]
+                )
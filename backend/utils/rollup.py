@@ -0,0 +1,21 @@
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+def upsert_increment(db: Session, table, key_columns, rows):
+    """
+    INSERT row baru atau tambahkan nilainya ke row yang sudah ada
+    (ON CONFLICT DO UPDATE SET col = col + excluded.col) untuk semua kolom
+    selain key. Row diurutkan per key supaya transaksi paralel tidak
+    saling deadlock.
+    """
+    if not rows:
+        return
+    
+    dialect_insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    stmt = dialect_insert(table)
+    counters = [name for name in rows[0] if name not in key_columns]
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c[name] for name in key_columns],
+        set_={name: table.c[name] + stmt.excluded[name] for name in counters}
+    )
+    db.execute(stmt, sorted(rows, key=lambda row: tuple(row[name] for name in key_columns)))
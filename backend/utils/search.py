@@ -0,0 +1,176 @@
+import re
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from backend.models.product import (
+    Product, PRODUCTS_FTS_SQL, PRODUCTS_TSVECTOR_SQL, PRODUCTS_SEARCH_INDEX_PG_SQL
+)
+
+# Token yang dikirim ke FTS5; karakter lain dibuang supaya user
+# tidak bisa menyisipkan sintaks MATCH (AND, NEAR, kolom:, dst)
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Kata maksimal per query (tiap kata = satu posting list yang di-scan), dan
+# kata terakhir baru dicocokkan sebagai prefix mulai 2 karakter (sesuai
+# index prefix FTS5 '2 3 4'; prefix 1 huruf match hampir semua row)
+MAX_SEARCH_TERMS = 5
+MIN_PREFIX_LENGTH = 2
+
+# Hasil yang diranking per query. Query umum ("hp", "kamera") bisa match
+# ratusan ribu row; skor BM25 hanya dihitung untuk N match terbaru di
+# kolom name, sisa slot diisi match di description / category (terbaru
+# dulu, tanpa skor). Cursor berhenti setelah N hasil.
+SEARCH_CANDIDATE_LIMIT = 500
+
+def _search_tokens(q: str) -> list:
+    return _TOKEN_RE.findall(q)[:MAX_SEARCH_TERMS]
+
+def _is_sqlite(db: Session) -> bool:
+    return db.get_bind().dialect.name == "sqlite"
+
+def build_match_query(q: str) -> str:
+    """
+    Ubah input user jadi ekspresi FTS5 MATCH.
+    Semua kata harus ada; kata terakhir dicocokkan sebagai prefix
+    supaya bisa dipakai untuk search-as-you-type.
+    """
+    tokens = _search_tokens(q)
+    if not tokens:
+        return ""
+    terms = [f'"{t}"' for t in tokens]
+    if len(tokens[-1]) >= MIN_PREFIX_LENGTH:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+def build_tsquery(q: str, weight: str = "") -> str:
+    """
+    Sama seperti build_match_query, tapi untuk to_tsquery PostgreSQL.
+    weight "A" membatasi match ke kolom name (lihat PRODUCTS_TSVECTOR_SQL)
+    """
+    tokens = _search_tokens(q)
+    if not tokens:
+        return ""
+    terms = [f"{t}:{weight}" if weight else t for t in tokens]
+    if len(tokens[-1]) >= MIN_PREFIX_LENGTH:
+        terms[-1] = f"{tokens[-1]}:*{weight}"
+    return " & ".join(terms)
+
+def index_product(db: Session, product: Product):
+    """Insert/replace satu product di products_fts (commit oleh caller)"""
+    if not _is_sqlite(db):
+        return
+    db.execute(text("DELETE FROM products_fts WHERE rowid = :id"), {"id": product.id})
+    db.execute(
+        text(
+            "INSERT INTO products_fts (rowid, name, description, category) "
+            "VALUES (:id, :name, :description, :category)"
+        ),
+        {
+            "id": product.id,
+            "name": product.name,
+            "description": product.description,
+            "category": product.category,
+        }
+    )
+
+def index_new_products(db: Session, rows: list):
+    """
+    Insert banyak product baru sekaligus ke products_fts (commit oleh caller).
+    rows: list of dict dengan key id, name, description, category
+    """
+    if not rows or not _is_sqlite(db):
+        return
+    db.execute(
+        text(
+            "INSERT INTO products_fts (rowid, name, description, category) "
+            "VALUES (:id, :name, :description, :category)"
+        ),
+        rows
+    )
+
+def unindex_product(db: Session, product_id: int):
+    """Hapus satu product dari products_fts (commit oleh caller)"""
+    if not _is_sqlite(db):
+        return
+    db.execute(text("DELETE FROM products_fts WHERE rowid = :id"), {"id": product_id})
+
+def search_product_ids(db: Session, q: str, limit: int, after: tuple = None) -> list:
+    """
+    Cari product id. Return list of (id, tier, score), urut (tier, score, id):
+    - tier 0: semua kata ada di name, diurutkan BM25 (ts_rank di PostgreSQL;
+      skor kecil = paling relevan)
+    - tier 1: sisanya (match di description / category), terbaru dulu
+    Maksimal SEARCH_CANDIDATE_LIMIT hasil. `after` = (tier, score, id)
+    terakhir dari halaman sebelumnya untuk keyset pagination.
+    """
+    if _is_sqlite(db):
+        match = build_match_query(q)
+        params = {"name_match": f"{{name}} : ({match})", "match": match}
+        # Dua scan FTS5 urut rowid DESC yang berhenti setelah N row; scan
+        # kedua tidak jalan jika name sudah mengisi semua slot. Product yang
+        # match di kedua scan dihitung sekali, dengan tier terkecil.
+        candidates = (
+            "SELECT id, MIN(tier) AS tier, score FROM ("
+            "SELECT * FROM (SELECT rowid AS id, 0 AS tier, bm25(products_fts) AS score"
+            " FROM products_fts WHERE products_fts MATCH :name_match"
+            " ORDER BY rowid DESC LIMIT :candidates)"
+            " UNION ALL "
+            "SELECT * FROM (SELECT rowid AS id, 1 AS tier, -rowid AS score"
+            " FROM products_fts WHERE products_fts MATCH :match"
+            " ORDER BY rowid DESC LIMIT :candidates)"
+            " LIMIT :candidates"
+            ") GROUP BY id"
+        )
+    else:
+        match = build_tsquery(q)
+        params = {"name_match": build_tsquery(q, "A"), "match": match}
+        candidates = (
+            "SELECT DISTINCT ON (id) id, tier, score FROM ("
+            "(SELECT id, 0 AS tier,"
+            f" -CAST(ts_rank({PRODUCTS_TSVECTOR_SQL}, query) AS double precision) AS score"
+            " FROM products, to_tsquery('simple', :name_match) AS query"
+            f" WHERE ({PRODUCTS_TSVECTOR_SQL}) @@ query"
+            " ORDER BY id DESC LIMIT :candidates)"
+            " UNION ALL "
+            "(SELECT id, 1 AS tier, -CAST(id AS double precision) AS score"
+            " FROM products, to_tsquery('simple', :match) AS query"
+            f" WHERE ({PRODUCTS_TSVECTOR_SQL}) @@ query"
+            " ORDER BY id DESC LIMIT :candidates)"
+            " LIMIT :candidates"
+            ") AS matches ORDER BY id, tier"
+        )
+    
+    if not match:
+        return []
+    
+    sql = f"SELECT id, tier, score FROM ({candidates}) AS candidates"
+    params.update({"limit": limit, "candidates": SEARCH_CANDIDATE_LIMIT})
+    if after:
+        sql += " WHERE (tier, score, id) > (:tier, :score, :id)"
+        params.update({"tier": after[0], "score": after[1], "id": after[2]})
+    sql += " ORDER BY tier, score, id LIMIT :limit"
+    
+    return db.execute(text(sql), params).all()
+
+def rebuild_search_index(db: Session):
+    """Isi ulang products_fts dari tabel products"""
+    if not _is_sqlite(db):
+        return
+    db.execute(text("DELETE FROM products_fts"))
+    db.execute(text(
+        "INSERT INTO products_fts (rowid, name, description, category) "
+        "SELECT id, name, description, category FROM products"
+    ))
+    db.commit()
+
+def ensure_search_index(db: Session):
+    """Buat index search untuk database lama (dan isi products_fts jika kosong)"""
+    if not _is_sqlite(db):
+        db.execute(text(PRODUCTS_SEARCH_INDEX_PG_SQL))
+        db.commit()
+        return
+    
+    db.execute(text(PRODUCTS_FTS_SQL))
+    indexed = db.execute(text("SELECT COUNT(*) FROM products_fts")).scalar()
+    if not indexed:
+        rebuild_search_index(db)
+    db.commit()
@@ -1,24 +1,47 @@
+import uuid
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from backend.config import settings
+from backend.utils.password_pool import password_pool
 
 # Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.bcrypt_rounds)
 
 # JWT settings
 SECRET_KEY = "your-secret-key-change-this-in-production-12345" 
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 jam
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify password dengan hash"""
+def _verify(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
-def get_password_hash(password: str) -> str:
-    """Hash password"""
+def _hash(password: str) -> str:
     return pwd_context.hash(password)
 
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify password dengan hash (di password pool).
+    Raise PasswordPoolBusy jika antrian penuh.
+    """
+    return password_pool.run(_verify, plain_password, hashed_password)
+
+def get_password_hash(password: str) -> str:
+    """
+    Hash password (di password pool).
+    Raise PasswordPoolBusy jika antrian penuh.
+    """
+    return password_pool.run(_hash, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password untuk route async (tanpa memegang thread request)"""
+    return await password_pool.run_async(_verify, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash untuk route async (tanpa memegang thread request)"""
+    return await password_pool.run_async(_hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Buat JWT token"""
     to_encode = data.copy()
@@ -27,7 +50,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     else:
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -0,0 +1,74 @@
+from sqlalchemy import case, delete, distinct, func, insert, select
+from sqlalchemy.orm import Session
+from backend.models.order import Order, OrderItem
+from backend.models.product import Product
+from backend.models.seller_stats import SellerDailyStat
+from backend.utils.rollup import upsert_increment
+
+# Status order yang dihitung sudah dibayar
+PAID_STATUSES = ("paid", "shipped", "delivered")
+
+def record_sales(db: Session, rows, paid: bool = False):
+    """
+    Tambahkan penjualan ke rollup seller_daily_stats (upsert).
+    
+    rows: iterable (seller_id, product_id, day, quantity, price).
+    paid=False untuk order baru (order_count, units/revenue_ordered),
+    paid=True saat order dibayar (units/revenue_paid).
+    Dijalankan di transaksi yang sama dengan order, caller yang commit.
+    """
+    totals = {}
+    for seller_id, product_id, day, quantity, price in rows:
+        if seller_id is None:
+            continue
+        key = (seller_id, day, product_id)
+        units, revenue = totals.get(key, (0, 0.0))
+        totals[key] = (units + quantity, revenue + quantity * price)
+    
+    upsert_increment(db, SellerDailyStat.__table__, ("seller_id", "day", "product_id"), [
+        {
+            "seller_id": seller_id,
+            "day": day,
+            "product_id": product_id,
+            "order_count": 0 if paid else 1,
+            "units_ordered": 0 if paid else units,
+            "revenue_ordered": 0.0 if paid else revenue,
+            "units_paid": units if paid else 0,
+            "revenue_paid": revenue if paid else 0.0,
+        }
+        for (seller_id, day, product_id), (units, revenue) in totals.items()
+    ])
+
+def backfill_seller_stats(db: Session) -> int:
+    """Hitung ulang seluruh rollup dari orders / order_items. Return jumlah row"""
+    table = SellerDailyStat.__table__
+    day = func.date(Order.created_at)
+    is_paid = Order.status.in_(PAID_STATUSES)
+    revenue = OrderItem.quantity * OrderItem.price
+    
+    rollup = select(
+        Product.seller_id,
+        day,
+        OrderItem.product_id,
+        func.count(distinct(Order.id)),
+        func.sum(OrderItem.quantity),
+        func.sum(revenue),
+        func.sum(case((is_paid, OrderItem.quantity), else_=0)),
+        func.sum(case((is_paid, revenue), else_=0.0)),
+    ).select_from(OrderItem).join(
+        Order, Order.id == OrderItem.order_id
+    ).join(
+        Product, Product.id == OrderItem.product_id
+    ).where(
+        Product.seller_id.isnot(None)
+    ).group_by(
+        Product.seller_id, day, OrderItem.product_id
+    )
+    
+    db.execute(delete(table))
+    db.execute(insert(table).from_select([
+        "seller_id", "day", "product_id", "order_count",
+        "units_ordered", "revenue_ordered", "units_paid", "revenue_paid",
+    ], rollup))
+    db.commit()
+    return db.query(func.count()).select_from(table).scalar()
@@ -0,0 +1,99 @@
+import mimetypes
+import os
+import re
+from fastapi import Request
+from fastapi.responses import FileResponse, Response
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.staticfiles import StaticFiles
+
+FRONTEND_DIR = "frontend"
+# Output scripts/build_static.py (hashed + gzip/brotli). Dipakai jika sudah
+# ada saat app start, supaya HTML dan /static selalu dari build yang sama
+DIST_DIR = os.path.join(FRONTEND_DIR, "dist")
+SERVE_DIR = DIST_DIR if os.path.isdir(DIST_DIR) else FRONTEND_DIR
+
+# Nama file hasil build: style.<8 hex>.css
+HASHED_RE = re.compile(r"\.[0-9a-f]{8}\.[A-Za-z0-9]+$")
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# Urutan preferensi varian pre-compressed
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+def accepted_encodings(accept_encoding: str) -> set:
+    """Parse header Accept-Encoding, abaikan yang q=0"""
+    accepted = set()
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        key, _, value = params.strip().partition("=")
+        try:
+            q = float(value) if key.strip() == "q" else 1.0
+        except ValueError:
+            q = 0.0
+        if name.strip() and q > 0:
+            accepted.add(name.strip().lower())
+    return accepted
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Bandingkan If-None-Match dengan ETag (weak comparison)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    strip = lambda tag: tag.strip().removeprefix("W/")
+    return strip(etag) in {strip(tag) for tag in if_none_match.split(",")}
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles yang mengirim varian .br / .gz hasil build sesuai
+    Accept-Encoding. File ber-hash di-cache immutable, sisanya wajib
+    revalidate (ETag / 304 dari StaticFiles).
+    """
+    
+    async def get_response(self, path: str, scope) -> Response:
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        response = None
+        
+        for encoding, suffix in ENCODINGS:
+            if encoding not in accepted:
+                continue
+            try:
+                response = await super().get_response(path + suffix, scope)
+            except HTTPException:
+                continue
+            response.headers["Content-Encoding"] = encoding
+            response.headers["Content-Type"] = mimetypes.guess_type(path)[0] or "application/octet-stream"
+            break
+        
+        if response is None:
+            response = await super().get_response(path, scope)
+        
+        response.headers["Vary"] = "Accept-Encoding"
+        response.headers["Cache-Control"] = IMMUTABLE if HASHED_RE.search(path) else REVALIDATE
+        return response
+
+def html_page(request: Request, name: str) -> Response:
+    """Serve halaman HTML: varian pre-compressed, ETag dan 304"""
+    path = os.path.join(SERVE_DIR, name)
+    accepted = accepted_encodings(request.headers.get("accept-encoding", ""))
+    encoding = None
+    
+    for candidate, suffix in ENCODINGS:
+        if candidate in accepted and os.path.isfile(path + suffix):
+            path, encoding = path + suffix, candidate
+            break
+    
+    headers = {"Cache-Control": REVALIDATE, "Vary": "Accept-Encoding"}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    response = FileResponse(path, media_type="text/html", headers=headers, stat_result=os.stat(path))
+    
+    if etag_matches(request.headers.get("if-none-match", ""), response.headers["etag"]):
+        return Response(status_code=304, headers={
+            "ETag": response.headers["etag"],
+            "Cache-Control": REVALIDATE,
+            "Vary": "Accept-Encoding",
+        })
+    
+    return response
@@ -1,3 +1,4 @@
+import json
 import requests
 
 BASE_URL = "http://127.0.0.1:8000"
@@ -74,16 +75,24 @@ products = [
 
 print("-" * 60)
 
-for product in products:
-    response = requests.post(f"{BASE_URL}/products/", headers=headers, json=product)
-    if response.status_code == 201:
-        p = response.json()
-        print(f"✅ Created: {p['name']}")
-        print(f"   Price: Rp {p['price']:,} | Stock: {p['stock']}")
-    else:
-        print(f"❌ Failed: {product['name']}")
-        print(f"   Error: {response.json()}")
+# Satu upload JSONL lewat POST /products/bulk, bukan satu request per product
+jsonl = "".join(json.dumps(product) + "\n" for product in products)
+response = requests.post(
+    f"{BASE_URL}/products/bulk",
+    headers=headers,
+    files={"file": ("products.jsonl", jsonl, "application/x-ndjson")}
+)
+
+if response.status_code != 200:
+    print("❌ Import gagal!")
+    print(f"   Error: {response.json()}")
+    exit()
+
+result = response.json()
+for error in result["errors"]:
+    print(f"❌ Failed: {products[error['row'] - 1]['name']}")
+    print(f"   Error: {error['error']}")
 
 print("-" * 60)
 print(f"\n✅ Test products created successfully!")
-print(f"Total products: {len(products)}")
\ No newline at end of file
+print(f"Total products: {result['imported']}")
\ No newline at end of file
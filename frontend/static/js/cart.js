@@ -2,6 +2,15 @@
 
 let cartData = null;
 
+// Idempotency-Key checkout: dipakai ulang saat "Buat Pesanan" diklik lagi
+// setelah error jaringan, supaya order tidak dibuat dua kali
+let checkoutKey = null;
+
+function newCheckoutKey() {
+  if (window.crypto && crypto.randomUUID) return crypto.randomUUID();
+  return `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+}
+
 // Check if user is logged in
 function checkLoginForCart() {
   const user = JSON.parse(localStorage.getItem("user") || "null");
@@ -231,6 +240,7 @@ function closeCheckoutModal() {
   document.getElementById("checkoutForm").reset();
   document.getElementById("checkoutError").classList.remove("show");
   document.getElementById("checkoutSuccess").classList.remove("show");
+  checkoutKey = null;
 }
 
 // Handle checkout
@@ -260,6 +270,8 @@ async function handleCheckout(event) {
     })),
   };
 
+  checkoutKey = checkoutKey || newCheckoutKey();
+
   try {
     checkoutBtn.disabled = true;
     checkoutBtn.textContent = "⏳ Memproses...";
@@ -269,12 +281,16 @@ async function handleCheckout(event) {
       headers: {
         Authorization: `Bearer ${token}`,
         "Content-Type": "application/json",
+        "Idempotency-Key": checkoutKey,
       },
       body: JSON.stringify(orderData),
     });
 
     const data = await response.json();
 
+    // Server sudah menjawab: percobaan berikutnya adalah checkout baru
+    checkoutKey = null;
+
     if (response.ok) {
       checkoutSuccess.textContent = `Pesanan berhasil dibuat! Order ID: ${data.id}`;
       checkoutSuccess.classList.add("show");
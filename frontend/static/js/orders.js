@@ -14,18 +14,29 @@ function checkLoginForOrders() {
   return true;
 }
 
-// Load orders
+const ORDERS_PAGE_SIZE = 10;
+
+// Cursor halaman berikutnya ("" = halaman pertama, null = sudah habis)
+let ordersCursor = "";
+
+// Load orders (satu halaman, ditambahkan di bawah yang sudah tampil)
 async function loadOrders() {
   if (!checkLoginForOrders()) return;
 
   const token = localStorage.getItem("token");
   const loadingSpinner = document.getElementById("loadingSpinner");
   const emptyOrders = document.getElementById("emptyOrders");
-  const ordersList = document.getElementById("ordersList");
+  const loadMoreBtn = document.getElementById("loadMoreOrders");
 
   try {
+    if (loadMoreBtn) loadMoreBtn.disabled = true;
+
     // Use extended endpoint to get product info
-    const response = await fetch(`${API_URL}/orders/extended/all`, {
+    const params = new URLSearchParams({
+      cursor: ordersCursor,
+      limit: ORDERS_PAGE_SIZE,
+    });
+    const response = await fetch(`${API_URL}/orders/extended/all?${params}`, {
       headers: {
         Authorization: `Bearer ${token}`,
       },
@@ -35,18 +46,26 @@ async function loadOrders() {
       throw new Error("Failed to load orders");
     }
 
-    const orders = await response.json();
+    const page = await response.json();
+    const isFirstPage = ordersCursor === "";
+    ordersCursor = page.next_cursor;
 
     if (loadingSpinner) loadingSpinner.style.display = "none";
 
-    if (orders.length === 0) {
+    if (isFirstPage && page.items.length === 0) {
       if (emptyOrders) emptyOrders.style.display = "block";
     } else {
-      displayOrders(orders);
+      displayOrders(page.items);
+    }
+
+    if (loadMoreBtn) {
+      loadMoreBtn.style.display = ordersCursor ? "block" : "none";
+      loadMoreBtn.disabled = false;
     }
   } catch (error) {
     console.error("Error loading orders:", error);
     if (loadingSpinner) loadingSpinner.style.display = "none";
+    if (loadMoreBtn) loadMoreBtn.disabled = false;
     alert("Gagal memuat pesanan");
   }
 }
@@ -56,8 +75,6 @@ function displayOrders(orders) {
   const ordersList = document.getElementById("ordersList");
 
   if (ordersList) {
-    ordersList.innerHTML = "";
-
     orders.forEach((order) => {
       const orderCard = createOrderCard(order);
       ordersList.appendChild(orderCard);
@@ -0,0 +1,144 @@
+"""
+Benchmark route sync (threadpool) vs async (AsyncSession)
+
+Menjalankan uvicorn dua kali, dengan DB_ASYNC=false dan DB_ASYNC=true,
+lalu membuka banyak koneksi bersamaan ke GET /cart/ dan GET /orders/
+(route yang butuh login dan query database). Laporan: RPS dan latency
+p50/p95/p99.
+
+Database diambil dari BENCH_DATABASE_URL (default SQLite sementara;
+DATABASE_URL diabaikan supaya database dev/production tidak terhapus).
+PERINGATAN: semua tabel di database tersebut di-drop dan dibuat ulang.
+
+Usage: python scripts/bench_async.py [--concurrency 200] [--duration 10]
+"""
+import argparse
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+import requests
+
+SEED_CODE = """
+from backend.database import Base, SessionLocal, engine
+from backend.init_db import init_database
+from backend.models.cart import CartItem
+from backend.models.product import Product
+from backend.models.user import User
+from backend.utils.security import create_access_token, get_password_hash
+
+Base.metadata.drop_all(bind=engine)
+init_database()
+db = SessionLocal()
+hashed = get_password_hash("bench12345")
+seller = User(email="seller@bench.test", username="benchseller", hashed_password=hashed, is_seller=True)
+db.add(seller)
+db.flush()
+products = [Product(name=f"Produk {i}", price=1000, stock=1000, seller_id=seller.id) for i in range(50)]
+buyers = [User(email=f"b{i}@bench.test", username=f"benchbuyer{i}", hashed_password=hashed) for i in range(100)]
+db.add_all(products + buyers)
+db.flush()
+for i, buyer in enumerate(buyers):
+    for product in products[i % 10:i % 10 + 5]:
+        db.add(CartItem(user_id=buyer.id, product_id=product.id, quantity=1))
+db.commit()
+for b in buyers:
+    print(create_access_token(data={"sub": b.username, "user_id": b.id}))
+"""
+
+def percentile(samples, p):
+    return samples[max(0, int(len(samples) * p) - 1)] * 1000 if samples else 0
+
+def run(env, concurrency, duration, port):
+    out = subprocess.run([sys.executable, "-c", SEED_CODE], cwd=ROOT, env=env,
+                         capture_output=True, text=True, check=True)
+    tokens = [line for line in out.stdout.splitlines() if line.count(".") == 2]
+    
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app",
+         "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            requests.get(f"{base_url}/health", timeout=1)
+            break
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+    
+    def worker(worker_id):
+        nonlocal errors
+        session = requests.Session()
+        rng = random.Random(worker_id)
+        headers = {"Authorization": f"Bearer {tokens[worker_id % len(tokens)]}"}
+        while time.perf_counter() < deadline:
+            path = "/cart/" if rng.random() < 0.5 else "/orders/"
+            t0 = time.perf_counter()
+            try:
+                ok = session.get(f"{base_url}{path}", headers=headers, timeout=30).status_code == 200
+            except requests.RequestException:
+                ok = False
+            elapsed = time.perf_counter() - t0
+            with lock:
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    errors += 1
+    
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for i in range(concurrency):
+                pool.submit(worker, i)
+    finally:
+        proc.terminate()
+        proc.wait()
+    
+    latencies.sort()
+    return {
+        "rps": len(latencies) / duration,
+        "p50": percentile(latencies, 0.50),
+        "p95": percentile(latencies, 0.95),
+        "p99": percentile(latencies, 0.99),
+        "errors": errors,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--port", type=int, default=8767)
+    args = parser.parse_args()
+    
+    database_url = os.environ.get("BENCH_DATABASE_URL") or f"sqlite:///{tempfile.mkdtemp()}/bench_async.db"
+    print(f"🗄️  Database: {database_url}")
+    
+    results = []
+    for mode in ("false", "true"):
+        env = os.environ.copy()
+        env["DATABASE_URL"] = database_url
+        env["DB_ASYNC"] = mode
+        results.append((mode, run(env, args.concurrency, args.duration, args.port)))
+    
+    print("\n" + "=" * 72)
+    print(f"concurrency={args.concurrency} duration={args.duration}s")
+    print(f"{'DB_ASYNC':>9} | {'RPS':>7} | {'p50 (ms)':>9} | {'p95 (ms)':>9} | {'p99 (ms)':>9} | {'errors':>6}")
+    print("-" * 72)
+    for mode, r in results:
+        print(f"{mode:>9} | {r['rps']:>7.1f} | {r['p50']:>9.1f} | {r['p95']:>9.1f} | {r['p99']:>9.1f} | {r['errors']:>6}")
+    print("=" * 72)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark latency checkout (POST /orders/), POST /cart/bulk, GET /cart/
+dan GET /cart/summary terhadap jumlah item di cart
+
+Jumlah query SQL per request juga dihitung, harus tetap konstan
+berapapun jumlah itemnya.
+
+Usage: python scripts/bench_checkout.py [repeat]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Database sementara, harus di-set sebelum backend di-import
+tmpdir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{tmpdir}/bench.db"
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from backend.database import Base, SessionLocal, engine
+from backend.main import app
+from backend.models.product import Product
+from backend.models.user import User
+from backend.utils.security import create_access_token, get_password_hash
+
+REPEAT = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+CART_SIZES = [1, 5, 10, 25, 50, 100]
+
+Base.metadata.create_all(bind=engine)
+client = TestClient(app)
+
+db = SessionLocal()
+buyer = User(email="buyer@bench.test", username="benchbuyer", hashed_password=get_password_hash("bench123"))
+db.add(buyer)
+db.add_all([
+    Product(name=f"Produk {i}", price=1000, stock=10_000_000, category="Bench", seller_id=1)
+    for i in range(max(CART_SIZES))
+])
+db.commit()
+product_ids = [p.id for p in db.query(Product.id).order_by(Product.id)]
+headers = {"Authorization": f"Bearer {create_access_token(data={'sub': buyer.username})}"}
+db.close()
+
+queries = 0
+
+@event.listens_for(engine, "before_cursor_execute")
+def count_query(conn, cursor, statement, parameters, context, executemany):
+    global queries
+    queries += 1
+
+def measure(method, url, body=None, expected=201):
+    global queries
+    timings = []
+    for _ in range(REPEAT):
+        queries = 0
+        t0 = time.perf_counter()
+        response = client.request(method, url, json=body, headers=headers)
+        timings.append((time.perf_counter() - t0) * 1000)
+        assert response.status_code == expected, response.text
+    return statistics.median(timings), queries
+
+print("=" * 70)
+print(f"📊 Median dari {REPEAT} request (ms / jumlah query)")
+print("=" * 70)
+print(f"{'items':>6} | {'checkout':>12} | {'cart/bulk':>12} | {'GET cart':>12} | {'cart/summary':>12}")
+print("-" * 70)
+for size in CART_SIZES:
+    items = [{"product_id": pid, "quantity": 1, "price": 1000} for pid in product_ids[:size]]
+    order_ms, order_queries = measure("POST", "/orders/", {
+        "shipping_address": "Jl. Benchmark No. 1, Jakarta",
+        "items": items,
+    })
+    cart_ms, cart_queries = measure("POST", "/cart/bulk", {
+        "items": [{"product_id": i["product_id"], "quantity": 1} for i in items],
+    })
+    # Cart sekarang berisi `size` product berbeda
+    get_ms, get_queries = measure("GET", "/cart/", expected=200)
+    summary_ms, summary_queries = measure("GET", "/cart/summary", expected=200)
+    print(f"{size:>6} | {order_ms:>7.2f} / {order_queries:<2} | {cart_ms:>7.2f} / {cart_queries:<2} | "
+          f"{get_ms:>7.2f} / {get_queries:<2} | {summary_ms:>7.2f} / {summary_queries:<2}")
+
+print("\n✅ Benchmark selesai")
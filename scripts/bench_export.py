@@ -0,0 +1,122 @@
+"""
+Benchmark GET /seller/export/products dan /seller/export/orders
+
+Seed satu seller dengan N product dan N order item, lalu stream export
+lewat ASGI dan ukur waktu sampai byte pertama, total waktu, ukuran
+body dan peak memory Python (tracemalloc) selama export.
+
+Usage: python scripts/bench_export.py [jumlah_row]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Database sementara (atau BENCH_DATABASE_URL, semua tabel di-drop), harus
+# di-set sebelum backend di-import. DATABASE_URL sengaja diabaikan
+tmpdir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = os.environ.get("BENCH_DATABASE_URL") or f"sqlite:///{tmpdir}/bench.db"
+
+from backend.database import Base, engine
+from backend.init_db import init_database
+from backend.main import app
+from backend.models.order import Order, OrderItem
+from backend.models.product import Product
+from backend.models.user import User
+from backend.utils.security import create_access_token
+
+N_ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+SEED_BATCH = 50_000
+
+Base.metadata.drop_all(bind=engine)
+init_database()
+
+print(f"🌱 Seeding {N_ROWS:,} products dan {N_ROWS:,} order items...")
+start = datetime(2025, 1, 1)
+with engine.begin() as conn:
+    conn.execute(User.__table__.insert(), [
+        {"email": "seller@bench.test", "username": "benchseller", "hashed_password": "x",
+         "is_active": True, "is_seller": True},
+        {"email": "buyer@bench.test", "username": "benchbuyer", "hashed_password": "x",
+         "is_active": True, "is_seller": False},
+    ])
+    for offset in range(0, N_ROWS, SEED_BATCH):
+        ids = range(offset + 1, min(offset + SEED_BATCH, N_ROWS) + 1)
+        conn.execute(Product.__table__.insert(), [
+            {"id": i, "name": f"Produk {i}", "description": "Deskripsi produk export", "price": 1000.0 + i % 500,
+             "stock": i % 10, "category": "Bench", "seller_id": 1, "created_at": start + timedelta(seconds=i)}
+            for i in ids
+        ])
+        conn.execute(Order.__table__.insert(), [
+            {"id": i, "buyer_id": 2, "total_amount": 1000.0, "status": "paid",
+             "shipping_address": "Jl. Benchmark No. 1", "created_at": start + timedelta(seconds=i)}
+            for i in ids
+        ])
+        conn.execute(OrderItem.__table__.insert(), [
+            {"order_id": i, "product_id": i, "quantity": 1, "price": 1000.0}
+            for i in ids
+        ])
+
+token = create_access_token(data={'sub': 'benchseller'})
+
+async def stream_export(url):
+    """
+    Panggil app langsung lewat ASGI (TestClient menampung seluruh body
+    sebelum return, jadi waktu byte pertama tidak bisa diukur)
+    """
+    path, _, query = url.partition("?")
+    scope = {
+        "type": "http", "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "query_string": query.encode(), "root_path": "",
+        "headers": [(b"host", b"bench"), (b"authorization", f"Bearer {token}".encode())],
+        "client": ("127.0.0.1", 0), "server": ("bench", 80),
+    }
+    stats = {"status": None, "ttfb": None, "size": 0}
+    requested = False
+    t0 = time.perf_counter()
+    
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Client tidak pernah disconnect
+        await asyncio.Event().wait()
+    
+    async def send(message):
+        if message["type"] == "http.response.start":
+            stats["status"] = message["status"]
+        elif message["type"] == "http.response.body" and message.get("body"):
+            if stats["ttfb"] is None:
+                stats["ttfb"] = time.perf_counter() - t0
+            stats["size"] += len(message["body"])
+    
+    await app(scope, receive, send)
+    stats["total"] = time.perf_counter() - t0
+    return stats
+
+print(f"\n📤 Export {N_ROWS:,} rows ({engine.url.get_backend_name()})")
+print("-" * 72)
+print(f"{'Endpoint':<40} {'TTFB':>8} {'Total':>8} {'Size':>9} {'Peak mem':>9}")
+
+for url in (
+    "/seller/export/products",
+    "/seller/export/products?format=jsonl",
+    "/seller/export/orders",
+    "/seller/export/orders?format=jsonl",
+):
+    stats = asyncio.run(stream_export(url))
+    assert stats["status"] == 200, stats
+    
+    # tracemalloc memperlambat alokasi, jadi memory diukur di run terpisah
+    tracemalloc.start()
+    asyncio.run(stream_export(url))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{url:<40} {stats['ttfb'] * 1000:6.0f}ms {stats['total']:7.2f}s "
+          f"{stats['size'] / 1024 / 1024:7.1f}MB {peak / 1024 / 1024:7.1f}MB")
@@ -0,0 +1,121 @@
+"""
+Benchmark bytes on the wire dan CPU server per request untuk GET JSON:
+tanpa kompresi, gzip, brotli, dan revalidasi ETag (304)
+
+Server uvicorn dijalankan sebagai subprocess (1 worker) dengan database
+SQLite sementara; CPU server dibaca dari /proc (Linux).
+
+Usage: python scripts/bench_http.py [--requests 500] [--limit 100]
+"""
+import argparse
+import http.client
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Database sementara, harus di-set sebelum backend di-import
+tmpdir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{tmpdir}/bench.db"
+
+from backend.database import engine
+from backend.init_db import init_database
+from backend.models.product import Product
+
+PORT = 8766
+CATEGORIES = ["Elektronik", "Laptop", "Audio", "Fashion", "Rumah"]
+
+def seed(n):
+    init_database()
+    with engine.begin() as conn:
+        conn.execute(Product.__table__.insert(), [
+            {
+                "name": f"Produk {i}",
+                "description": f"Deskripsi produk {i} dengan detail spesifikasi dan garansi resmi",
+                "price": float(1000 + (i * 7919) % 1_000_000),
+                "stock": i % 50,
+                "category": CATEGORIES[i % len(CATEGORIES)],
+                "image_url": f"https://cdn.example.com/products/{i}.jpg",
+                "seller_id": 1,
+            }
+            for i in range(n)
+        ])
+
+def server_cpu_seconds(pid):
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    # utime + stime (field 14 dan 15, index setelah nama proses)
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+def run(pid, path, headers, n):
+    conn = http.client.HTTPConnection("127.0.0.1", PORT)
+    wire = 0
+    status = None
+    cpu_start = server_cpu_seconds(pid)
+    t0 = time.perf_counter()
+    for _ in range(n):
+        conn.request("GET", path, headers=headers)
+        response = conn.getresponse()
+        body = response.read()  # http.client tidak men-decode Content-Encoding
+        status = response.status
+        wire += len(body) + sum(len(k) + len(v) + 4 for k, v in response.getheaders())
+    elapsed = time.perf_counter() - t0
+    cpu = server_cpu_seconds(pid) - cpu_start
+    conn.close()
+    return status, wire / n, cpu / n * 1000, elapsed / n * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+    
+    seed(max(args.limit, 1000))
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app",
+         "--port", str(PORT), "--log-level", "warning"],
+        cwd=ROOT,
+        env=os.environ.copy(),
+    )
+    try:
+        for _ in range(100):
+            try:
+                conn = http.client.HTTPConnection("127.0.0.1", PORT)
+                conn.request("GET", "/health")
+                conn.getresponse().read()
+                break
+            except OSError:
+                time.sleep(0.2)
+        
+        path = f"/products/?limit={args.limit}"
+        conn = http.client.HTTPConnection("127.0.0.1", PORT)
+        conn.request("GET", path)
+        response = conn.getresponse()
+        response.read()
+        etag = response.getheader("etag")
+        
+        print("=" * 70)
+        print(f"📊 GET {path}, {args.requests} request per skenario")
+        print("=" * 70)
+        print(f"{'skenario':<22} | {'status':>6} | {'bytes/req':>10} | {'CPU ms/req':>10} | {'ms/req':>8}")
+        print("-" * 70)
+        for label, headers in [
+            ("identity", {"Accept-Encoding": "identity"}),
+            ("gzip", {"Accept-Encoding": "gzip"}),
+            ("br", {"Accept-Encoding": "br"}),
+            ("If-None-Match (304)", {"Accept-Encoding": "br", "If-None-Match": etag}),
+        ]:
+            status, wire, cpu, latency = run(proc.pid, path, headers, args.requests)
+            print(f"{label:<22} | {status:>6} | {wire:>10.0f} | {cpu:>10.3f} | {latency:>8.2f}")
+    finally:
+        proc.terminate()
+        proc.wait()
+    
+    print("\n✅ Benchmark selesai")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark POST /products/bulk
+
+Buat file CSV dan JSONL berisi N product, upload lewat TestClient dan
+ukur waktu import end-to-end (parse, validasi, insert, index search).
+
+Usage: python scripts/bench_import.py [jumlah_product]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Database sementara (atau BENCH_DATABASE_URL, semua tabel di-drop), harus
+# di-set sebelum backend di-import. DATABASE_URL sengaja diabaikan
+tmpdir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = os.environ.get("BENCH_DATABASE_URL") or f"sqlite:///{tmpdir}/bench.db"
+
+from fastapi.testclient import TestClient
+
+from backend.database import Base, SessionLocal, engine
+from backend.init_db import init_database
+from backend.main import app
+from backend.models.product import Product
+from backend.models.user import User
+from backend.utils.security import create_access_token
+
+N_PRODUCTS = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+CATEGORIES = ["Elektronik", "Fashion", "Buku", "Olahraga", "Rumah Tangga"]
+
+Base.metadata.drop_all(bind=engine)
+init_database()
+client = TestClient(app)
+
+with engine.begin() as conn:
+    conn.execute(User.__table__.insert(), [
+        {"email": "seller@bench.test", "username": "benchseller", "hashed_password": "x",
+         "is_active": True, "is_seller": True}
+    ])
+headers = {"Authorization": f"Bearer {create_access_token(data={'sub': 'benchseller'})}"}
+
+def product(i):
+    return {
+        "name": f"Produk Import {i}",
+        "description": f"Deskripsi produk nomor {i} untuk benchmark import",
+        "price": 1000.0 + i % 5000,
+        "stock": i % 20,
+        "category": CATEGORIES[i % len(CATEGORIES)],
+    }
+
+csv_path = os.path.join(tmpdir, "products.csv")
+with open(csv_path, "w", encoding="utf-8") as f:
+    f.write("name,description,price,stock,category\n")
+    for i in range(N_PRODUCTS):
+        p = product(i)
+        f.write(f"{p['name']},{p['description']},{p['price']},{p['stock']},{p['category']}\n")
+
+jsonl_path = os.path.join(tmpdir, "products.jsonl")
+with open(jsonl_path, "w", encoding="utf-8") as f:
+    for i in range(N_PRODUCTS):
+        f.write(json.dumps(product(i)) + "\n")
+
+print(f"📦 Import {N_PRODUCTS:,} products per upload ({engine.url.get_backend_name()})")
+print("-" * 60)
+
+for path in (csv_path, jsonl_path):
+    size_mb = os.path.getsize(path) / 1024 / 1024
+    with open(path, "rb") as f:
+        t0 = time.perf_counter()
+        response = client.post("/products/bulk", headers=headers, files={"file": (os.path.basename(path), f)})
+        elapsed = time.perf_counter() - t0
+    assert response.status_code == 200, response.text
+    result = response.json()
+    print(f"{os.path.basename(path):<16} {size_mb:6.1f} MB  {elapsed:6.2f} s  "
+          f"{result['imported'] / elapsed:9,.0f} rows/s  (failed: {result['failed']})")
+
+db = SessionLocal()
+print("-" * 60)
+print(f"Total products di database: {db.query(Product).count():,}")
+db.close()
@@ -0,0 +1,112 @@
+"""
+Benchmark riwayat order untuk buyer dengan banyak order
+
+Seed satu buyer dengan N order (masing-masing 3 item) di antara order
+buyer lain, lalu bandingkan response list penuh dengan cursor pagination.
+
+Usage: python scripts/bench_orders.py [jumlah_order]
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Database sementara, harus di-set sebelum backend di-import
+tmpdir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{tmpdir}/bench.db"
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from backend.database import Base, SessionLocal, engine
+from backend.main import app
+from backend.models.order import Order, OrderItem
+from backend.models.product import Product
+from backend.models.user import User
+from backend.utils.security import create_access_token
+
+N_ORDERS = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+N_OTHER_BUYERS = 50
+PAGE_SIZE = 20
+STATUSES = ["pending", "paid", "shipped", "delivered"]
+
+Base.metadata.create_all(bind=engine)
+client = TestClient(app)
+
+print(f"🌱 Seeding {N_ORDERS:,} orders untuk 1 buyer (+ {N_OTHER_BUYERS * N_ORDERS // 10:,} order buyer lain)...")
+start = datetime(2025, 1, 1)
+with engine.begin() as conn:
+    conn.execute(User.__table__.insert(), [
+        {"email": f"buyer{i}@bench.test", "username": f"buyer{i}", "hashed_password": "x",
+         "is_active": True, "is_seller": False}
+        for i in range(N_OTHER_BUYERS + 1)
+    ])
+    conn.execute(Product.__table__.insert(), [
+        {"name": f"Produk {i}", "description": "Deskripsi " * 50, "price": 1000.0 + i,
+         "stock": 100, "category": "Bench", "seller_id": 1}
+        for i in range(100)
+    ])
+    
+    # Buyer 1 adalah buyer yang di-benchmark, sisanya noise
+    buyers = [1] * N_ORDERS + [2 + i % N_OTHER_BUYERS for i in range(N_OTHER_BUYERS * N_ORDERS // 10)]
+    conn.execute(Order.__table__.insert(), [
+        {"buyer_id": buyer_id, "total_amount": 3000.0, "status": STATUSES[i % len(STATUSES)],
+         "shipping_address": "Jl. Benchmark No. 1, Jakarta", "created_at": start + timedelta(minutes=i)}
+        for i, buyer_id in enumerate(buyers)
+    ])
+    conn.execute(OrderItem.__table__.insert(), [
+        {"order_id": order_id, "product_id": 1 + (order_id * 3 + k) % 100, "quantity": 1, "price": 1000.0}
+        for order_id in range(1, len(buyers) + 1)
+        for k in range(3)
+    ])
+
+headers = {"Authorization": f"Bearer {create_access_token(data={'sub': 'buyer0'})}"}
+
+def timed_get(url, repeat=3):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        response = client.get(url, headers=headers)
+        elapsed = (time.perf_counter() - t0) * 1000
+        assert response.status_code == 200, response.text
+        best = elapsed if best is None else min(best, elapsed)
+    return best, response
+
+def cursor_for_page(url, page):
+    cursor = ""
+    for _ in range(page - 1):
+        cursor = client.get(f"{url}{cursor}", headers=headers).json()["next_cursor"]
+    return cursor
+
+print("\n" + "=" * 70)
+print(f"📊 Buyer dengan {N_ORDERS:,} order (best of 3)")
+print("=" * 70)
+print(f"{'request':<44} | {'ms':>9} | {'KB':>9}")
+print("-" * 70)
+
+for base in ["/orders/", "/orders/extended/all"]:
+    ms, response = timed_get(base)
+    print(f"{base + ' (semua)':<44} | {ms:>9.2f} | {len(response.content) / 1024:>9.1f}")
+    
+    for label, query in [("", ""), (" status=paid", "&status=paid")]:
+        url = f"{base}?limit={PAGE_SIZE}{query}&cursor="
+        for page in [1, 100]:
+            cursor = cursor_for_page(url, page)
+            ms, response = timed_get(url + cursor)
+            name = f"{base} page {page}{label}"
+            print(f"{name:<44} | {ms:>9.2f} | {len(response.content) / 1024:>9.1f}")
+
+db = SessionLocal()
+plan = db.execute(text(
+    "EXPLAIN QUERY PLAN SELECT * FROM orders WHERE buyer_id = 1 "
+    "ORDER BY created_at DESC, id DESC LIMIT 21"
+)).fetchall()
+db.close()
+print("\n🔎 Query plan halaman pertama:")
+for row in plan:
+    print(f"   {row[-1]}")
+
+print("\n✅ Benchmark selesai")
@@ -0,0 +1,86 @@
+"""
+Benchmark offset vs cursor pagination di GET /products/
+
+Seed N products ke database sementara, lalu ukur latency halaman
+di berbagai kedalaman. Cursor mode harus tetap datar.
+
+Usage: python scripts/bench_pagination.py [jumlah_products]
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Database sementara, harus di-set sebelum backend di-import
+tmpdir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{tmpdir}/bench.db"
+
+from fastapi.testclient import TestClient
+
+from backend.database import Base, SessionLocal, engine
+from backend.main import app
+from backend.models.product import Product
+
+N_PRODUCTS = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+PAGE_SIZE = 20
+DEPTHS = [1, 10, 100, 1000, 5000]
+CATEGORIES = ["Elektronik", "Laptop", "Audio", "Fashion", "Rumah"]
+
+Base.metadata.create_all(bind=engine)
+client = TestClient(app)
+
+print(f"🌱 Seeding {N_PRODUCTS:,} products...")
+start = datetime(2025, 1, 1)
+with engine.begin() as conn:
+    conn.execute(Product.__table__.insert(), [
+        {
+            "name": f"Produk {i}",
+            "description": "Deskripsi produk",
+            "price": float(1000 + (i * 7919) % 1_000_000),
+            "stock": i % 50,
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "seller_id": 1,
+            "created_at": start + timedelta(seconds=i),
+        }
+        for i in range(N_PRODUCTS)
+    ])
+
+def timed_get(url, repeat=5):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        response = client.get(url)
+        elapsed = (time.perf_counter() - t0) * 1000
+        assert response.status_code == 200, response.text
+        best = elapsed if best is None else min(best, elapsed)
+    return best, response.json()
+
+def cursor_for_page(page, params):
+    """Jalan dari halaman pertama sampai `page` untuk dapat cursor-nya"""
+    cursor = ""
+    for _ in range(page - 1):
+        data = client.get(f"/products/?cursor={cursor}&limit={PAGE_SIZE}{params}").json()
+        cursor = data["next_cursor"]
+        if cursor is None:
+            return None
+    return cursor
+
+for label, params in [("all", ""), ("category=Audio", "&category=Audio")]:
+    print("\n" + "=" * 60)
+    print(f"📊 {label}  (page size {PAGE_SIZE})")
+    print("=" * 60)
+    print(f"{'page':>8} | {'offset (ms)':>12} | {'cursor (ms)':>12}")
+    print("-" * 60)
+    for page in DEPTHS:
+        cursor = cursor_for_page(page, params)
+        if cursor is None:
+            continue
+        skip = (page - 1) * PAGE_SIZE
+        offset_ms, _ = timed_get(f"/products/?skip={skip}&limit={PAGE_SIZE}{params}")
+        cursor_ms, _ = timed_get(f"/products/?cursor={cursor}&limit={PAGE_SIZE}{params}")
+        print(f"{page:>8} | {offset_ms:>12.2f} | {cursor_ms:>12.2f}")
+
+print("\n✅ Benchmark selesai")
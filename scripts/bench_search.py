@@ -0,0 +1,106 @@
+"""
+Benchmark GET /products/search (FTS5 + BM25)
+
+Seed N products dengan nama acak ke database sementara, build index
+FTS5, lalu ukur p50/p95 latency untuk query lengkap dan prefix: tanpa
+cache (search_cache dikosongkan sebelum setiap request) dan dari cache.
+Target: p95 < 20 ms.
+
+Usage: python scripts/bench_search.py [jumlah_products]
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Database sementara, harus di-set sebelum backend di-import
+tmpdir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{tmpdir}/bench.db"
+
+from fastapi.testclient import TestClient
+
+from backend.database import Base, SessionLocal, engine
+from backend.main import app
+from backend.models.product import Product
+from backend.utils.cache import search_cache
+from backend.utils.search import rebuild_search_index
+
+N_PRODUCTS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+REPEAT = 50
+BRANDS = ["Samsung", "Apple", "Xiaomi", "Sony", "Asus", "Lenovo", "Oppo", "Vivo", "Realme", "Acer"]
+NOUNS = ["Phone", "Laptop", "Headphone", "Tablet", "Charger", "Speaker", "Monitor", "Keyboard", "Mouse", "Kamera"]
+ADJECTIVES = ["Pro", "Max", "Ultra", "Lite", "Mini", "Plus", "Air", "Neo", "Prime", "Edge"]
+CATEGORIES = ["Elektronik", "Laptop", "Audio", "Aksesoris", "Gaming"]
+QUERIES = ["samsung laptop", "sony headphone ultra", "kamera", "xiaomi phone pro", "sa", "len", "asus mon", "realme charger li"]
+
+random.seed(42)
+Base.metadata.create_all(bind=engine)
+client = TestClient(app)
+
+print(f"🌱 Seeding {N_PRODUCTS:,} products...")
+start = datetime(2025, 1, 1)
+batch = []
+with engine.begin() as conn:
+    for i in range(N_PRODUCTS):
+        batch.append({
+            "name": f"{random.choice(BRANDS)} {random.choice(NOUNS)} {random.choice(ADJECTIVES)} {i}",
+            "description": f"{random.choice(ADJECTIVES)} {random.choice(NOUNS)} original bergaransi",
+            "price": float(random.randint(10, 20000) * 1000),
+            "stock": random.randint(0, 100),
+            "category": random.choice(CATEGORIES),
+            "seller_id": 1,
+            "created_at": start + timedelta(seconds=i),
+        })
+        if len(batch) == 50_000:
+            conn.execute(Product.__table__.insert(), batch)
+            batch = []
+    if batch:
+        conn.execute(Product.__table__.insert(), batch)
+
+print("🔨 Building FTS index...")
+t0 = time.perf_counter()
+db = SessionLocal()
+rebuild_search_index(db)
+db.close()
+print(f"   selesai dalam {time.perf_counter() - t0:.1f}s")
+
+SLO_MS = 20
+
+def p95(samples):
+    return samples[int(len(samples) * 0.95) - 1]
+
+def measure(q, cached):
+    samples = []
+    for _ in range(REPEAT):
+        if not cached:
+            search_cache.clear()
+        t0 = time.perf_counter()
+        response = client.get("/products/search", params={"q": q, "limit": 20})
+        samples.append((time.perf_counter() - t0) * 1000)
+        assert response.status_code == 200, response.text
+    return sorted(samples)
+
+print("\n" + "=" * 72)
+print(f"{'query':<24} | {'p50 (ms)':>9} | {'p95 (ms)':>9} | {'cached p95':>10}")
+print("-" * 72)
+cold_all, warm_all = [], []
+for q in QUERIES:
+    cold = measure(q, cached=False)
+    warm = measure(q, cached=True)
+    cold_all.extend(cold)
+    warm_all.extend(warm)
+    print(f"{q:<24} | {statistics.median(cold):>9.2f} | {p95(cold):>9.2f} | {p95(warm):>10.2f}")
+
+cold_all.sort()
+warm_all.sort()
+print("-" * 72)
+print(f"{'ALL':<24} | {statistics.median(cold_all):>9.2f} | {p95(cold_all):>9.2f} | {p95(warm_all):>10.2f}")
+print(f"\nSLO p95 < {SLO_MS} ms: tanpa cache {'✅' if p95(cold_all) < SLO_MS else '❌'}, "
+      f"dari cache {'✅' if p95(warm_all) < SLO_MS else '❌'}")
+
+print("\n✅ Benchmark selesai")
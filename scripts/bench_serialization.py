@@ -0,0 +1,94 @@
+"""
+Microbenchmark serialisasi 1.000 products (object ORM dari database)
+
+Membandingkan jalur default FastAPI (validasi response_model + encode
+JSON) dengan jalur FAST_JSON (utils/fast_json.py) yang tidak memvalidasi
+ulang row dari database.
+
+Usage: python scripts/bench_serialization.py [repeat]
+"""
+import json
+import os
+import sys
+import tempfile
+import timeit
+from datetime import datetime, timedelta
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Database sementara, harus di-set sebelum backend di-import
+tmpdir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{tmpdir}/bench.db"
+
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+
+from backend.database import SessionLocal, engine
+from backend.init_db import init_database
+from backend.models.product import Product
+from backend.schemas.product import ProductResponse
+from backend.utils import fast_json
+
+REPEAT = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+N = 1000
+
+init_database()
+start = datetime(2025, 1, 1)
+with engine.begin() as conn:
+    conn.execute(Product.__table__.insert(), [
+        {
+            "name": f"Produk {i}",
+            "description": f"Deskripsi produk {i} dengan detail spesifikasi dan garansi resmi",
+            "price": float(1000 + (i * 7919) % 1_000_000),
+            "stock": i % 50,
+            "category": "Elektronik",
+            "image_url": f"https://cdn.example.com/products/{i}.jpg",
+            "seller_id": 1,
+            "created_at": start + timedelta(seconds=i, microseconds=i),
+        }
+        for i in range(N)
+    ])
+
+db = SessionLocal()
+products = db.query(Product).all()
+db.close()
+
+adapter = TypeAdapter(List[ProductResponse])
+
+def fastapi_default():
+    # Yang dilakukan FastAPI untuk response_model=List[ProductResponse]
+    validated = adapter.validate_python(products, from_attributes=True)
+    content = adapter.dump_python(validated, mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+def validated_dump_json():
+    return adapter.dump_json(adapter.validate_python(products, from_attributes=True))
+
+def fast_pydantic_core():
+    return to_json(fast_json.plain_list(ProductResponse, products))
+
+def fast_orjson():
+    return fast_json.dumps(fast_json.plain_list(ProductResponse, products))
+
+expected = json.loads(fastapi_default())
+cases = [
+    ("FastAPI default (validate + json.dumps)", fastapi_default),
+    ("validate + model_dump_json", validated_dump_json),
+    ("FAST_JSON, pydantic_core.to_json", fast_pydantic_core),
+]
+if fast_json.orjson is not None:
+    cases.append(("FAST_JSON, orjson", fast_orjson))
+
+print("=" * 64)
+print(f"📊 {N:,} products, median dari {REPEAT} run")
+print("=" * 64)
+baseline = None
+for label, fn in cases:
+    assert json.loads(fn()) == expected, label
+    runs = sorted(timeit.repeat(fn, number=1, repeat=REPEAT))
+    ms = runs[len(runs) // 2] * 1000
+    baseline = baseline or ms
+    print(f"{label:<42} | {ms:>7.2f} ms | {baseline / ms:>5.1f}x")
+
+print("\n✅ Benchmark selesai")
@@ -0,0 +1,132 @@
+"""
+Benchmark campuran read/write di SQLite: profil default vs production
+
+Menjalankan uvicorn dua kali di database SQLite sementara, sekali dengan
+SQLITE_PRODUCTION=false dan sekali dengan SQLITE_PRODUCTION=true, lalu
+mengirim campuran GET /cart/, GET /orders/ (read) dan POST /cart/ (write).
+
+Usage: python scripts/bench_sqlite_profile.py [--workers 2] [--concurrency 32] [--write-ratio 0.2]
+"""
+import argparse
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import requests
+
+N_BUYERS = 100
+N_PRODUCTS = 500
+
+def seed(env):
+    """Isi database lewat proses terpisah supaya config dibaca dari env"""
+    code = f"""
+from backend.database import Base, SessionLocal, engine
+from backend.init_db import init_database
+from backend.models.product import Product
+from backend.models.user import User
+from backend.utils.security import create_access_token, get_password_hash
+
+Base.metadata.drop_all(bind=engine)
+init_database()
+db = SessionLocal()
+hashed = get_password_hash("bench12345")
+seller = User(email="seller@bench.test", username="benchseller", hashed_password=hashed, is_seller=True)
+db.add(seller)
+db.flush()
+buyers = [User(email=f"b{{i}}@bench.test", username=f"benchbuyer{{i}}", hashed_password=hashed) for i in range({N_BUYERS})]
+db.add_all(buyers)
+db.add_all([Product(name=f"Produk {{i}}", price=1000, stock=10_000_000, seller_id=seller.id) for i in range({N_PRODUCTS})])
+db.commit()
+for b in buyers:
+    print(create_access_token(data={{"sub": b.username, "user_id": b.id}}))
+"""
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    return [line for line in out.stdout.splitlines() if line.count(".") == 2]
+
+def run(env, workers, concurrency, duration, write_ratio, port):
+    tokens = seed(env)
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app",
+         "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            requests.get(f"{base_url}/health", timeout=1)
+            break
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    
+    counts = {"read": 0, "write": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+    
+    def worker(worker_id):
+        session = requests.Session()
+        rng = random.Random(worker_id)
+        headers = {"Authorization": f"Bearer {tokens[worker_id % len(tokens)]}"}
+        while time.perf_counter() < deadline:
+            if rng.random() < write_ratio:
+                kind = "write"
+                response = session.post(f"{base_url}/cart/", headers=headers, json={
+                    "product_id": rng.randint(1, N_PRODUCTS), "quantity": 1
+                })
+            else:
+                kind = "read"
+                path = "/cart/" if rng.random() < 0.5 else "/orders/"
+                response = session.get(f"{base_url}{path}", headers=headers)
+            with lock:
+                if response.status_code < 300:
+                    counts[kind] += 1
+                else:
+                    counts["errors"] += 1
+    
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for i in range(concurrency):
+                pool.submit(worker, i)
+    finally:
+        proc.terminate()
+        proc.wait()
+    
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+    
+    tmpdir = tempfile.mkdtemp()
+    results = []
+    for production in ("false", "true"):
+        env = os.environ.copy()
+        env["DATABASE_URL"] = f"sqlite:///{tmpdir}/bench_{production}.db"
+        env["SQLITE_PRODUCTION"] = production
+        counts = run(env, args.workers, args.concurrency, args.duration, args.write_ratio, args.port)
+        results.append((production, counts))
+    
+    print("\n" + "=" * 70)
+    print(f"workers={args.workers} concurrency={args.concurrency} write_ratio={args.write_ratio}")
+    print(f"{'SQLITE_PRODUCTION':>18} | {'read RPS':>9} | {'write RPS':>9} | {'total RPS':>9} | {'errors':>6}")
+    print("-" * 70)
+    for production, counts in results:
+        read_rps = counts["read"] / args.duration
+        write_rps = counts["write"] / args.duration
+        print(f"{production:>18} | {read_rps:>9.1f} | {write_rps:>9.1f} | {read_rps + write_rps:>9.1f} | {counts['errors']:>6}")
+    print("=" * 70)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,376 @@
+"""
+Benchmark suite untuk hot path API
+
+Seed N users, products, cart dan orders ke database sementara, lalu jalankan
+setiap skenario dengan client konkuren (httpx) dan laporkan RPS, latency
+p50/p95/p99 dan jumlah query SQL per request. Hasilnya disimpan sebagai JSON
+supaya bisa dibandingkan antar commit (--compare).
+
+Mode:
+    inprocess  app dipanggil langsung lewat ASGI (tanpa network)
+    uvicorn    app dijalankan sebagai subprocess uvicorn (--workers)
+
+Jumlah query per request selalu diukur in-process (request berurutan,
+dihitung dari event engine), karena query di worker uvicorn tidak terlihat
+dari sini.
+
+Database diambil dari BENCH_DATABASE_URL, default SQLite sementara
+(DATABASE_URL diabaikan supaya database dev/production tidak terhapus).
+PERINGATAN: semua tabel di database tersebut di-drop dan dibuat ulang.
+
+Usage:
+    python scripts/bench_suite.py [--mode inprocess|uvicorn] [--workers 1]
+        [--users 200] [--products 2000] [--orders 5000]
+        [--concurrency 16] [--requests 500] [--scenarios listing detail ...]
+        [--output hasil.json] [--compare hasil_lama.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Database sementara, harus di-set sebelum backend di-import
+os.environ["DATABASE_URL"] = os.environ.get("BENCH_DATABASE_URL") or f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+
+import httpx
+from sqlalchemy import event
+
+from backend.config import settings
+from backend.database import Base, SessionLocal, async_engine, engine, read_engine
+from backend.init_db import init_database
+from backend.main import app
+from backend.models.cart import CartItem
+from backend.models.order import Order, OrderItem
+from backend.models.product import Product
+from backend.models.user import User
+from backend.utils.cache import product_detail_cache, product_list_cache
+from backend.utils.categories import rebuild_categories
+from backend.utils.security import create_access_token, get_password_hash
+
+PASSWORD = "bench12345"
+PRICE = 10000.0
+CATEGORIES = ["Elektronik", "Laptop", "Audio", "Fashion", "Rumah"]
+CART_ITEMS_PER_USER = 5
+ITEMS_PER_ORDER = 3
+PROBE_REQUESTS = 20
+PORT = 8767
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["inprocess", "uvicorn"], default="inprocess")
+    parser.add_argument("--workers", type=int, default=1, help="worker uvicorn (mode uvicorn)")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--orders", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=500, help="request per skenario")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--output", help="file JSON hasil (default bench_results/<waktu>-<commit>.json)")
+    parser.add_argument("--compare", help="file JSON hasil run sebelumnya")
+    return parser.parse_args()
+
+# ---------------------------------------------------------------- seed
+
+def seed(n_users, n_products, n_orders):
+    """Reset database lalu isi users (buyer + 1 seller), products, cart dan orders"""
+    Base.metadata.drop_all(bind=engine)
+    init_database()
+    
+    hashed = get_password_hash(PASSWORD)  # bcrypt sekali saja
+    start = datetime.utcnow() - timedelta(days=30)
+    
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), [
+            {"email": "seller@bench.test", "username": "benchseller", "hashed_password": hashed,
+             "is_active": True, "is_seller": True}
+        ] + [
+            {"email": f"buyer{i}@bench.test", "username": f"benchbuyer{i}", "hashed_password": hashed,
+             "is_active": True, "is_seller": False}
+            for i in range(n_users)
+        ])
+        conn.execute(Product.__table__.insert(), [
+            {"name": f"Produk Bench {i}", "description": "Deskripsi produk benchmark " * 5,
+             "price": PRICE, "stock": 10_000_000, "category": CATEGORIES[i % len(CATEGORIES)],
+             "seller_id": 1, "created_at": start + timedelta(seconds=i)}
+            for i in range(n_products)
+        ])
+        # Buyer id 2 .. n_users + 1, product id 1 .. n_products
+        conn.execute(CartItem.__table__.insert(), [
+            {"user_id": 2 + u, "product_id": 1 + (u * CART_ITEMS_PER_USER + k) % n_products, "quantity": 1}
+            for u in range(n_users)
+            for k in range(CART_ITEMS_PER_USER)
+        ])
+        conn.execute(Order.__table__.insert(), [
+            {"buyer_id": 2 + i % n_users, "total_amount": PRICE * ITEMS_PER_ORDER, "status": "paid",
+             "shipping_address": "Jl. Benchmark No. 1, Jakarta", "created_at": start + timedelta(minutes=i)}
+            for i in range(n_orders)
+        ])
+        conn.execute(OrderItem.__table__.insert(), [
+            {"order_id": 1 + i, "product_id": 1 + (i * ITEMS_PER_ORDER + k) % n_products,
+             "quantity": 1, "price": PRICE}
+            for i in range(n_orders)
+            for k in range(ITEMS_PER_ORDER)
+        ])
+    
+    db = SessionLocal()
+    try:
+        rebuild_categories(db)
+    finally:
+        db.close()
+    
+    return [
+        {"Authorization": f"Bearer {create_access_token(data={'sub': f'benchbuyer{i}'})}"}
+        for i in range(n_users)
+    ]
+
+# ---------------------------------------------------------------- skenario
+# Setiap skenario: fungsi (i, ctx) -> (method, path, kwargs httpx)
+
+def login(i, ctx):
+    return "POST", "/auth/login", {"json": {"username": f"benchbuyer{i % ctx['users']}", "password": PASSWORD}}
+
+def listing(i, ctx):
+    category = CATEGORIES[i % len(CATEGORIES)] if i % 2 else None
+    params = {"limit": 20, "skip": (i // 2) % 5 * 20}
+    if category:
+        params["category"] = category
+    return "GET", "/products/", {"params": params}
+
+def detail(i, ctx):
+    return "GET", f"/products/{1 + (i * 7919) % ctx['products']}", {}
+
+def add_to_cart(i, ctx):
+    return "POST", "/cart/", {
+        "json": {"product_id": 1 + (i * 31) % ctx["products"], "quantity": 1},
+        "headers": ctx["tokens"][i % len(ctx["tokens"])],
+    }
+
+def get_cart(i, ctx):
+    return "GET", "/cart/", {"headers": ctx["tokens"][i % len(ctx["tokens"])]}
+
+def checkout(i, ctx):
+    items = [
+        {"product_id": 1 + (i * ITEMS_PER_ORDER + k) % ctx["products"], "quantity": 1, "price": PRICE}
+        for k in range(ITEMS_PER_ORDER)
+    ]
+    return "POST", "/orders/", {
+        "json": {"shipping_address": "Jl. Benchmark No. 2, Jakarta", "items": items},
+        "headers": ctx["tokens"][i % len(ctx["tokens"])],
+    }
+
+def order_history(i, ctx):
+    return "GET", "/orders/", {
+        "params": {"cursor": "", "limit": 20},
+        "headers": ctx["tokens"][i % len(ctx["tokens"])],
+    }
+
+SCENARIOS = {
+    "login": login,
+    "listing": listing,
+    "detail": detail,
+    "add_to_cart": add_to_cart,
+    "get_cart": get_cart,
+    "checkout": checkout,
+    "order_history": order_history,
+}
+
+# ---------------------------------------------------------------- runner
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, round(q * (len(sorted_values) - 1)))]
+
+async def run_scenario(client, build, ctx, total, concurrency):
+    """Kirim `total` request dengan `concurrency` worker. Return statistik"""
+    latencies = []
+    errors = 0
+    next_index = 0
+    
+    async def worker():
+        nonlocal next_index, errors
+        while next_index < total:
+            i = next_index
+            next_index += 1
+            method, path, kwargs = build(i, ctx)
+            t0 = time.perf_counter()
+            response = await client.request(method, path, **kwargs)
+            latencies.append((time.perf_counter() - t0) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+    
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+    
+    latencies.sort()
+    return {
+        "requests": total,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "rps": round(total / elapsed, 1),
+        "mean_ms": round(sum(latencies) / len(latencies), 2),
+        "p50_ms": round(percentile(latencies, 0.50), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+        "p99_ms": round(percentile(latencies, 0.99), 2),
+    }
+
+async def count_queries(build, ctx):
+    """
+    Rata-rata query SQL per request (cache product miss), dari request
+    berurutan in-process
+    """
+    engines = {engine, read_engine}
+    if async_engine is not None:
+        engines.add(async_engine.sync_engine)
+    queries = 0
+    
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        nonlocal queries
+        queries += 1
+    
+    for e in engines:
+        event.listen(e, "before_cursor_execute", on_execute)
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for i in range(PROBE_REQUESTS):
+                # Cache product dikosongkan supaya yang dihitung query
+                # sebenarnya, bukan hasil cache dari fase load
+                product_detail_cache.clear()
+                product_list_cache.clear()
+                method, path, kwargs = build(i, ctx)
+                await client.request(method, path, **kwargs)
+    finally:
+        for e in engines:
+            event.remove(e, "before_cursor_execute", on_execute)
+    return round(queries / PROBE_REQUESTS, 2)
+
+def start_uvicorn(workers):
+    env = {**os.environ, "PYTHONPATH": ROOT}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(PORT),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=ROOT, env=env
+    )
+    for _ in range(100):
+        try:
+            if httpx.get(f"http://127.0.0.1:{PORT}/health").status_code == 200:
+                return server
+        except httpx.TransportError:
+            pass
+        time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError("uvicorn tidak bisa start")
+
+async def run_all(args, ctx):
+    if args.mode == "inprocess":
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://bench"
+    else:
+        transport = httpx.AsyncHTTPTransport()
+        base_url = f"http://127.0.0.1:{PORT}"
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, limits=limits, timeout=60) as client:
+        for name in args.scenarios:
+            build = SCENARIOS[name]
+            # Warm up (koneksi, cache, import lazy)
+            for i in range(min(10, args.requests)):
+                method, path, kwargs = build(i, ctx)
+                await client.request(method, path, **kwargs)
+    
+            results[name] = await run_scenario(client, build, ctx, args.requests, args.concurrency)
+            results[name]["queries_per_request"] = await count_queries(build, ctx)
+            r = results[name]
+            print(f"{name:<15} {r['rps']:>8.1f} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} "
+                  f"{r['p99_ms']:>8.1f} {r['queries_per_request']:>8.1f} {r['errors']:>7}")
+    return results
+
+# ---------------------------------------------------------------- output
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def print_comparison(old, new):
+    print(f"\n📊 Dibandingkan dengan {old['meta'].get('commit')} ({old['meta'].get('timestamp')})")
+    print("-" * 72)
+    print(f"{'Skenario':<15} {'RPS lama':>9} {'RPS baru':>9} {'Δ':>7}   {'p95 lama':>9} {'p95 baru':>9} {'Δ':>7}")
+    for name, result in new["results"].items():
+        before = old["results"].get(name)
+        if before is None:
+            continue
+        rps_delta = (result["rps"] / before["rps"] - 1) * 100 if before["rps"] else 0
+        p95_delta = (result["p95_ms"] / before["p95_ms"] - 1) * 100 if before["p95_ms"] else 0
+        print(f"{name:<15} {before['rps']:>9.1f} {result['rps']:>9.1f} {rps_delta:>+6.1f}%   "
+              f"{before['p95_ms']:>9.1f} {result['p95_ms']:>9.1f} {p95_delta:>+6.1f}%")
+
+def main():
+    args = parse_args()
+    
+    print(f"🌱 Seeding {args.users:,} users, {args.products:,} products, {args.orders:,} orders "
+          f"({engine.url.get_backend_name()})...")
+    tokens = seed(args.users, args.products, args.orders)
+    ctx = {"users": args.users, "products": args.products, "tokens": tokens}
+    
+    server = start_uvicorn(args.workers) if args.mode == "uvicorn" else None
+    try:
+        print(f"\n🚀 Mode {args.mode}, concurrency {args.concurrency}, {args.requests} request per skenario")
+        print("-" * 72)
+        print(f"{'Skenario':<15} {'RPS':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'Query':>8} {'Error':>7}")
+        results = asyncio.run(run_all(args, ctx))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    
+    output = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "mode": args.mode,
+            "workers": args.workers if args.mode == "uvicorn" else None,
+            "database": engine.url.get_backend_name(),
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "users": args.users,
+            "products": args.products,
+            "orders": args.orders,
+            "bcrypt_rounds": settings.bcrypt_rounds,
+            "db_async": settings.db_async,
+            "fast_json": settings.fast_json,
+            "python": platform.python_version(),
+        },
+        "results": results,
+    }
+    
+    path = args.output
+    if path is None:
+        os.makedirs(os.path.join(ROOT, "bench_results"), exist_ok=True)
+        name = f"{datetime.now():%Y%m%d-%H%M%S}-{output['meta']['commit'] or 'nogit'}.json"
+        path = os.path.join(ROOT, "bench_results", name)
+    with open(path, "w") as f:
+        json.dump(output, f, indent=2)
+    print(f"\n💾 Hasil disimpan di {path}")
+    
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(json.load(f), output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Build frontend untuk production: frontend/ -> frontend/dist/
+
+- Setiap file di frontend/static disalin dengan nama ber-hash konten
+  (style.css -> style.3f2a9c1b.css), plus salinan nama aslinya
+- HTML ditulis ulang supaya memakai nama ber-hash
+- Semua file teks mendapat varian .gz dan .br (brotli jika terinstall)
+
+Backend otomatis memakai frontend/dist jika folder itu ada. Jalankan ulang
+setiap kali frontend berubah (atau hapus frontend/dist saat development).
+
+Usage: python scripts/build_static.py
+"""
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC = os.path.join(ROOT, "frontend")
+DIST = os.path.join(SRC, "dist")
+COMPRESSIBLE = {".html", ".css", ".js", ".json", ".svg", ".txt", ".map"}
+
+# href="static/..." / src="/static/..."
+ASSET_RE = re.compile(r'((?:href|src)=["\'])(/?)static/([^"\'?#]+)')
+
+def write_variants(path: str, data: bytes, stats: dict):
+    """Tulis file beserta varian .gz / .br jika memang lebih kecil"""
+    with open(path, "wb") as f:
+        f.write(data)
+    stats["raw"] += len(data)
+    
+    if os.path.splitext(path)[1] not in COMPRESSIBLE:
+        return
+    
+    variants = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants[".br"] = brotli.compress(data, quality=11)
+    
+    for suffix, compressed in variants.items():
+        if len(compressed) < len(data):
+            with open(path + suffix, "wb") as f:
+                f.write(compressed)
+            stats[suffix] += len(compressed)
+
+def build():
+    if os.path.isdir(DIST):
+        shutil.rmtree(DIST)
+    
+    stats = {"raw": 0, ".gz": 0, ".br": 0}
+    manifest = {}
+    static_src = os.path.join(SRC, "static")
+    
+    for dirpath, _, filenames in os.walk(static_src):
+        for filename in sorted(filenames):
+            src = os.path.join(dirpath, filename)
+            rel = os.path.relpath(src, static_src).replace(os.sep, "/")
+            with open(src, "rb") as f:
+                data = f.read()
+            
+            digest = hashlib.sha256(data).hexdigest()[:8]
+            stem, ext = os.path.splitext(rel)
+            hashed = f"{stem}.{digest}{ext}"
+            manifest[rel] = hashed
+            
+            for name in (rel, hashed):
+                dst = os.path.join(DIST, "static", name)
+                os.makedirs(os.path.dirname(dst), exist_ok=True)
+                write_variants(dst, data, stats)
+    
+    def rewrite(match):
+        prefix, slash, rel = match.groups()
+        return f"{prefix}{slash}static/{manifest.get(rel, rel)}"
+    
+    for filename in sorted(os.listdir(SRC)):
+        if not filename.endswith(".html"):
+            continue
+        with open(os.path.join(SRC, filename), encoding="utf-8") as f:
+            html = ASSET_RE.sub(rewrite, f.read())
+        write_variants(os.path.join(DIST, filename), html.encode("utf-8"), stats)
+    
+    with open(os.path.join(DIST, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    
+    print(f"✅ {len(manifest)} assets -> {os.path.relpath(DIST, ROOT)}")
+    print(f"   raw {stats['raw'] / 1024:.1f} KB, gzip {stats['.gz'] / 1024:.1f} KB, brotli {stats['.br'] / 1024:.1f} KB")
+    if brotli is None:
+        print("⚠️  Modul brotli tidak terinstall, varian .br dilewati (pip install brotli)")
+
+if __name__ == "__main__":
+    build()
@@ -0,0 +1,52 @@
+"""
+Fixture pytest untuk test yang berjalan in-process (TestClient)
+
+Script lama di folder ini (test_auth_flow.py dll) adalah script manual yang
+butuh server jalan di localhost, jadi tidak ikut dikumpulkan pytest.
+
+Secara default test memakai SQLite sementara. Untuk menjalankan terhadap
+PostgreSQL set TEST_DATABASE_URL (semua tabel di-drop dan dibuat ulang).
+DATABASE_URL sengaja diabaikan supaya database dev/production yang
+ter-export di shell tidak ikut terhapus.
+"""
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+os.environ["DATABASE_URL"] = os.environ.get("TEST_DATABASE_URL") or f"sqlite:///{tempfile.mkdtemp()}/test.db"
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+import pytest
+
+collect_ignore = [
+    "test_auth_flow.py",
+    "test_create_product.py",
+    "test_database.py",
+    "test_install.py",
+    "test_products_complete.py",
+    "test_users.py",
+]
+
+@pytest.fixture
+def db_reset():
+    """Drop dan buat ulang semua tabel, kosongkan cache"""
+    from backend.database import Base, engine
+    from backend.init_db import init_database
+    from backend.utils.cache import category_cache, product_detail_cache, product_list_cache, search_cache
+    from backend.utils.dependencies import principal_cache
+    
+    Base.metadata.drop_all(bind=engine)
+    init_database()
+    for cache in (product_detail_cache, product_list_cache, category_cache, search_cache, principal_cache):
+        cache.clear()
+
+@pytest.fixture
+def client(db_reset):
+    from fastapi.testclient import TestClient
+    from backend.main import app
+    
+    with TestClient(app) as c:
+        yield c
@@ -0,0 +1,74 @@
+"""
+Auth tidak membuka session kedua: tanpa engine read terpisah, route dan
+get_current_user memakai satu koneksi pool per request
+"""
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from backend.config import settings
+from backend.database import SessionLocal, engine, read_engine
+from backend.models.product import Product
+from backend.models.user import User
+from backend.utils.security import create_access_token
+
+pytestmark = pytest.mark.skipif(
+    read_engine is not engine or settings.db_async,
+    reason="engine read terpisah (SQLITE_PRODUCTION) / koneksi dari engine async (DB_ASYNC)"
+)
+
+@contextmanager
+def peak_checkouts():
+    state = {"open": 0, "peak": 0}
+    
+    def on_checkout(dbapi_connection, record, proxy):
+        state["open"] += 1
+        state["peak"] = max(state["peak"], state["open"])
+    
+    def on_checkin(dbapi_connection, record):
+        state["open"] -= 1
+    
+    event.listen(engine.pool, "checkout", on_checkout)
+    event.listen(engine.pool, "checkin", on_checkin)
+    try:
+        yield state
+    finally:
+        event.remove(engine.pool, "checkout", on_checkout)
+        event.remove(engine.pool, "checkin", on_checkin)
+
+@pytest.fixture
+def buyer(client):
+    db = SessionLocal()
+    seller = User(email="seller@session.test", username="sessionseller", hashed_password="x", is_seller=True)
+    user = User(email="buyer@session.test", username="sessionbuyer", hashed_password="x")
+    db.add_all([seller, user])
+    db.flush()
+    product = Product(name="Session SKU", price=1000, stock=100, category="Session", seller_id=seller.id)
+    db.add(product)
+    db.commit()
+    
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': user.username})}"}
+    product_id = product.id
+    db.close()
+    return headers, product_id
+
+@pytest.mark.parametrize("principal_ttl", [0, 60])
+def test_one_connection_per_request(client, buyer, monkeypatch, principal_ttl):
+    monkeypatch.setattr(settings, "auth_principal_ttl", principal_ttl)
+    headers, product_id = buyer
+    
+    requests = [
+        ("post", "/cart/", {"product_id": product_id, "quantity": 1}),
+        ("get", "/cart/", None),
+        ("post", "/orders/", {
+            "shipping_address": "Jl. Session Test No. 1",
+            "items": [{"product_id": product_id, "quantity": 1, "price": 1000}],
+        }),
+        ("get", "/orders/", None),
+    ]
+    for method, url, body in requests:
+        with peak_checkouts() as state:
+            response = client.request(method, url, json=body, headers=headers)
+        assert response.status_code in (200, 201), (url, response.text)
+        assert state["peak"] == 1, url
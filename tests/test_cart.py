@@ -0,0 +1,116 @@
+"""
+POST /cart/bulk: jumlah item dibatasi, quantity digabung dengan item
+yang sudah ada di cart, dan stock dicek untuk total per product
+"""
+import pytest
+
+from backend.database import SessionLocal
+from backend.models.cart import CartItem
+from backend.models.product import Product
+from backend.models.user import User
+from backend.schemas.cart import MAX_BULK_ITEMS
+from backend.utils.security import create_access_token
+
+def seed(stocks=(10, 5, 200)):
+    db = SessionLocal()
+    seller = User(email="seller@cart.test", username="cartseller", hashed_password="x", is_seller=True)
+    buyer = User(email="buyer@cart.test", username="cartbuyer", hashed_password="x")
+    db.add_all([seller, buyer])
+    db.flush()
+    products = [
+        Product(name=f"Cart {i}", price=1000.0 * (i + 1), stock=stock, category="Cart", seller_id=seller.id)
+        for i, stock in enumerate(stocks)
+    ]
+    db.add_all(products)
+    db.commit()
+    
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': buyer.username})}"}
+    ids = [p.id for p in products]
+    db.close()
+    return headers, ids
+
+def cart_rows() -> dict:
+    db = SessionLocal()
+    try:
+        return {item.product_id: item.quantity for item in db.query(CartItem)}
+    finally:
+        db.close()
+
+def bulk(client, headers, items):
+    return client.post("/cart/bulk", headers=headers, json={
+        "items": [{"product_id": pid, "quantity": qty} for pid, qty in items]
+    })
+
+def test_bulk_merges_with_existing_quantity(client):
+    headers, (a, b, _) = seed()
+    assert client.post("/cart/", headers=headers, json={"product_id": a, "quantity": 2}).status_code == 201
+    
+    # Product yang sama dua kali di request digabung jadi satu row
+    response = bulk(client, headers, [(a, 1), (b, 2), (a, 3)])
+    assert response.status_code == 201
+    items = response.json()
+    
+    assert [(i["product_id"], i["quantity"]) for i in items] == [(a, 6), (b, 2)]
+    assert items[0]["product"]["name"] == "Cart 0"
+    assert cart_rows() == {a: 6, b: 2}
+
+def test_bulk_checks_stock_for_summed_quantity(client):
+    headers, (a, b, _) = seed()
+    
+    # 3 + 3 > stock 5 walaupun tiap item sendiri-sendiri cukup
+    response = bulk(client, headers, [(a, 1), (b, 3), (b, 3)])
+    assert response.status_code == 400
+    assert "Stok tersedia: 5" in response.json()["detail"]
+    # Tidak ada yang masuk ke cart, termasuk item yang stock-nya cukup
+    assert cart_rows() == {}
+    
+    assert bulk(client, headers, [(a, 1), (b, 5)]).status_code == 201
+    assert cart_rows() == {a: 1, b: 5}
+
+def test_bulk_unknown_product_adds_nothing(client):
+    headers, (a, _, _) = seed()
+    
+    response = bulk(client, headers, [(a, 1), (999999, 1)])
+    assert response.status_code == 404
+    assert cart_rows() == {}
+
+@pytest.mark.parametrize("count,status_code", [(0, 422), (MAX_BULK_ITEMS, 201), (MAX_BULK_ITEMS + 1, 422)])
+def test_bulk_item_count_is_limited(client, count, status_code):
+    headers, (_, _, c) = seed()
+    
+    response = bulk(client, headers, [(c, 1)] * count)
+    assert response.status_code == status_code
+    assert cart_rows() == ({c: count} if status_code == 201 else {})
+
+def test_summary_matches_cart_with_deleted_and_sold_out_products(client):
+    headers, (a, b, c) = seed(stocks=(10, 5, 3))
+    assert bulk(client, headers, [(a, 2), (b, 1), (c, 3)]).status_code == 201
+    
+    db = SessionLocal()
+    # b habis terjual setelah masuk cart: tetap ada di cart dan ikut dihitung
+    db.query(Product).filter(Product.id == b).update({"stock": 0})
+    if db.get_bind().dialect.name == "sqlite":
+        # c dihapus seller; SQLite tidak menegakkan FK sehingga row cart-nya
+        # tertinggal, dan tidak boleh ikut dihitung / ditampilkan
+        db.query(Product).filter(Product.id == c).delete()
+    db.commit()
+    deleted = db.get(Product, c) is None
+    db.close()
+    
+    cart = client.get("/cart/", headers=headers).json()
+    summary = client.get("/cart/summary", headers=headers).json()
+    
+    expected_ids = [a, b] if deleted else [a, b, c]
+    assert [item["product_id"] for item in cart["items"]] == expected_ids
+    assert summary == {key: cart[key] for key in ("total_items", "total_quantity", "total_price")}
+    assert summary["total_items"] == len(cart["items"])
+    assert summary["total_quantity"] == sum(item["quantity"] for item in cart["items"])
+    assert summary["total_price"] == sum(item["quantity"] * item["product"]["price"] for item in cart["items"])
+    assert summary["total_price"] == (4000.0 if deleted else 13000.0)
+
+def test_summary_of_empty_cart(client):
+    headers, _ = seed()
+    
+    assert client.get("/cart/summary", headers=headers).json() == {
+        "total_items": 0, "total_quantity": 0, "total_price": 0.0
+    }
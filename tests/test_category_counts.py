@@ -0,0 +1,61 @@
+"""
+Hitungan product_categories tidak boleh bergeser saat seller mengubah
+stock sementara checkout untuk product yang sama belum commit
+"""
+import threading
+import time
+
+import backend.routes.orders as orders_routes
+
+from backend.database import SessionLocal
+from backend.models.category import ProductCategory
+from backend.models.product import Product
+from backend.models.user import User
+from backend.utils.categories import adjust_categories
+from backend.utils.security import create_access_token
+
+def seed():
+    db = SessionLocal()
+    seller = User(email="seller@count.test", username="countseller", hashed_password="x", is_seller=True)
+    db.add(seller)
+    db.flush()
+    product = Product(name="Count SKU", price=1000, stock=1, category="Count", seller_id=seller.id)
+    db.add(product)
+    db.add(ProductCategory(category="Count", product_count=1, in_stock_count=1))
+    db.commit()
+    
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': seller.username})}"}
+    product_id = product.id
+    db.close()
+    return headers, product_id
+
+def counts(db):
+    row = db.get(ProductCategory, "Count")
+    in_stock = db.query(Product).filter(Product.category == "Count", Product.stock > 0).count()
+    return (row.product_count, row.in_stock_count), (1, in_stock)
+
+def test_restock_waits_for_pending_checkout(client):
+    headers, product_id = seed()
+    
+    # Checkout membeli stock terakhir tapi belum commit
+    checkout = SessionLocal()
+    assert orders_routes.reserve_stock(checkout, {product_id: 1})
+    adjust_categories(checkout, [("Count", 0, -1)])
+    
+    responses = []
+    restock = threading.Thread(target=lambda: responses.append(
+        client.put(f"/products/{product_id}", json={"stock": 5}, headers=headers)
+    ))
+    restock.start()
+    time.sleep(0.5)
+    checkout.commit()
+    checkout.close()
+    restock.join()
+    
+    assert responses[0].status_code == 200
+    db = SessionLocal()
+    try:
+        stored, expected = counts(db)
+        assert stored == expected == (1, 1)
+    finally:
+        db.close()
@@ -0,0 +1,90 @@
+"""
+JSONCompressionMiddleware: hanya JSON >= minimum_size yang dikompres,
+dengan Vary: Accept-Encoding; response lain diteruskan apa adanya
+"""
+import gzip
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from backend.utils.compression import JSONCompressionMiddleware, brotli
+
+needs_brotli = pytest.mark.skipif(brotli is None, reason="brotli tidak terpasang")
+
+MINIMUM_SIZE = 500
+BIG = {"items": [{"id": i, "name": f"Produk {i}"} for i in range(100)]}
+SMALL = {"ok": True}
+
+app = FastAPI()
+app.add_middleware(JSONCompressionMiddleware, minimum_size=MINIMUM_SIZE)
+
+@app.get("/big")
+def big():
+    return BIG
+
+@app.get("/small")
+def small():
+    return SMALL
+
+@app.get("/text")
+def text():
+    return PlainTextResponse("x" * 5000)
+
+@app.get("/encoded")
+def encoded():
+    return Response(gzip.compress(json.dumps(BIG).encode()), media_type="application/json",
+                    headers={"Content-Encoding": "gzip"})
+
+@app.get("/stream")
+def stream():
+    chunks = (json.dumps(BIG).encode() for _ in range(2))
+    return StreamingResponse(chunks, media_type="application/json")
+
+@pytest.fixture
+def raw_client():
+    return TestClient(app)
+
+def get(client, path, encoding):
+    # iter_raw(): body apa adanya, tanpa di-decode otomatis oleh httpx
+    with client.stream("GET", path, headers={"Accept-Encoding": encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+@pytest.mark.parametrize("encoding", ["gzip", pytest.param("br", marks=needs_brotli)])
+def test_big_json_is_compressed(raw_client, encoding):
+    response, body = get(raw_client, "/big", encoding)
+    decompress = brotli.decompress if encoding == "br" else gzip.decompress
+    
+    assert response.headers["Content-Encoding"] == encoding
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert int(response.headers["Content-Length"]) == len(body)
+    assert json.loads(decompress(body)) == BIG
+
+@needs_brotli
+def test_brotli_preferred_when_both_accepted(raw_client):
+    response, _ = get(raw_client, "/big", "gzip, br")
+    assert response.headers["Content-Encoding"] == "br"
+
+def test_small_json_is_not_compressed(raw_client):
+    assert len(json.dumps(SMALL)) < MINIMUM_SIZE
+    response, body = get(raw_client, "/small", "gzip")
+    
+    assert "Content-Encoding" not in response.headers
+    assert json.loads(body) == SMALL
+
+def test_identity_client_gets_plain_json(raw_client):
+    response, body = get(raw_client, "/big", "identity")
+    
+    assert "Content-Encoding" not in response.headers
+    assert json.loads(body) == BIG
+
+@pytest.mark.parametrize("path", ["/text", "/encoded", "/stream"])
+def test_other_responses_pass_through(raw_client, path):
+    plain, plain_body = get(raw_client, path, "identity")
+    response, body = get(raw_client, path, "gzip, br")
+    
+    assert body == plain_body
+    assert response.headers.get("Content-Encoding") == plain.headers.get("Content-Encoding")
+    assert "Vary" not in response.headers
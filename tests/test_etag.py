@@ -0,0 +1,117 @@
+"""
+ETag dari etag_for: 304 untuk If-None-Match yang cocok, versi tabel naik
+hanya saat write ter-commit (ORM flush maupun Core update() seperti
+reserve_stock), tidak saat rollback atau order gagal
+"""
+import pytest
+
+import backend.routes.orders as orders_routes
+
+from backend.config import settings
+from backend.database import SessionLocal
+from backend.models.product import Product
+from backend.models.user import User
+from backend.utils.etag import table_version
+from backend.utils.security import create_access_token
+
+@pytest.fixture(autouse=True)
+def no_time_bucket(monkeypatch):
+    # ETag tidak berganti karena pindah bucket waktu di tengah test
+    monkeypatch.setattr(settings, "etag_ttl", 0)
+
+def seed():
+    db = SessionLocal()
+    seller = User(email="seller@etag.test", username="etagseller", hashed_password="x", is_seller=True)
+    buyer = User(email="buyer@etag.test", username="etagbuyer", hashed_password="x")
+    db.add_all([seller, buyer])
+    db.flush()
+    product = Product(name="ETag SKU", price=1000, stock=2, category="ETag", seller_id=seller.id)
+    db.add(product)
+    db.commit()
+    
+    headers = {
+        name: {"Authorization": f"Bearer {create_access_token(data={'sub': user.username})}"}
+        for name, user in (("seller", seller), ("buyer", buyer))
+    }
+    product_id = product.id
+    db.close()
+    return headers, product_id
+
+def order(client, headers, product_id, quantity):
+    return client.post("/orders/", headers=headers, json={
+        "shipping_address": "Jl. ETag No. 1",
+        "items": [{"product_id": product_id, "quantity": quantity, "price": 1000}],
+    })
+
+def revalidate(client, path, etag):
+    return client.get(path, headers={"If-None-Match": etag})
+
+def test_matching_if_none_match_returns_304(client):
+    seed()
+    
+    response = client.get("/products/")
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert response.headers["Cache-Control"] == "no-cache"
+    
+    not_modified = revalidate(client, "/products/", etag)
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["ETag"] == etag
+    assert revalidate(client, "/products/", 'W/"lain"').status_code == 200
+
+def test_commit_bumps_version_and_invalidates_etag(client):
+    headers, product_id = seed()
+    path = f"/products/{product_id}"
+    etag = client.get(path).headers["ETag"]
+    version = table_version("products")
+    
+    response = client.put(path, json={"price": 2000}, headers=headers["seller"])
+    assert response.status_code == 200
+    assert table_version("products") == version + 1
+    
+    fresh = revalidate(client, path, etag)
+    assert fresh.status_code == 200
+    assert fresh.json()["price"] == 2000
+    assert fresh.headers["ETag"] != etag
+
+def test_rollback_does_not_bump_version(client):
+    seed()
+    version = table_version("products")
+    
+    db = SessionLocal()
+    product = db.query(Product).first()
+    product.price = 5000
+    db.flush()
+    db.rollback()
+    db.close()
+    
+    assert table_version("products") == version
+
+def test_failed_order_does_not_bump_versions(client):
+    headers, product_id = seed()
+    versions = table_version("products"), table_version("orders")
+    etag = client.get("/products/").headers["ETag"]
+    
+    assert order(client, headers["buyer"], product_id, 3).status_code == 400
+    
+    assert (table_version("products"), table_version("orders")) == versions
+    assert revalidate(client, "/products/", etag).status_code == 304
+
+def test_core_update_from_reserve_stock_bumps_version(client):
+    headers, product_id = seed()
+    etag = client.get("/products/").headers["ETag"]
+    version = table_version("products")
+    
+    db = SessionLocal()
+    assert orders_routes.reserve_stock(db, {product_id: 1})
+    assert table_version("products") == version
+    db.commit()
+    db.close()
+    assert table_version("products") == version + 1
+    
+    # Checkout yang menghabiskan stock juga lewat reserve_stock
+    assert order(client, headers["buyer"], product_id, 1).status_code == 201
+    response = revalidate(client, "/products/", etag)
+    assert response.status_code == 200
+    assert response.json()[0]["stock"] == 0
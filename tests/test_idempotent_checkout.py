@@ -0,0 +1,116 @@
+"""
+Checkout dengan header Idempotency-Key: retry (berurutan maupun paralel)
+hanya membuat satu order dan mengurangi stock satu kali
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from backend.database import SessionLocal
+from backend.models.idempotency import IdempotencyKey
+from backend.models.order import Order
+from backend.models.product import Product
+from backend.models.user import User
+from backend.utils.security import create_access_token, get_password_hash
+
+def seed(stock=10):
+    db = SessionLocal()
+    hashed = get_password_hash("retry123")
+    seller = User(email="seller@retry.test", username="retryseller", hashed_password=hashed, is_seller=True)
+    buyer = User(email="buyer@retry.test", username="retrybuyer", hashed_password=hashed)
+    db.add_all([seller, buyer])
+    db.flush()
+    product = Product(name="Retry SKU", price=1000, stock=stock, category="Retry", seller_id=seller.id)
+    db.add(product)
+    db.commit()
+    
+    token = create_access_token(data={"sub": buyer.username, "user_id": buyer.id})
+    product_id = product.id
+    db.close()
+    return token, product_id
+
+def order_payload(product_id, quantity=2):
+    return {
+        "shipping_address": "Jl. Retry Test No. 1",
+        "items": [{"product_id": product_id, "quantity": quantity, "price": 1000}],
+    }
+
+def counts(product_id):
+    db = SessionLocal()
+    try:
+        return db.query(Order).count(), db.get(Product, product_id).stock
+    finally:
+        db.close()
+
+def test_retry_returns_stored_response(client):
+    token, product_id = seed()
+    headers = {"Authorization": f"Bearer {token}", "Idempotency-Key": "checkout-1"}
+    
+    first = client.post("/orders/", json=order_payload(product_id), headers=headers)
+    retry = client.post("/orders/", json=order_payload(product_id), headers=headers)
+    
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+    assert counts(product_id) == (1, 8)
+    
+    # Key baru = order baru
+    headers["Idempotency-Key"] = "checkout-2"
+    other = client.post("/orders/", json=order_payload(product_id), headers=headers)
+    assert other.status_code == 201
+    assert other.json()["id"] != first.json()["id"]
+    assert counts(product_id) == (2, 6)
+
+def test_key_reused_with_different_body(client):
+    token, product_id = seed()
+    headers = {"Authorization": f"Bearer {token}", "Idempotency-Key": "checkout-1"}
+    
+    assert client.post("/orders/", json=order_payload(product_id), headers=headers).status_code == 201
+    response = client.post("/orders/", json=order_payload(product_id, quantity=3), headers=headers)
+    assert response.status_code == 422
+    assert counts(product_id) == (1, 8)
+
+def test_failed_checkout_is_not_stored(client):
+    token, product_id = seed(stock=1)
+    headers = {"Authorization": f"Bearer {token}", "Idempotency-Key": "checkout-1"}
+    
+    assert client.post("/orders/", json=order_payload(product_id), headers=headers).status_code == 400
+    
+    db = SessionLocal()
+    db.query(Product).filter(Product.id == product_id).update({"stock": 5})
+    db.commit()
+    db.close()
+    
+    # Key yang sama boleh dipakai lagi setelah stock tersedia
+    assert client.post("/orders/", json=order_payload(product_id), headers=headers).status_code == 201
+    assert counts(product_id) == (1, 3)
+
+def test_expired_key_creates_new_order(client):
+    token, product_id = seed()
+    headers = {"Authorization": f"Bearer {token}", "Idempotency-Key": "checkout-1"}
+    
+    first = client.post("/orders/", json=order_payload(product_id), headers=headers)
+    
+    db = SessionLocal()
+    db.query(IdempotencyKey).update({"expires_at": datetime.utcnow() - timedelta(seconds=1)})
+    db.commit()
+    db.close()
+    
+    second = client.post("/orders/", json=order_payload(product_id), headers=headers)
+    assert second.status_code == 201
+    assert second.json()["id"] != first.json()["id"]
+    assert counts(product_id) == (2, 6)
+
+def test_parallel_retries_create_one_order(client):
+    token, product_id = seed()
+    headers = {"Authorization": f"Bearer {token}", "Idempotency-Key": "checkout-1"}
+    
+    def checkout(_):
+        return client.post("/orders/", json=order_payload(product_id), headers=headers)
+    
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        responses = list(pool.map(checkout, range(16)))
+    
+    assert {r.status_code for r in responses} == {201}
+    assert len({r.json()["id"] for r in responses}) == 1
+    assert counts(product_id) == (1, 8)
@@ -0,0 +1,69 @@
+"""
+GET /metrics (format Prometheus) dan GET /health (503 saat database
+tidak menjawab)
+"""
+import time
+
+import pytest
+
+import backend.main as main
+
+from backend.config import settings
+
+def metric_lines(client) -> list:
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    return response.text.splitlines()
+
+@pytest.mark.skipif(not settings.metrics, reason="METRICS=false")
+def test_metrics_exports_route_pool_cache_and_bcrypt_metrics(client):
+    client.get("/products/")
+    client.get("/products/999999")
+    client.get("/tidak-ada")
+    user = {"email": "metrics@test.com", "username": "metricsuser", "password": "rahasia123"}
+    client.post("/auth/register", json=user)
+    
+    lines = metric_lines(client)
+    
+    def has(prefix):
+        return any(line.startswith(prefix) for line in lines)
+    
+    # Label route memakai template, bukan path asli
+    assert has('http_requests_total{method="GET",route="/products/",status="200"}')
+    assert has('http_requests_total{method="GET",route="/products/{product_id}",status="404"}')
+    assert has('http_requests_total{method="GET",route="unmatched",status="404"}')
+    assert not has('http_requests_total{method="GET",route="/products/999999"')
+    assert has('http_request_duration_seconds_bucket{le="0.005",method="GET",route="/products/"}')
+    assert has("http_requests_in_flight")
+    assert has('db_pool_checked_out{pool="write"}')
+    assert has('cache_hits{cache="product_list"}')
+    assert has('cache_hit_ratio{cache="search"}')
+    assert has("password_hash_queue_depth")
+    assert has("password_hash_wait_seconds_count")
+    assert has("password_hash_duration_seconds_count")
+
+def test_health_ok(client):
+    response = client.get("/health")
+    assert response.status_code == 200
+    assert response.json() == {"status": "healthy", "database": "ok"}
+
+def test_health_returns_503_when_database_times_out(client, monkeypatch):
+    monkeypatch.setattr(settings, "health_db_timeout", 0.05)
+    monkeypatch.setattr(main, "_ping_database", lambda: time.sleep(0.5))
+    
+    started = time.perf_counter()
+    response = client.get("/health")
+    assert time.perf_counter() - started < 0.5
+    assert response.status_code == 503
+    assert response.json() == {"status": "unhealthy", "database": "timeout"}
+
+def test_health_returns_503_when_database_fails(client, monkeypatch):
+    def refuse():
+        raise ConnectionRefusedError()
+    
+    monkeypatch.setattr(main, "_ping_database", refuse)
+    
+    response = client.get("/health")
+    assert response.status_code == 503
+    assert response.json() == {"status": "unhealthy", "database": "ConnectionRefusedError"}
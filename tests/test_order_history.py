@@ -0,0 +1,52 @@
+"""
+Riwayat order tanpa cursor tetap dibatasi `limit` (default 20), dan
+cursor menjangkau semua order
+"""
+from datetime import datetime, timedelta
+
+from backend.database import SessionLocal
+from backend.models.order import Order
+from backend.models.user import User
+from backend.utils.security import create_access_token
+
+N_ORDERS = 45
+
+def seed():
+    db = SessionLocal()
+    user = User(email="buyer@history.test", username="historybuyer", hashed_password="x")
+    db.add(user)
+    db.flush()
+    start = datetime(2025, 1, 1)
+    db.execute(Order.__table__.insert(), [
+        {"buyer_id": user.id, "total_amount": 1000, "status": "pending",
+         "shipping_address": "Jl. History No. 1", "created_at": start + timedelta(minutes=i)}
+        for i in range(N_ORDERS)
+    ])
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': user.username})}"}
+    db.close()
+    return headers
+
+def test_history_without_cursor_is_bounded(client):
+    headers = seed()
+    
+    for url in ("/orders/", "/orders/extended/all"):
+        orders = client.get(url, headers=headers).json()
+        assert len(orders) == 20
+        assert orders[0]["created_at"] > orders[-1]["created_at"]
+        assert len(client.get(url, params={"limit": 5}, headers=headers).json()) == 5
+        assert len(client.get(url, params={"limit": 10_000}, headers=headers).json()) == N_ORDERS
+
+def test_cursor_pages_cover_all_orders(client):
+    headers = seed()
+    
+    seen = []
+    cursor = ""
+    while cursor is not None:
+        page = client.get(
+            "/orders/extended/all", params={"cursor": cursor, "limit": 10}, headers=headers
+        ).json()
+        seen += [order["id"] for order in page["items"]]
+        cursor = page["next_cursor"]
+    
+    assert len(seen) == len(set(seen)) == N_ORDERS
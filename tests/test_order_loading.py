@@ -0,0 +1,147 @@
+"""
+Regression test loader strategy di routes/orders.py
+
+Per endpoint dihitung jumlah query SQL dan perkiraan bytes yang di-load
+ke object ORM (jumlah panjang nilai kolom). Eager join lama membawa
+seluruh baris product termasuk description untuk setiap load Order.
+
+Yang dihitung hanya query route handler: dependency auth di-override
+dengan principal buyer, jadi hasilnya sama untuk AUTH_PRINCIPAL_TTL=0
+maupun DB_ASYNC=true (engine async ikut di-probe).
+"""
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from backend.database import Base, SessionLocal, async_engine, engine, read_engine
+from backend.main import app
+from backend.models.product import Product
+from backend.models.user import User
+from backend.utils.dependencies import get_current_user, get_current_user_async
+from backend.utils.security import create_access_token, get_password_hash
+
+DESCRIPTION = "x" * 4000
+N_ORDERS = 5
+ITEMS_PER_ORDER = 4
+
+class Probe:
+    def __init__(self):
+        self.queries = 0
+        self.bytes = 0
+        self.loaded = {}
+
+@contextmanager
+def probe():
+    result = Probe()
+    
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        result.queries += 1
+    
+    def on_load(target, context):
+        name = type(target).__name__
+        result.loaded[name] = result.loaded.get(name, 0) + 1
+        for key, value in vars(target).items():
+            if not key.startswith("_") and not isinstance(value, (list, Base)):
+                result.bytes += len(str(value))
+    
+    engines = {engine, read_engine}
+    if async_engine is not None:
+        engines.add(async_engine.sync_engine)
+    for e in engines:
+        event.listen(e, "before_cursor_execute", on_execute)
+    event.listen(Base, "load", on_load, propagate=True)
+    try:
+        yield result
+    finally:
+        for e in engines:
+            event.remove(e, "before_cursor_execute", on_execute)
+        event.remove(Base, "load", on_load)
+
+@pytest.fixture
+def buyer(client):
+    db = SessionLocal()
+    hashed = get_password_hash("loading123")
+    seller = User(email="seller@loading.test", username="loadingseller", hashed_password=hashed, is_seller=True)
+    user = User(email="buyer@loading.test", username="loadingbuyer", hashed_password=hashed)
+    db.add_all([seller, user])
+    db.flush()
+    products = [
+        Product(name=f"Produk {i}", description=DESCRIPTION, price=1000, stock=1000,
+                category="Loading", seller_id=seller.id)
+        for i in range(ITEMS_PER_ORDER)
+    ]
+    db.add_all(products)
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': user.username})}"}
+    
+    order_ids = []
+    for _ in range(N_ORDERS):
+        response = client.post("/orders/", headers=headers, json={
+            "shipping_address": "Jl. Loader Test No. 1",
+            "items": [{"product_id": p.id, "quantity": 1, "price": 1000} for p in products],
+        })
+        assert response.status_code == 201, response.text
+        order_ids.append(response.json()["id"])
+    user_id = user.id
+    db.close()
+    
+    # Principal tetap tanpa query, supaya probe hanya melihat query route
+    def principal():
+        return User(id=user_id, username="loadingbuyer", is_active=True, is_seller=False)
+    
+    async def principal_async():
+        return principal()
+    
+    app.dependency_overrides[get_current_user] = principal
+    app.dependency_overrides[get_current_user_async] = principal_async
+    yield headers, order_ids
+    app.dependency_overrides.pop(get_current_user, None)
+    app.dependency_overrides.pop(get_current_user_async, None)
+
+def request(client, method, url, headers, **kwargs):
+    with probe() as result:
+        response = client.request(method, url, headers=headers, **kwargs)
+    assert response.status_code == 200, response.text
+    return response, result
+
+def test_order_list_loads_items_without_products(client, buyer):
+    headers, _ = buyer
+    response, result = request(client, "GET", "/orders/", headers)
+    
+    assert len(response.json()) == N_ORDERS
+    assert "Product" not in result.loaded
+    assert result.bytes < 2000
+    assert result.queries == 2  # orders + items (selectin)
+
+def test_order_detail_loads_items_without_products(client, buyer):
+    headers, order_ids = buyer
+    response, result = request(client, "GET", f"/orders/{order_ids[0]}", headers)
+    
+    assert len(response.json()["items"]) == ITEMS_PER_ORDER
+    assert "Product" not in result.loaded
+    assert result.bytes < 500
+    assert result.queries == 2
+
+def test_extended_orders_load_only_needed_product_columns(client, buyer):
+    headers, _ = buyer
+    response, result = request(client, "GET", "/orders/extended/all", headers)
+    
+    items = [item for order in response.json() for item in order["items"]]
+    assert len(items) == N_ORDERS * ITEMS_PER_ORDER
+    assert items[0]["product"]["name"].startswith("Produk")
+    assert result.loaded["Product"] == ITEMS_PER_ORDER
+    assert result.bytes < len(DESCRIPTION)
+    assert result.queries == 3  # orders + items + products
+
+def test_pay_order_loads_no_relationships(client, buyer):
+    headers, order_ids = buyer
+    response, result = request(
+        client, "POST", f"/orders/{order_ids[0]}/pay", headers,
+        json={"payment_method": "transfer"},
+    )
+    
+    assert response.json()["status"] == "paid"
+    assert result.loaded == {"Order": 1}
+    assert result.bytes < 200
+    assert result.queries <= 4  # select + update status + items + rollup upsert
@@ -0,0 +1,56 @@
+"""
+Pool bcrypt: 503 + Retry-After saat antrian penuh, dan waktu antri /
+waktu hash tercatat di histogram Prometheus
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from prometheus_client import REGISTRY
+
+from backend.config import settings
+from backend.utils.password_pool import PasswordPool, password_pool
+
+USER = {"email": "pool@test.com", "username": "pooluser", "password": "rahasia123"}
+
+def sample(name: str) -> float:
+    return REGISTRY.get_sample_value(name) or 0.0
+
+@pytest.mark.skipif(password_pool.executor_type == "inline", reason="PASSWORD_HASH_EXECUTOR=inline tidak punya antrian")
+def test_full_queue_returns_503_with_retry_after(client):
+    assert client.post("/auth/register", json=USER).status_code == 201
+    login = {"username": USER["username"], "password": USER["password"]}
+    register = {**USER, "username": "pooluser2", "email": "pool2@test.com"}
+    
+    # Semua slot (worker + antrian) dipakai request lain
+    slots = password_pool.workers + password_pool.max_queue
+    for _ in range(slots):
+        password_pool._admit()
+    try:
+        rejected = password_pool.rejected
+        for path, body in (("/auth/login", login), ("/auth/register", register)):
+            response = client.post(path, json=body)
+            assert response.status_code == 503
+            assert response.headers["Retry-After"] == str(settings.password_hash_retry_after)
+        assert password_pool.rejected == rejected + 2
+    finally:
+        for _ in range(slots):
+            password_pool._release()
+    
+    assert client.post("/auth/login", json=login).status_code == 200
+
+def test_wait_and_hash_time_are_observed():
+    pool = PasswordPool(executor="thread", workers=1, max_queue=8)
+    waits = sample("password_hash_wait_seconds_count")
+    hashes = sample("password_hash_duration_seconds_count")
+    hash_seconds = sample("password_hash_duration_seconds_sum")
+    wait_seconds = sample("password_hash_wait_seconds_sum")
+    
+    # 4 pekerjaan 50 ms di 1 worker: yang terakhir antri sekitar 150 ms
+    with ThreadPoolExecutor(max_workers=4) as callers:
+        list(callers.map(lambda _: pool.run(time.sleep, 0.05), range(4)))
+    
+    assert sample("password_hash_wait_seconds_count") == waits + 4
+    assert sample("password_hash_duration_seconds_count") == hashes + 4
+    assert sample("password_hash_duration_seconds_sum") - hash_seconds >= 0.2
+    assert sample("password_hash_wait_seconds_sum") - wait_seconds >= 0.2
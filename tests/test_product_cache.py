@@ -0,0 +1,68 @@
+"""
+Cache listing / detail product: key tidak bisa dibanjiri lewat limit / skip,
+hasil query yang kalah cepat dari invalidasi tidak ikut di-cache, dan entry
+tidak hidup melewati bucket ETag
+"""
+import time
+
+from backend.config import settings
+from backend.database import SessionLocal, engine
+from backend.models.product import Product
+from backend.models.user import User
+from backend.utils.cache import TTLCache, product_list_cache
+
+def seed(n=150):
+    db = SessionLocal()
+    seller = User(email="seller@cache.test", username="cacheseller", hashed_password="x", is_seller=True)
+    db.add(seller)
+    db.flush()
+    db.execute(Product.__table__.insert(), [
+        {"name": f"Produk {i}", "description": "-", "price": 1000, "stock": 1,
+         "category": "Cache", "seller_id": seller.id}
+        for i in range(n)
+    ])
+    db.commit()
+    db.close()
+
+def test_limit_is_clamped_before_caching(client):
+    seed()
+    
+    for limit in (100, 101, 500, 10_000):
+        assert len(client.get("/products/", params={"limit": limit}).json()) == 100
+    # Semua limit > 100 memakai satu key yang sama
+    assert product_list_cache.stats()["size"] == 1
+    
+    client.get("/products/", params={"skip": 5000})
+    assert product_list_cache.stats()["size"] == 1
+
+def test_set_skipped_after_concurrent_invalidation():
+    cache = TTLCache()
+    generation = cache.generation
+    # Write lain meng-invalidasi cache selagi query berjalan
+    cache.delete("listing")
+    cache.set("listing", "hasil lama", generation=generation)
+    assert cache.get("listing") is None
+    
+    cache.set("listing", "hasil baru", generation=cache.generation)
+    assert cache.get("listing") == "hasil baru"
+
+def test_cached_detail_expires_with_etag_bucket(client, monkeypatch):
+    monkeypatch.setattr(settings, "etag_ttl", 1)
+    seed(1)
+    db = SessionLocal()
+    product_id = db.query(Product.id).scalar()
+    db.close()
+    
+    first = client.get(f"/products/{product_id}")
+    assert first.json()["stock"] == 1
+    
+    # Write dari worker lain: tidak lewat Session, jadi cache dan versi
+    # ETag di proses ini tidak tahu
+    with engine.begin() as conn:
+        conn.execute(Product.__table__.update().values(stock=7))
+    
+    time.sleep(settings.etag_ttl - time.time() % settings.etag_ttl + 0.05)
+    second = client.get(f"/products/{product_id}")
+    assert second.headers["etag"] != first.headers["etag"]
+    # ETag baru tidak boleh menempel di payload lama dari cache
+    assert second.json()["stock"] == 7
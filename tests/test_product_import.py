@@ -0,0 +1,164 @@
+"""
+POST /products/bulk: row yang tidak valid dilewati dan dilaporkan, row
+yang valid ter-commit per batch, dan products_fts / product_categories
+ikut ter-update (item import bisa dicari dan terhitung di kategori)
+"""
+import json
+
+import pytest
+
+import backend.utils.product_import as product_import
+
+from backend.config import settings
+from backend.database import SessionLocal
+from backend.models.product import Product
+from backend.models.user import User
+from backend.utils.security import create_access_token
+
+CSV_HEADER = "name,description,price,stock,category\n"
+
+def seller_headers():
+    db = SessionLocal()
+    seller = User(email="seller@import.test", username="importseller", hashed_password="x", is_seller=True)
+    db.add(seller)
+    db.commit()
+    db.close()
+    return {"Authorization": f"Bearer {create_access_token(data={'sub': 'importseller'})}"}
+
+def upload(client, headers, filename, content, **params):
+    if isinstance(content, str):
+        content = content.encode()
+    return client.post(
+        "/products/bulk",
+        headers=headers,
+        params=params,
+        files={"file": (filename, content, "application/octet-stream")},
+    )
+
+def product_names() -> set:
+    db = SessionLocal()
+    try:
+        return {name for (name,) in db.query(Product.name)}
+    finally:
+        db.close()
+
+@pytest.fixture
+def batches(monkeypatch):
+    """Catat ukuran setiap batch yang di-insert"""
+    sizes = []
+    insert_batch = product_import.insert_batch
+    
+    def recording_insert_batch(db, seller_id, batch):
+        sizes.append(len(batch))
+        insert_batch(db, seller_id, batch)
+    
+    monkeypatch.setattr(product_import, "insert_batch", recording_insert_batch)
+    return sizes
+
+def test_csv_bad_rows_are_reported_and_good_rows_committed(client):
+    headers = seller_headers()
+    content = CSV_HEADER + (
+        "Kopi Arabika,Biji kopi,50000,10,Makanan\n"    # baris 2
+        ",Tanpa nama,1000,1,Makanan\n"                 # baris 3: name kosong
+        "Teh Hijau,Daun teh,-5,1,Makanan\n"            # baris 4: harga negatif
+        "Gula Aren,,abc,1,Makanan\n"                   # baris 5: harga bukan angka
+        "Madu Hutan,Madu murni,75000,0,Makanan\n"      # baris 6
+    )
+    
+    response = upload(client, headers, "produk.csv", content)
+    assert response.status_code == 200
+    report = response.json()
+    
+    assert report["imported"] == 2
+    assert report["failed"] == 3
+    assert [e["row"] for e in report["errors"]] == [3, 4, 5]
+    assert "name" in report["errors"][0]["error"]
+    assert "Harga harus lebih dari 0" in report["errors"][1]["error"]
+    assert "price" in report["errors"][2]["error"]
+    assert report["errors_truncated"] is False
+    assert product_names() == {"Kopi Arabika", "Madu Hutan"}
+
+def test_jsonl_bad_lines_are_reported(client):
+    headers = seller_headers()
+    lines = [
+        json.dumps({"name": "Sabun Cair", "price": 15000, "stock": 3}),
+        "{bukan json",
+        json.dumps(["bukan", "object"]),
+        "",
+        json.dumps({"name": "Sampo", "price": 0}),
+        json.dumps({"name": "Sikat Gigi", "price": 8000}),
+    ]
+    
+    response = upload(client, headers, "produk.jsonl", "\n".join(lines))
+    report = response.json()
+    
+    assert report["imported"] == 2
+    assert report["errors"] == [
+        {"row": 2, "error": "JSON tidak valid"},
+        {"row": 3, "error": "Baris harus berupa object JSON"},
+        {"row": 5, "error": report["errors"][2]["error"]},
+    ]
+    assert "Harga harus lebih dari 0" in report["errors"][2]["error"]
+    assert product_names() == {"Sabun Cair", "Sikat Gigi"}
+
+def test_error_report_is_truncated(client, monkeypatch):
+    monkeypatch.setattr(settings, "bulk_import_max_errors", 2)
+    headers = seller_headers()
+    content = CSV_HEADER + ",x,1,1,A\n" * 5 + "Valid,x,1,1,A\n"
+    
+    report = upload(client, headers, "produk.csv", content).json()
+    assert (report["imported"], report["failed"], len(report["errors"])) == (1, 5, 2)
+    assert report["errors_truncated"] is True
+
+@pytest.mark.parametrize("good_rows,expected", [(7, [3, 3, 1]), (6, [3, 3]), (2, [2])])
+def test_rows_are_inserted_per_batch(client, batches, good_rows, expected):
+    headers = seller_headers()
+    # Row invalid di sela-sela tidak ikut dihitung ke ukuran batch
+    rows = []
+    for i in range(good_rows):
+        rows.append(f"Barang {i},x,1000,1,Batch\n")
+        rows.append(",invalid,1000,1,Batch\n")
+    
+    report = upload(client, headers, "produk.csv", CSV_HEADER + "".join(rows), batch_size=3).json()
+    
+    assert report["imported"] == good_rows
+    assert batches == expected
+    assert len(product_names()) == good_rows
+
+def test_unreadable_file_keeps_committed_batches(client, batches):
+    headers = seller_headers()
+    good = "".join(f"Barang {i},x,1000,1,Batch\n" for i in range(3000))
+    # Byte UTF-8 rusak jauh di tengah file (file dibaca per chunk)
+    content = (CSV_HEADER + good).encode() + b"Rusak \xff\xfe,x,1000,1,Batch\n"
+    
+    response = upload(client, headers, "produk.csv", content, batch_size=1000)
+    assert response.status_code == 400
+    assert "File tidak bisa dibaca" in response.json()["detail"]
+    # Batch yang sudah ter-commit sebelum error tetap ada
+    assert batches and all(size == 1000 for size in batches)
+    assert len(product_names()) == sum(batches)
+
+def test_imported_products_are_searchable_and_counted(client):
+    headers = seller_headers()
+    # Cache search / kategori sudah terisi sebelum import
+    assert client.get("/products/search", params={"q": "durian"}).json()["items"] == []
+    assert client.get("/products/categories").json() == []
+    
+    content = CSV_HEADER + (
+        "Durian Montong,Buah segar,150000,4,Buah\n"
+        "Durian Musang King,Buah premium,300000,0,Buah\n"
+        "Pisau Buah,Untuk durian,25000,10,Dapur\n"
+    )
+    report = upload(client, headers, "produk.csv", content, batch_size=2).json()
+    assert report["imported"] == 3
+    
+    items = client.get("/products/search", params={"q": "durian"}).json()["items"]
+    # Match di name lebih dulu, lalu match di description
+    assert items[2]["name"] == "Pisau Buah"
+    assert {item["name"] for item in items[:2]} == {"Durian Montong", "Durian Musang King"}
+    
+    categories = {c["category"]: c for c in client.get("/products/categories").json()}
+    assert categories["Buah"]["product_count"] == 2
+    assert categories["Buah"]["in_stock_count"] == 1
+    assert categories["Dapur"]["product_count"] == 1
+    assert categories["Dapur"]["in_stock_count"] == 1
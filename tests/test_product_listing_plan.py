@@ -0,0 +1,57 @@
+"""
+Regression test index untuk listing product (routes/products.py)
+
+Setiap kombinasi filter dan sort yang didukung GET /products/ di-EXPLAIN.
+Test gagal kalau SQLite memilih full table scan, atau kalau urutan yang
+seharusnya bisa diambil dari index malah di-sort ulang (temp b-tree).
+"""
+import itertools
+
+import pytest
+from sqlalchemy import text
+
+from backend.database import SessionLocal, engine
+from backend.models.product import Product
+from backend.routes.products import PRODUCT_SORTS, product_listing
+
+pytestmark = pytest.mark.skipif(
+    engine.dialect.name != "sqlite",
+    reason="EXPLAIN QUERY PLAN hanya ada di SQLite"
+)
+
+COMBINATIONS = list(itertools.product(
+    PRODUCT_SORTS,
+    [None, "elektronik"],   # category
+    [None, 1],              # seller_id
+    [None, 10000.0],        # min_price
+    [None, 500000.0],       # max_price
+    [False, True],          # in_stock_only
+))
+
+def query_plan(db, query):
+    sql = str(query.statement.compile(engine, compile_kwargs={"literal_binds": True}))
+    return [row[3] for row in db.execute(text("EXPLAIN QUERY PLAN " + sql))]
+
+@pytest.mark.parametrize("sort,category,seller_id,min_price,max_price,in_stock_only", COMBINATIONS)
+def test_listing_uses_index(db_reset, sort, category, seller_id, min_price, max_price, in_stock_only):
+    db = SessionLocal()
+    try:
+        query = product_listing(
+            db.query(Product), sort,
+            category=category,
+            min_price=min_price,
+            max_price=max_price,
+            in_stock_only=in_stock_only,
+            seller_id=seller_id
+        ).limit(21)
+        plan = query_plan(db, query)
+    finally:
+        db.close()
+    
+    full_scans = [step for step in plan if step.startswith("SCAN products") and "INDEX" not in step]
+    assert not full_scans, plan
+    
+    # newest + range harga: index harga yang dipilih, jadi sort ulang hasil range-nya wajar
+    price_range = min_price is not None or max_price is not None
+    if sort != "newest" or not price_range:
+        assert not any("TEMP B-TREE" in step for step in plan), plan
@@ -0,0 +1,122 @@
+"""
+GET /products/?cursor=: keyset pagination untuk setiap sort di
+PRODUCT_SORTS, dengan banyak nilai kembar di kolom sort, tidak
+menghasilkan duplikat atau row yang terlewat; cursor hanya berlaku untuk
+sort dan filter asalnya
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.database import SessionLocal
+from backend.models.product import Product
+from backend.models.user import User
+
+N_PRODUCTS = 57
+PAGE_SIZE = 4
+
+# (key sort, descending) sesuai PRODUCT_SORTS
+ORDERINGS = {
+    "newest": (lambda p: (p["created_at"], p["id"]), True),
+    "price_asc": (lambda p: (p["price"], p["id"]), False),
+    "price_desc": (lambda p: (p["price"], p["id"]), True),
+}
+
+def seed():
+    db = SessionLocal()
+    sellers = [
+        User(email=f"seller{i}@page.test", username=f"pageseller{i}", hashed_password="x", is_seller=True)
+        for i in range(2)
+    ]
+    db.add_all(sellers)
+    db.flush()
+    
+    start = datetime(2025, 1, 1)
+    # Hanya 5 harga dan 4 timestamp berbeda: setiap halaman memotong
+    # di tengah kelompok nilai kembar
+    db.execute(Product.__table__.insert(), [
+        {"name": f"Produk {i}", "description": "-", "price": float(1000 * (i % 5 + 1)),
+         "stock": i % 3, "category": "Genap" if i % 2 == 0 else "Ganjil",
+         "seller_id": sellers[i % 2].id, "created_at": start + timedelta(hours=i % 4)}
+        for i in range(N_PRODUCTS)
+    ])
+    db.commit()
+    rows = [
+        {"id": p.id, "price": p.price, "created_at": p.created_at, "stock": p.stock,
+         "category": p.category, "seller_id": p.seller_id}
+        for p in db.query(Product).all()
+    ]
+    db.close()
+    return rows
+
+def fetch_all(client, **params):
+    ids = []
+    cursor = ""
+    while cursor is not None:
+        response = client.get("/products/", params={**params, "cursor": cursor, "limit": PAGE_SIZE})
+        assert response.status_code == 200, response.text
+        page = response.json()
+        assert len(page["items"]) <= PAGE_SIZE
+        ids += [item["id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+    return ids
+
+FILTERS = [
+    {},
+    {"category": "Genap"},
+    {"in_stock_only": True, "min_price": 2000, "max_price": 4000},
+]
+
+@pytest.mark.parametrize("sort", list(ORDERINGS))
+@pytest.mark.parametrize("filters", FILTERS)
+def test_cursor_pages_have_no_duplicates_or_gaps(client, sort, filters):
+    rows = seed()
+    
+    def included(row):
+        return (
+            row["category"] == filters.get("category", row["category"])
+            and (row["stock"] > 0 or not filters.get("in_stock_only"))
+            and filters.get("min_price", 0) <= row["price"] <= filters.get("max_price", float("inf"))
+        )
+    
+    key, descending = ORDERINGS[sort]
+    expected = [row["id"] for row in sorted(filter(included, rows), key=key, reverse=descending)]
+    
+    ids = fetch_all(client, sort=sort, **filters)
+    assert len(ids) == len(set(ids))
+    assert ids == expected
+
+def test_cursor_filtered_by_seller(client):
+    rows = seed()
+    seller_id = rows[0]["seller_id"]
+    
+    ids = fetch_all(client, sort="price_asc", seller_id=seller_id)
+    assert sorted(ids) == sorted(row["id"] for row in rows if row["seller_id"] == seller_id)
+
+def first_cursor(client, **params):
+    page = client.get("/products/", params={**params, "cursor": "", "limit": PAGE_SIZE}).json()
+    return page["next_cursor"]
+
+@pytest.mark.parametrize("changed", [
+    {"sort": "price_desc"},
+    {"category": "Genap"},
+    {"min_price": 2000},
+    {"max_price": 4000},
+    {"in_stock_only": True},
+    {"seller_id": 1},
+])
+def test_cursor_reused_with_other_sort_or_filter_is_rejected(client, changed):
+    seed()
+    original = {"sort": "price_asc"}
+    cursor = first_cursor(client, **original)
+    
+    response = client.get("/products/", params={**original, **changed, "cursor": cursor})
+    assert response.status_code == 400
+    assert "Cursor tidak cocok" in response.json()["detail"]
+    
+    # Dengan sort / filter yang sama cursor tetap berlaku
+    assert client.get("/products/", params={**original, "cursor": cursor}).status_code == 200
+
+def test_broken_cursor_is_rejected(client):
+    seed()
+    assert client.get("/products/", params={"cursor": "bukan-cursor"}).status_code == 400
@@ -0,0 +1,49 @@
+"""
+QUERY_STATS: statement yang gagal tidak meninggalkan state di koneksi dan
+tidak mengacaukan waktu statement berikutnya, dan QueryStatsMiddleware
+membungkus semua middleware lain
+"""
+import time
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import OperationalError
+
+from backend.config import settings
+from backend.utils.query_stats import QueryStats, QueryStatsMiddleware, _current, instrument_engine
+
+def test_failed_statement_does_not_shift_timings():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    
+    @event.listens_for(engine, "before_cursor_execute")
+    def slow_select(conn, cursor, statement, parameters, context, executemany):
+        if "slow" in statement:
+            time.sleep(0.05)
+    
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        with engine.connect() as conn:
+            for _ in range(100):
+                with pytest.raises(OperationalError):
+                    conn.execute(text("SELECT * FROM tabel_tidak_ada"))
+            time.sleep(0.2)
+            conn.execute(text("SELECT 1 AS slow"))
+            conn.execute(text("SELECT 2"))
+            # Koneksi pool hidup lama: tidak boleh ada sisa waktu mulai yang menumpuk
+            assert not any(conn.info.values())
+    finally:
+        _current.reset(token)
+    
+    assert stats.count == 2
+    assert 0.05 <= stats.slowest < 0.2
+    assert stats.total < 0.2
+    assert stats.slowest_statement == "SELECT 1 AS slow"
+
+@pytest.mark.skipif(not settings.query_stats, reason="QUERY_STATS=false")
+def test_middleware_is_outermost():
+    from backend.main import app
+    
+    # user_middleware[0] = middleware terluar (add_middleware menyisipkan di depan)
+    assert app.user_middleware[0].cls is QueryStatsMiddleware
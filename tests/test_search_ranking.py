@@ -0,0 +1,105 @@
+"""
+GET /products/search: match di name diranking lebih dulu berapa pun
+umurnya, hasil dibatasi SEARCH_CANDIDATE_LIMIT, dan cache search dibuang
+saat product berubah
+"""
+from backend.database import SessionLocal
+from backend.models.product import Product
+from backend.models.user import User
+from backend.utils.search import SEARCH_CANDIDATE_LIMIT, build_match_query, build_tsquery, rebuild_search_index
+from backend.utils.security import create_access_token
+
+N_NEWER = 1500
+
+def seed():
+    db = SessionLocal()
+    seller = User(email="seller@search.test", username="searchseller", hashed_password="x", is_seller=True)
+    db.add(seller)
+    db.flush()
+    
+    # Product paling relevan dibuat paling dulu (rowid terkecil)
+    rows = [{"name": "iphone", "description": "Original", "price": 1000, "stock": 1,
+             "category": "HP", "seller_id": seller.id}]
+    rows += [
+        {"name": f"Casing silikon {i}", "description": "Cocok untuk iphone",
+         "price": 1000, "stock": 1, "category": "Aksesoris", "seller_id": seller.id}
+        for i in range(N_NEWER)
+    ]
+    db.execute(Product.__table__.insert(), rows)
+    db.commit()
+    rebuild_search_index(db)
+    exact_id = db.query(Product.id).filter(Product.name == "iphone").scalar()
+    db.close()
+    return exact_id
+
+def search_all(client, q):
+    seen = []
+    cursor = None
+    while True:
+        params = {"q": q, "limit": 100}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/products/search", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        seen += [item["id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            return seen
+
+def test_best_match_ranks_first_regardless_of_age(client):
+    exact_id = seed()
+    
+    response = client.get("/products/search", params={"q": "iphone", "limit": 5})
+    assert response.status_code == 200
+    assert response.json()["items"][0]["id"] == exact_id
+
+def test_cursor_pages_through_capped_results(client):
+    exact_id = seed()
+    
+    seen = search_all(client, "iphone")
+    assert len(seen) == len(set(seen)) == SEARCH_CANDIDATE_LIMIT
+    assert seen[0] == exact_id
+    # Match di description diurutkan terbaru dulu
+    assert seen[1:] == sorted(seen[1:], reverse=True)
+
+def test_name_matches_rank_before_description_matches(client):
+    seed()
+    db = SessionLocal()
+    names = {"Iphone 15 Pro Max", "Charger iphone original"}
+    db.execute(Product.__table__.insert(), [
+        {"name": name, "description": "", "price": 1000, "stock": 1, "category": "HP", "seller_id": 1}
+        for name in names
+    ])
+    db.commit()
+    rebuild_search_index(db)
+    db.close()
+    
+    items = client.get("/products/search", params={"q": "iphone", "limit": 5}).json()["items"]
+    assert items[0]["name"] == "iphone"
+    assert {item["name"] for item in items[1:3]} == names
+    assert all(item["name"].startswith("Casing") for item in items[3:])
+
+def test_search_cache_is_dropped_on_product_update(client):
+    exact_id = seed()
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': 'searchseller'})}"}
+    
+    assert client.get("/products/search", params={"q": "iphone", "limit": 1}).json()["items"][0]["id"] == exact_id
+    response = client.put(f"/products/{exact_id}", json={"name": "Samsung"}, headers=headers)
+    assert response.status_code == 200
+    
+    items = client.get("/products/search", params={"q": "iphone", "limit": 1}).json()["items"]
+    assert items[0]["id"] != exact_id
+    assert client.get("/products/search", params={"q": "samsung"}).json()["items"][0]["id"] == exact_id
+
+def test_cursor_from_other_sort_is_rejected(client):
+    seed()
+    response = client.get("/products/search", params={"q": "iphone", "cursor": "eyJzIjoibmV3ZXN0IiwidiI6WzEsMl19"})
+    assert response.status_code == 400
+
+def test_query_terms_are_bounded():
+    assert build_match_query("a b c d e f g") == '"a" "b" "c" "d" "e"'
+    # Prefix satu huruf tidak di-expand
+    assert build_match_query("iphone c") == '"iphone" "c"'
+    assert build_match_query("iphone ca") == '"iphone" "ca"*'
+    assert build_tsquery("iphone ca", "A") == "iphone:A & ca:*A"
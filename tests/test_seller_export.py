@@ -0,0 +1,191 @@
+"""
+Isi export GET /seller/export/orders dan /seller/export/products: header,
+urutan baris, filter, hanya data milik seller, dan query export order yang
+di-stream tanpa sort penuh (SQLite)
+"""
+import csv
+import io
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+
+from backend.database import SessionLocal, engine
+from backend.models.order import Order, OrderItem
+from backend.models.product import Product
+from backend.models.user import User
+from backend.routes.seller import orders_export_statement
+from backend.utils.security import create_access_token
+
+ORDER_COLUMNS = [
+    "order_id", "created_at", "status", "product_id", "product_name",
+    "quantity", "price", "subtotal", "shipping_address",
+]
+PRODUCT_COLUMNS = [
+    "id", "name", "description", "price", "stock", "category", "image_url", "created_at",
+]
+
+def seed():
+    """
+    Seller A punya 3 product (dibuat berurutan), seller B 1 product. Order
+    sengaja dibuat dengan id yang tidak searah dengan created_at product
+    """
+    db = SessionLocal()
+    seller = User(email="seller@export.test", username="exportseller", hashed_password="x", is_seller=True)
+    other = User(email="other@export.test", username="exportother", hashed_password="x", is_seller=True)
+    buyer = User(email="buyer@export.test", username="exportbuyer", hashed_password="x")
+    db.add_all([seller, other, buyer])
+    db.flush()
+    
+    products = [
+        Product(name="Kopi", price=20000, stock=5, category="Minuman", seller_id=seller.id,
+                created_at=datetime(2025, 1, 1)),
+        Product(name="Teh", price=10000, stock=0, category="Minuman", seller_id=seller.id,
+                created_at=datetime(2025, 2, 1)),
+        Product(name="Gula", price=15000, stock=3, category="Dapur", seller_id=seller.id,
+                created_at=datetime(2025, 3, 1)),
+        Product(name="Milik seller lain", price=5000, stock=9, category="Dapur", seller_id=other.id,
+                created_at=datetime(2025, 1, 15)),
+    ]
+    db.add_all(products)
+    db.flush()
+    kopi, teh, gula, foreign = products
+    
+    # (created_at, status, [(product, quantity)])
+    specs = [
+        (datetime(2025, 4, 1, 10), "paid", [(teh, 1), (kopi, 2), (foreign, 1)]),
+        (datetime(2025, 4, 2, 10), "pending", [(kopi, 1)]),
+        (datetime(2025, 4, 3, 23, 59), "paid", [(gula, 4), (teh, 3)]),
+        (datetime(2025, 4, 4, 0, 0), "cancelled", [(foreign, 2)]),
+    ]
+    orders = []
+    for created_at, order_status, lines in specs:
+        order = Order(
+            buyer_id=buyer.id, total_amount=sum(p.price * q for p, q in lines),
+            status=order_status, shipping_address="Jl. Export 1, Bandung", created_at=created_at
+        )
+        order.items = [OrderItem(product_id=p.id, quantity=q, price=p.price) for p, q in lines]
+        orders.append(order)
+    db.add_all(orders)
+    db.commit()
+    
+    ids = {"products": [p.id for p in products], "orders": [o.id for o in orders]}
+    db.close()
+    return {"Authorization": f"Bearer {create_access_token(data={'sub': 'exportseller'})}"}, ids
+
+def export(client, headers, path, **params):
+    response = client.get(f"/seller/export/{path}", headers=headers, params=params)
+    assert response.status_code == 200, response.text
+    return response
+
+def csv_rows(response) -> list:
+    return list(csv.reader(io.StringIO(response.text)))
+
+def test_orders_csv_lists_only_seller_items_grouped_by_product(client):
+    headers, ids = seed()
+    kopi, teh, gula, _ = ids["products"]
+    o1, o2, o3, _ = ids["orders"]
+    
+    response = export(client, headers, "orders")
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"].startswith('attachment; filename="orders-')
+    
+    rows = csv_rows(response)
+    assert rows[0] == ORDER_COLUMNS
+    # Urut product (created_at, id), lalu order id; item seller lain tidak ikut
+    assert [(int(r[3]), int(r[0])) for r in rows[1:]] == [
+        (kopi, o1), (kopi, o2), (teh, o1), (teh, o3), (gula, o3),
+    ]
+    
+    first = dict(zip(ORDER_COLUMNS, rows[1]))
+    assert first["created_at"] == "2025-04-01T10:00:00"
+    assert first["status"] == "paid"
+    assert first["product_name"] == "Kopi"
+    assert (first["quantity"], float(first["price"]), float(first["subtotal"])) == ("2", 20000.0, 40000.0)
+    assert first["shipping_address"] == "Jl. Export 1, Bandung"
+
+def test_orders_jsonl(client):
+    headers, ids = seed()
+    kopi, teh, gula, _ = ids["products"]
+    o1, o2, o3, _ = ids["orders"]
+    
+    response = export(client, headers, "orders", format="jsonl")
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [(line["product_id"], line["order_id"]) for line in lines] == [
+        (kopi, o1), (kopi, o2), (teh, o1), (teh, o3), (gula, o3),
+    ]
+    assert lines[-1] == {
+        "order_id": o3, "created_at": "2025-04-03T23:59:00", "status": "paid",
+        "product_id": gula, "product_name": "Gula", "quantity": 4, "price": 15000.0,
+        "subtotal": 60000.0, "shipping_address": "Jl. Export 1, Bandung",
+    }
+
+def test_orders_date_and_status_filters(client):
+    headers, ids = seed()
+    o1, o2, o3, _ = ids["orders"]
+    
+    def order_ids(**params):
+        return sorted({int(r[0]) for r in csv_rows(export(client, headers, "orders", **params))[1:]})
+    
+    # ?to= inklusif sampai akhir hari
+    assert order_ids(**{"from": "2025-04-02", "to": "2025-04-03"}) == [o2, o3]
+    assert order_ids(**{"from": "2025-04-04"}) == []
+    assert order_ids(status="paid") == [o1, o3]
+    assert order_ids(status="pending", to="2025-04-01") == []
+
+def test_products_export(client):
+    headers, ids = seed()
+    kopi, teh, gula, _ = ids["products"]
+    
+    rows = csv_rows(export(client, headers, "products"))
+    assert rows[0] == PRODUCT_COLUMNS
+    assert [int(r[0]) for r in rows[1:]] == [kopi, teh, gula]
+    assert rows[1][1:3] == ["Kopi", ""]
+    assert rows[1][-1] == "2025-01-01T00:00:00"
+    
+    in_stock = csv_rows(export(client, headers, "products", in_stock_only="true"))
+    assert [int(r[0]) for r in in_stock[1:]] == [kopi, gula]
+    
+    ranged = csv_rows(export(client, headers, "products", **{"from": "2025-02-01", "to": "2025-02-01"}))
+    assert [int(r[0]) for r in ranged[1:]] == [teh]
+    
+    lines = [json.loads(line) for line in export(client, headers, "products", format="jsonl").text.splitlines()]
+    assert [line["id"] for line in lines] == [kopi, teh, gula]
+    assert lines[1] == {
+        "id": teh, "name": "Teh", "description": None, "price": 10000.0, "stock": 0,
+        "category": "Minuman", "image_url": None, "created_at": "2025-02-01T00:00:00",
+    }
+
+@pytest.mark.parametrize("path,params", [
+    ("orders", {"format": "xlsx"}),
+    ("orders", {"status": "refunded"}),
+    ("orders", {"from": "2025-05-01", "to": "2025-04-01"}),
+    ("products", {"format": "xml"}),
+])
+def test_invalid_params_are_rejected(client, path, params):
+    headers, _ = seed()
+    response = client.get(f"/seller/export/{path}", headers=headers, params=params)
+    assert response.status_code == 400
+
+def test_export_requires_seller(client):
+    seed()
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': 'exportbuyer'})}"}
+    assert client.get("/seller/export/orders", headers=headers).status_code == 403
+
+@pytest.mark.skipif(engine.dialect.name != "sqlite", reason="EXPLAIN QUERY PLAN hanya ada di SQLite")
+@pytest.mark.parametrize("params", [
+    {},
+    {"status_filter": "paid"},
+    {"date_from": datetime(2025, 4, 1).date(), "date_to": datetime(2025, 4, 30).date()},
+])
+def test_orders_export_streams_without_sort(db_reset, params):
+    statement = orders_export_statement(1, **params)
+    sql = str(statement.compile(engine, compile_kwargs={"literal_binds": True}))
+    with engine.connect() as connection:
+        plan = [row[3] for row in connection.execute(text("EXPLAIN QUERY PLAN " + sql))]
+    
+    assert any("ix_products_seller_created_at_id" in step for step in plan), plan
+    assert not any("TEMP B-TREE" in step for step in plan), plan
@@ -0,0 +1,118 @@
+"""
+Rollup seller_daily_stats yang di-update create_order / pay_order sama
+dengan hasil backfill_seller_stats dari orders / order_items, dan order
+yang dibayar berulang atau paralel hanya dihitung sekali
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import backend.routes.orders as orders_routes
+
+from backend.database import SessionLocal
+from backend.models.product import Product
+from backend.models.seller_stats import SellerDailyStat
+from backend.models.user import User
+from backend.utils.security import create_access_token
+from backend.utils.seller_stats import backfill_seller_stats
+
+def seed():
+    db = SessionLocal()
+    sellers = [
+        User(email=f"seller{i}@stats.test", username=f"statsseller{i}", hashed_password="x", is_seller=True)
+        for i in range(2)
+    ]
+    buyer = User(email="buyer@stats.test", username="statsbuyer", hashed_password="x")
+    db.add_all(sellers + [buyer])
+    db.flush()
+    products = [
+        Product(name=f"Stats {i}", price=1000 * (i + 1), stock=100, category="Stats", seller_id=sellers[i % 2].id)
+        for i in range(4)
+    ]
+    db.add_all(products)
+    db.commit()
+    
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': buyer.username})}"}
+    ids = [(p.id, p.price) for p in products]
+    db.close()
+    return headers, ids
+
+def checkout(client, headers, items):
+    response = client.post("/orders/", headers=headers, json={
+        "shipping_address": "Jl. Rollup No. 1",
+        "items": [{"product_id": pid, "quantity": qty, "price": price} for pid, price, qty in items],
+    })
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+def pay(client, headers, order_id):
+    return client.post(f"/orders/{order_id}/pay", headers=headers, json={"payment_method": "transfer"})
+
+def rollup_rows() -> list:
+    db = SessionLocal()
+    try:
+        return sorted(
+            (r.seller_id, r.day, r.product_id, r.order_count, r.units_ordered,
+             round(r.revenue_ordered, 2), r.units_paid, round(r.revenue_paid, 2))
+            for r in db.query(SellerDailyStat).all()
+        )
+    finally:
+        db.close()
+
+def backfilled_rows() -> list:
+    db = SessionLocal()
+    try:
+        backfill_seller_stats(db)
+    finally:
+        db.close()
+    return rollup_rows()
+
+def test_incremental_rollup_matches_backfill(client):
+    headers, (a, b, c, d) = seed()
+    
+    orders = [
+        checkout(client, headers, [(*a, 2), (*b, 1)]),
+        checkout(client, headers, [(*a, 1), (*c, 3), (*d, 1)]),
+        checkout(client, headers, [(*d, 5)]),
+        checkout(client, headers, [(*b, 2), (*c, 1)]),
+    ]
+    for order_id in orders[:3]:
+        assert pay(client, headers, order_id).status_code == 200
+    
+    incremental = rollup_rows()
+    assert incremental
+    assert incremental == backfilled_rows()
+
+def test_repeated_pay_counts_revenue_once(client):
+    headers, (a, b, _, _) = seed()
+    order_id = checkout(client, headers, [(*a, 2), (*b, 1)])
+    
+    assert pay(client, headers, order_id).status_code == 200
+    assert pay(client, headers, order_id).status_code == 400
+    
+    rows = rollup_rows()
+    assert sum(r[7] for r in rows) == a[1] * 2 + b[1]
+    assert rows == backfilled_rows()
+
+def test_concurrent_pay_counts_revenue_once(client, monkeypatch):
+    headers, (a, b, _, _) = seed()
+    order_id = checkout(client, headers, [(*a, 2), (*b, 1)])
+    
+    # Transaksi bayar yang menang ditahan sebelum commit, supaya request
+    # lain sudah lewat cek status "pending" sebelum UPDATE-nya
+    record_sales = orders_routes.record_sales
+    
+    def slow_record_sales(db, rows, paid=False):
+        record_sales(db, rows, paid=paid)
+        if paid:
+            time.sleep(0.3)
+    
+    monkeypatch.setattr(orders_routes, "record_sales", slow_record_sales)
+    
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        codes = list(pool.map(lambda _: pay(client, headers, order_id).status_code, range(8)))
+    
+    assert sorted(codes) == [200] + [400] * 7
+    rows = rollup_rows()
+    assert sum(r[6] for r in rows) == 3
+    assert sum(r[7] for r in rows) == a[1] * 2 + b[1]
+    assert rows == backfilled_rows()
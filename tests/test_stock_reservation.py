@@ -0,0 +1,125 @@
+"""
+Stress test reservasi stock: ratusan checkout paralel ke satu product
+
+Jalankan dengan -s untuk melihat throughput:
+    python -m pytest tests/test_stock_reservation.py -s
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import backend.routes.orders as orders_routes
+
+from backend.database import SessionLocal
+from backend.models.order import Order, OrderItem
+from backend.models.product import Product
+from backend.models.user import User
+from backend.utils.security import create_access_token, get_password_hash
+
+HOT_STOCK = 100
+CHECKOUTS = 300
+CONCURRENCY = 32
+N_BUYERS = 20
+
+def seed():
+    db = SessionLocal()
+    hashed = get_password_hash("stress123")
+    seller = User(email="seller@stress.test", username="stressseller", hashed_password=hashed, is_seller=True)
+    db.add(seller)
+    db.flush()
+    
+    buyers = [
+        User(email=f"buyer{i}@stress.test", username=f"stressbuyer{i}", hashed_password=hashed)
+        for i in range(N_BUYERS)
+    ]
+    hot = Product(name="Hot SKU", price=1000, stock=HOT_STOCK, category="Stress", seller_id=seller.id)
+    other = Product(name="Other SKU", price=500, stock=1_000_000, category="Stress", seller_id=seller.id)
+    db.add_all(buyers + [hot, other])
+    db.commit()
+    
+    tokens = [create_access_token(data={"sub": b.username, "user_id": b.id}) for b in buyers]
+    ids = hot.id, other.id
+    db.close()
+    return tokens, ids
+
+def test_parallel_checkouts_never_oversell(client):
+    tokens, (hot_id, other_id) = seed()
+    
+    def checkout(i):
+        items = [{"product_id": hot_id, "quantity": 1, "price": 1000}]
+        if i % 2:
+            # Order dengan dua product: kalau hot SKU habis, other tidak boleh berkurang
+            items.append({"product_id": other_id, "quantity": 3, "price": 500})
+        response = client.post(
+            "/orders/",
+            json={"shipping_address": "Jl. Stress Test No. 1", "items": items},
+            headers={"Authorization": f"Bearer {tokens[i % N_BUYERS]}"},
+        )
+        return i, response.status_code
+    
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as pool:
+        results = list(pool.map(checkout, range(CHECKOUTS)))
+    elapsed = time.perf_counter() - started
+    
+    codes = [code for _, code in results]
+    succeeded = [i for i, code in results if code == 201]
+    assert set(codes) <= {201, 400}, codes
+    assert len(succeeded) == HOT_STOCK
+    
+    db = SessionLocal()
+    try:
+        hot = db.get(Product, hot_id)
+        other = db.get(Product, other_id)
+        sold = sum(q for (q,) in db.query(OrderItem.quantity).filter(OrderItem.product_id == hot_id))
+    
+        assert hot.stock == 0
+        assert sold == HOT_STOCK
+        assert db.query(Order).count() == HOT_STOCK
+        # Order yang gagal di-rollback seluruhnya
+        assert other.stock == 1_000_000 - 3 * sum(1 for i in succeeded if i % 2)
+    finally:
+        db.close()
+    
+    print(f"\n{CHECKOUTS} checkout, {CONCURRENCY} paralel: {elapsed:.2f}s "
+          f"({CHECKOUTS / elapsed:.0f} req/s), {len(succeeded)} berhasil, oversell 0")
+
+def test_unknown_product_and_bad_quantity(client):
+    tokens, (hot_id, _) = seed()
+    headers = {"Authorization": f"Bearer {tokens[0]}"}
+    
+    response = client.post("/orders/", headers=headers, json={
+        "shipping_address": "Jl. Stress Test No. 1",
+        "items": [{"product_id": hot_id, "quantity": 1, "price": 1000},
+                  {"product_id": 999999, "quantity": 1, "price": 1}],
+    })
+    assert response.status_code == 404
+    
+    response = client.post("/orders/", headers=headers, json={
+        "shipping_address": "Jl. Stress Test No. 1",
+        "items": [{"product_id": hot_id, "quantity": -5, "price": 1000}],
+    })
+    assert response.status_code == 400
+    
+    db = SessionLocal()
+    assert db.get(Product, hot_id).stock == HOT_STOCK
+    db.close()
+
+def test_product_deleted_before_reservation(client, monkeypatch):
+    tokens, (hot_id, _) = seed()
+    reserve_stock = orders_routes.reserve_stock
+    
+    def delete_then_reserve(db, quantities):
+        # Product dihapus request lain setelah validasi stock di create_order
+        other = SessionLocal()
+        other.query(Product).filter(Product.id == hot_id).delete()
+        other.commit()
+        other.close()
+        return reserve_stock(db, quantities)
+    
+    monkeypatch.setattr(orders_routes, "reserve_stock", delete_then_reserve)
+    response = client.post("/orders/", headers={"Authorization": f"Bearer {tokens[0]}"}, json={
+        "shipping_address": "Jl. Stress Test No. 1",
+        "items": [{"product_id": hot_id, "quantity": 1, "price": 1000}],
+    })
+    assert response.status_code == 404
+    assert str(hot_id) in response.json()["detail"]